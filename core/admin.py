@@ -1,5 +1,15 @@
 from django.contrib import admin
-from .models import Animal, AdoptionRequest
+from .jobs import enqueue, retry
+from .models import (
+    AdoptionRequest,
+    Animal,
+    AnimalTypeFacet,
+    ArchivedAdoptionRequest,
+    ArchivedAnimal,
+    Job,
+    RequestTransition,
+)
+from .search import filter_animals
 
 @admin.register(Animal)
 class AnimalAdmin(admin.ModelAdmin):
@@ -8,9 +18,81 @@ class AnimalAdmin(admin.ModelAdmin):
     search_fields = ("name", "description")
     autocomplete_fields = ("created_by",)
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return filter_animals(queryset, search_term), False
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        if "image" in form.changed_data:
+            enqueue("images.refresh_variants", animal_id=obj.pk, source=obj.image.name or "")
+
+@admin.register(AnimalTypeFacet)
+class AnimalTypeFacetAdmin(admin.ModelAdmin):
+    list_display = ("key", "label", "available_count", "pending_count", "adopted_count")
+    search_fields = ("key", "label")
+    readonly_fields = ("key", "available_count", "pending_count", "adopted_count")
+
 @admin.register(AdoptionRequest)
 class AdoptionRequestAdmin(admin.ModelAdmin):
     list_display = ("id", "animal", "user", "status", "created_at")
+    # __str__ uses both relations, and bulk actions such as delete_selected render it per row.
+    list_select_related = ("animal", "user")
     list_filter = ("status",)
     search_fields = ("message", "animal__name", "user__username")
     autocomplete_fields = ("animal", "user")
+
+    def save_model(self, request, obj, form, change):
+        obj._actor = request.user  # recorded on the RequestTransition written by core.signals
+        super().save_model(request, obj, form, change)
+
+class ReadOnlyAdmin(admin.ModelAdmin):
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+@admin.register(RequestTransition)
+class RequestTransitionAdmin(ReadOnlyAdmin):
+    """The transition log is append-only; the admin can browse it but not change it."""
+
+    list_display = ("at", "request_id", "animal_id", "action", "from_status", "to_status", "actor")
+    list_filter = ("action", "to_status")
+    list_select_related = ("actor",)
+    show_full_result_count = False
+
+@admin.register(ArchivedAnimal)
+class ArchivedAnimalAdmin(ReadOnlyAdmin):
+    """Filled by ``manage.py archive_adoptions``; the archive is browsed here, never edited."""
+
+    list_display = ("id", "name", "type", "age", "status", "created_by", "updated_at", "archived_at")
+    list_filter = ("type",)
+    list_select_related = ("created_by",)
+    search_fields = ("name", "description")
+    show_full_result_count = False
+
+@admin.register(ArchivedAdoptionRequest)
+class ArchivedAdoptionRequestAdmin(ReadOnlyAdmin):
+    list_display = ("id", "animal_id", "animal_name", "user", "status", "created_at", "archived_at")
+    list_filter = ("status",)
+    list_select_related = ("user",)
+    search_fields = ("animal_name", "message", "user__username")
+    show_full_result_count = False
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "task", "status", "attempts", "max_attempts", "run_at", "updated_at")
+    list_filter = ("status", "task")
+    search_fields = ("task", "last_error")
+    readonly_fields = ("created_at", "updated_at", "locked_at", "last_error")
+    actions = ("retry_jobs",)
+
+    @admin.action(description="Retry selected jobs")
+    def retry_jobs(self, request, queryset):
+        count = retry(queryset)
+        self.message_user(request, f"{count} job(s) queued for retry.")
@@ -0,0 +1,328 @@
+"""State changes for adoption requests.
+
+``apply_actions`` takes any number of (request_id, action) pairs and applies
+them in one transaction. The affected animals are locked with
+``SELECT ... FOR UPDATE`` (in primary-key order, so concurrent batches cannot
+deadlock), the outcome is worked out in memory, and the result is written back
+with at most one ``UPDATE`` per target status. An approval is only accepted
+while the request is still pending, so two staff members approving different
+requests for the same animal cannot both succeed.
+
+Each animal carries its request counts by status (``pending_requests`` and
+friends). They are moved with ``F()`` expressions in the same transaction as
+the requests themselves: here for batch actions, and by the signal receivers
+in core.signals for saves and deletes. A reject decides the animal's new
+status from them, without reading the sibling requests. ``reconcile_counters``
+recounts them from the AdoptionRequest table if they ever drift.
+
+Every status change is also appended to ``RequestTransition`` in the same
+transaction, with the acting user, so the history of a request (including
+siblings rejected or reopened by another request's action) can be replayed.
+Once the transaction commits, the changes are announced to live dashboards
+and catalog pages through core.events.
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from . import events, facets
+from .caching import invalidate_catalog
+from .jobs import enqueue
+from .models import AdoptionRequest, Animal, AnimalStatus, RequestStatus, RequestTransition
+
+ACTIONS = ("approve", "reject", "reset")
+COUNTER_FIELDS = {
+    RequestStatus.PENDING: "pending_requests",
+    RequestStatus.APPROVED: "approved_requests",
+    RequestStatus.REJECTED: "rejected_requests",
+}
+
+
+def _counter_changes(deltas: dict[str, int]) -> dict:
+    return {
+        COUNTER_FIELDS[status]: Greatest(F(COUNTER_FIELDS[status]) + delta, 0)
+        for status, delta in deltas.items()
+        if delta and status in COUNTER_FIELDS
+    }
+
+
+def move_request_counter(before: tuple | None, after: tuple | None) -> None:
+    """Move one request between (animal_id, status) counters; ``None`` means created or deleted."""
+    if before == after:
+        return
+    deltas: dict[int, Counter] = defaultdict(Counter)
+    if before and before[0]:
+        deltas[before[0]][before[1]] -= 1
+    if after and after[0]:
+        deltas[after[0]][after[1]] += 1
+    now = timezone.now()
+    with transaction.atomic(savepoint=False):
+        for animal_id, change in deltas.items():
+            changes = _counter_changes(change)
+            if changes:
+                # updated_at moves too: the counters are part of the animal's API representation and ETag.
+                Animal.objects.filter(pk=animal_id).update(updated_at=now, **changes)
+
+
+@transaction.atomic
+def reconcile_counters(dry_run: bool = False) -> int:
+    """Recount every animal's request counters from AdoptionRequest; return how many had drifted."""
+    actual = {
+        f"actual_{field}": Count("requests", filter=Q(requests__status=status))
+        for status, field in COUNTER_FIELDS.items()
+    }
+    drift = Q()
+    for field in COUNTER_FIELDS.values():
+        drift |= ~Q(**{field: F(f"actual_{field}")})
+    drifted = list(Animal.objects.annotate(**actual).filter(drift).values("pk", *actual))
+    if dry_run:
+        return len(drifted)
+    by_counts: dict[tuple, list[int]] = defaultdict(list)
+    for row in drifted:
+        by_counts[tuple(row[f"actual_{field}"] for field in COUNTER_FIELDS.values())].append(row["pk"])
+    now = timezone.now()
+    for counts, pks in by_counts.items():
+        Animal.objects.filter(pk__in=pks).update(updated_at=now, **dict(zip(COUNTER_FIELDS.values(), counts)))
+    return len(drifted)
+
+
+def can_manage_animal(animal: Animal, user) -> bool:
+    return user.is_authenticated and (user.is_staff or animal.created_by_id == user.id)
+
+
+def request_block_reason(animal: Animal, user) -> str:
+    """Why ``user`` may not ask to adopt ``animal`` at all, or "" if they may."""
+    if user.is_staff:
+        return "Admins manage adoptions and cannot submit requests."
+    if animal.created_by_id == user.id:
+        return "You cannot request adoption for an animal you created."
+    if animal.status == AnimalStatus.ADOPTED:
+        return "This animal has already been adopted."
+    return ""
+
+
+def log_transition(adoption_request: AdoptionRequest, before: str, actor=None, action: str = "") -> None:
+    """Record a single-request status change made through ``save()`` (submits, admin edits)."""
+    transition = RequestTransition.objects.create(
+        request_id=adoption_request.pk,
+        animal_id=adoption_request.animal_id,
+        actor_id=getattr(actor, "pk", actor),
+        action=action or (RequestTransition.EDIT if before else RequestTransition.SUBMIT),
+        from_status=before or "",
+        to_status=adoption_request.status,
+    )
+    events.publish([events.request_event(transition)])
+
+
+def submit_request(form, user, animal: Animal) -> tuple[AdoptionRequest, bool]:
+    """Save a validated ``AdoptionRequestForm`` and mark the animal as pending.
+
+    Returns the request and whether it was created. A double submit (or two
+    racing clients) gets the existing request back instead of an IntegrityError.
+    """
+    with transaction.atomic(savepoint=False):
+        try:
+            # Insert first and let the unique (user, animal) constraint settle races, rather than check-then-insert.
+            with transaction.atomic():
+                adoption_request = AdoptionRequest(user=user, animal=animal, **form.cleaned_data)
+                adoption_request._actor = user
+                adoption_request.save(force_insert=True)
+        except IntegrityError:
+            return AdoptionRequest.objects.get(user=user, animal=animal), False
+        # Decide on the stored status, not on ``animal``, which an approval may have moved on since it was read.
+        if Animal.objects.filter(pk=animal.pk, status=AnimalStatus.AVAILABLE).update(
+            status=AnimalStatus.PENDING, updated_at=timezone.now()
+        ):
+            animal.status = AnimalStatus.PENDING
+            animal._stored_facet = (animal.type, animal.status)
+            facets.move((animal.type, AnimalStatus.AVAILABLE), (animal.type, AnimalStatus.PENDING))
+            events.publish([events.animal_event(animal.pk, AnimalStatus.PENDING)])
+    return adoption_request, True
+
+
+@dataclass
+class Outcome:
+    request_id: int
+    action: str
+    animal_name: str = ""
+    username: str = ""
+    error: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return not self.error
+
+
+@dataclass
+class BatchResult:
+    outcomes: list[Outcome] = field(default_factory=list)
+
+    @property
+    def applied(self) -> list[Outcome]:
+        return [outcome for outcome in self.outcomes if outcome.ok]
+
+    @property
+    def skipped(self) -> list[Outcome]:
+        return [outcome for outcome in self.outcomes if not outcome.ok]
+
+
+def _apply(
+    action: str, request_id: int, statuses: dict[int, str], counts: Counter, animal_status: str
+) -> tuple[str, str]:
+    """Apply one action to one animal's request statuses and counts in place; return (animal status, error).
+
+    ``statuses`` holds every request of the animal for approve and reset, and at least the target for reject,
+    which goes by ``counts`` (the animal's request counters) instead.
+    """
+    current = statuses[request_id]
+    if action == "approve":
+        if current != RequestStatus.PENDING:
+            return animal_status, f"request is {current.lower()}, not pending"
+        for pk in statuses:
+            statuses[pk] = RequestStatus.APPROVED if pk == request_id else RequestStatus.REJECTED
+        counts.clear()
+        counts.update({RequestStatus.APPROVED: 1, RequestStatus.REJECTED: len(statuses) - 1})
+        return AnimalStatus.ADOPTED, ""
+    if action == "reject":
+        if current != RequestStatus.PENDING:
+            return animal_status, f"request is {current.lower()}, not pending"
+        statuses[request_id] = RequestStatus.REJECTED
+        counts[RequestStatus.PENDING] -= 1
+        counts[RequestStatus.REJECTED] += 1
+        if counts[RequestStatus.APPROVED] > 0:
+            return animal_status, ""
+        if counts[RequestStatus.PENDING] > 0:
+            return AnimalStatus.PENDING, ""
+        return AnimalStatus.AVAILABLE, ""
+    # reset: reopen the whole animal.
+    for pk in statuses:
+        statuses[pk] = RequestStatus.PENDING
+    counts.clear()
+    counts[RequestStatus.PENDING] = len(statuses)
+    return AnimalStatus.PENDING, ""
+
+
+def apply_actions(actions: Iterable[tuple[int, str]], actor=None) -> BatchResult:
+    """Apply (request_id, action) pairs for ``actor``, logging every resulting status change."""
+    actions = [(int(request_id), action) for request_id, action in actions]
+    result = BatchResult()
+    if not actions:
+        return result
+
+    with transaction.atomic():
+        targets = {
+            row["pk"]: row
+            for row in AdoptionRequest.objects.filter(pk__in={pk for pk, _ in actions}).values(
+                "pk", "animal_id", "animal__name", "user__username"
+            )
+        }
+        animals = {}
+        counts: dict[int, Counter] = {}
+        for pk, type_value, status, *counters in (
+            Animal.objects.select_for_update()
+            .filter(pk__in={row["animal_id"] for row in targets.values()})
+            .order_by("pk")
+            .values_list("pk", "type", "status", *COUNTER_FIELDS.values())
+        ):
+            animals[pk] = {"type": type_value, "status": status}
+            counts[pk] = Counter(dict(zip(COUNTER_FIELDS, counters)))
+        # Approve and reset rewrite (and log) every sibling request, so those animals need them all;
+        # a reject only needs its target and the animal's counters.
+        whole = {row["animal_id"] for pk, action in actions if action != "reject" and (row := targets.get(pk))}
+        # Read request statuses only after the animals are locked, so they cannot move under us.
+        statuses: dict[int, dict[int, str]] = defaultdict(dict)
+        for pk, animal_id, status in AdoptionRequest.objects.filter(
+            Q(animal_id__in=whole) | Q(pk__in=targets, animal_id__in=animals)
+        ).values_list("pk", "animal_id", "status"):
+            statuses[animal_id][pk] = status
+        original = {animal_id: dict(rows) for animal_id, rows in statuses.items()}
+        animal_status = {pk: animal["status"] for pk, animal in animals.items()}
+        now = timezone.now()
+        transitions: list[RequestTransition] = []
+
+        for request_id, action in actions:
+            row = targets.get(request_id)
+            outcome = Outcome(request_id, action)
+            result.outcomes.append(outcome)
+            if row is None or request_id not in statuses.get(row["animal_id"], {}):
+                outcome.error = "request no longer exists"
+                continue
+            outcome.animal_name, outcome.username = row["animal__name"], row["user__username"]
+            if action not in ACTIONS:
+                outcome.error = "unknown action"
+                continue
+            animal_id = row["animal_id"]
+            before = dict(statuses[animal_id])
+            animal_status[animal_id], outcome.error = _apply(
+                action, request_id, statuses[animal_id], counts[animal_id], animal_status[animal_id]
+            )
+            transitions.extend(
+                RequestTransition(
+                    request_id=pk,
+                    animal_id=animal_id,
+                    cause_id=None if pk == request_id else request_id,
+                    actor_id=getattr(actor, "pk", actor),
+                    action=action,
+                    from_status=before[pk],
+                    to_status=status,
+                    at=now,
+                )
+                for pk, status in statuses[animal_id].items()
+                if before[pk] != status
+            )
+
+        request_changes: dict[str, list[int]] = defaultdict(list)
+        counter_deltas: dict[int, Counter] = defaultdict(Counter)
+        for animal_id, rows in statuses.items():
+            for pk, status in rows.items():
+                before = original[animal_id][pk]
+                if before != status:
+                    request_changes[status].append(pk)
+                    counter_deltas[animal_id][before] -= 1
+                    counter_deltas[animal_id][status] += 1
+        for status, pks in request_changes.items():
+            AdoptionRequest.objects.filter(pk__in=pks).update(status=status, updated_at=now)
+        RequestTransition.objects.bulk_create(transitions, batch_size=1000)
+
+        # One UPDATE per distinct (new status, counter deltas), which is a handful even for large batches.
+        animal_changes: dict[tuple, list[int]] = defaultdict(list)
+        facet_moves: Counter = Counter()
+        for pk, status in animal_status.items():
+            before = animals[pk]["status"]
+            deltas = tuple(counter_deltas[pk][request_status] for request_status in COUNTER_FIELDS)
+            if before != status or any(deltas):
+                animal_changes[(status, deltas)].append(pk)
+            if before != status:
+                facet_moves[(facets.type_key(animals[pk]["type"]), before, status)] += 1
+        for (status, deltas), pks in animal_changes.items():
+            Animal.objects.filter(pk__in=pks).update(
+                status=status, updated_at=now, **_counter_changes(dict(zip(COUNTER_FIELDS, deltas)))
+            )
+        for (type_key, before, after), count in facet_moves.items():
+            facets.move((type_key, before), (type_key, after), count)
+        # Adopted animals are never recommended, so adopting or reopening one reshuffles neighbour lists.
+        regrouped = [
+            pk
+            for pk, status in animal_status.items()
+            if (animals[pk]["status"] == AnimalStatus.ADOPTED) != (status == AnimalStatus.ADOPTED)
+        ]
+        if regrouped:
+            enqueue("similar.refresh", animal_ids=regrouped)
+
+        if request_changes or animal_changes:
+            transaction.on_commit(invalidate_catalog)
+        events.publish(
+            [events.request_event(transition) for transition in transitions]
+            + [
+                events.animal_event(pk, status)
+                for pk, status in animal_status.items()
+                if animals[pk]["status"] != status
+            ]
+        )
+    return result
@@ -0,0 +1,413 @@
+"""Read/write JSON API over animals and adoption requests.
+
+Permissions and validation are shared with the HTML views (``AnimalForm``,
+``AdoptionRequestForm`` and the helpers in ``adoptions``). Collections use the
+same keyset cursors as the dashboards and accept ``?fields=`` to return a
+subset of each object. Every GET carries a strong ``ETag`` and a
+``Last-Modified`` derived from one ``MAX(updated_at)`` query over the requested
+scope, so clients that revalidate get a 304 without the page ever being built.
+"""
+
+import hashlib
+import json
+import math
+from functools import wraps
+
+from django.db.models import Count, Max
+from django.db.models.functions import Lower
+from django.forms.models import model_to_dict
+from django.http import HttpRequest, HttpResponse, JsonResponse, QueryDict
+from django.urls import reverse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from . import facets, ratelimit
+from .adoptions import apply_actions, can_manage_animal, request_block_reason, submit_request
+from .constants import API_MAX_PAGE_SIZE, CATALOG_PAGE_SIZE
+from .forms import AdoptionRequestForm, AnimalForm
+from .images import variant_url
+from .instrumentation import query_budget
+from .jobs import enqueue
+from .models import AdoptionRequest, Animal, AnimalStatus, RequestStatus
+from .pagination import InvalidCursor, KeysetPaginator
+
+# Public field name -> model columns it needs, used to build ``.only()``.
+ANIMAL_FIELDS = {
+    "id": ("id",),
+    "url": ("id",),
+    "name": ("name",),
+    "type": ("type",),
+    "age": ("age",),
+    "description": ("description",),
+    "status": ("status",),
+    "request_counts": ("pending_requests", "approved_requests", "rejected_requests"),
+    "image": ("image",),
+    "thumbnail": ("image", "image_variants"),
+    "created_by": ("created_by__username",),
+    "created_at": ("created_at",),
+    "updated_at": ("updated_at",),
+}
+REQUEST_FIELDS = {
+    "id": ("id",),
+    "url": ("id",),
+    "animal": ("animal_id",),
+    "animal_name": ("animal__name",),
+    "user": ("user__username",),
+    "message": ("message",),
+    "status": ("status",),
+    "created_at": ("created_at",),
+    "updated_at": ("updated_at",),
+}
+REQUEST_ORDERING = ("-created_at", "-id")
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str, headers: dict | None = None, **extra):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+        self.payload = {"error": message, **extra}
+
+
+def api_view(*methods: str):
+    """Restrict a view to ``methods`` and turn ``ApiError`` into a JSON error response."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+            if request.method not in methods:
+                response = JsonResponse({"error": "Method not allowed."}, status=405)
+                response["Allow"] = ", ".join(methods)
+                return response
+            try:
+                return view(request, *args, **kwargs)
+            except ApiError as error:
+                return JsonResponse(error.payload, status=error.status, headers=error.headers)
+
+        return wrapper
+
+    return decorator
+
+
+def _require_user(request: HttpRequest, staff: bool = False) -> None:
+    if not request.user.is_authenticated:
+        raise ApiError(401, "Authentication required.")
+    if staff and not request.user.is_staff:
+        raise ApiError(403, "Only admins can do that.")
+
+
+def _body(request: HttpRequest) -> QueryDict | dict:
+    if request.content_type != "application/json":
+        if request.method != "POST":
+            raise ApiError(415, "Send a JSON request body.")
+        return request.POST
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        raise ApiError(400, "Request body is not valid JSON.")
+    if not isinstance(data, dict):
+        raise ApiError(400, "Request body must be a JSON object.")
+    return data
+
+
+def _form_error(form) -> ApiError:
+    return ApiError(400, "Validation failed.", fields=form.errors.get_json_data())
+
+
+def _get(queryset, pk: int):
+    obj = queryset.filter(pk=pk).first()
+    if obj is None:
+        raise ApiError(404, "Not found.")
+    return obj
+
+
+def _fields(request: HttpRequest, available: dict) -> list[str]:
+    raw = request.GET.get("fields")
+    if not raw:
+        return list(available)
+    names = list(dict.fromkeys(name.strip() for name in raw.split(",") if name.strip()))
+    unknown = [name for name in names if name not in available]
+    if unknown or not names:
+        raise ApiError(400, f"Unknown field(s): {', '.join(unknown) or raw}.", allowed=list(available))
+    return names
+
+
+def _only(queryset, fields: list[str], available: dict):
+    columns = {column for name in fields for column in available[name]}
+    related = {column.split("__")[0] for column in columns if "__" in column}
+    # Keyset ordering columns must be loaded to build the next cursor.
+    columns |= {"id", "created_at", "status_rank"} & {f.name for f in queryset.model._meta.concrete_fields}
+    return queryset.select_related(*related).only(*columns)
+
+
+def _per_page(request: HttpRequest) -> int:
+    try:
+        return max(1, min(int(request.GET.get("limit", CATALOG_PAGE_SIZE)), API_MAX_PAGE_SIZE))
+    except ValueError:
+        raise ApiError(400, "limit must be an integer.")
+
+
+def _page(request: HttpRequest, queryset, ordering: tuple, serialize) -> dict:
+    paginator = KeysetPaginator(queryset, ordering, per_page=_per_page(request))
+    try:
+        page = paginator.page(after=request.GET.get("after"), before=request.GET.get("before"))
+    except InvalidCursor:
+        raise ApiError(400, "Invalid cursor.")
+    return {"results": [serialize(obj) for obj in page], "next": page.next_cursor, "previous": page.previous_cursor}
+
+
+def _serialize_animal(animal: Animal, fields: list[str]) -> dict:
+    values = {
+        "id": lambda: animal.pk,
+        "url": lambda: reverse("core:api_animal", args=[animal.pk]),
+        "name": lambda: animal.name,
+        "type": lambda: animal.type,
+        "age": lambda: animal.age,
+        "description": lambda: animal.description,
+        "status": lambda: animal.status,
+        "request_counts": lambda: {
+            "pending": animal.pending_requests,
+            "approved": animal.approved_requests,
+            "rejected": animal.rejected_requests,
+        },
+        "image": lambda: animal.image.url if animal.image else None,
+        "thumbnail": lambda: variant_url(animal, "thumb", 320) or None,
+        "created_by": lambda: animal.created_by.username if animal.created_by_id else None,
+        "created_at": lambda: animal.created_at,
+        "updated_at": lambda: animal.updated_at,
+    }
+    return {name: values[name]() for name in fields}
+
+
+def _serialize_request(adoption_request: AdoptionRequest, fields: list[str]) -> dict:
+    values = {
+        "id": lambda: adoption_request.pk,
+        "url": lambda: reverse("core:api_request", args=[adoption_request.pk]),
+        "animal": lambda: adoption_request.animal_id,
+        "animal_name": lambda: adoption_request.animal.name,
+        "user": lambda: adoption_request.user.username,
+        "message": lambda: adoption_request.message,
+        "status": lambda: adoption_request.status,
+        "created_at": lambda: adoption_request.created_at,
+        "updated_at": lambda: adoption_request.updated_at,
+    }
+    return {name: values[name]() for name in fields}
+
+
+def _validators(path: str, last_modified, *parts) -> tuple[str, int | None]:
+    """Strong ETag and Last-Modified timestamp for the representation served at ``path``."""
+    digest = hashlib.sha256("\x1f".join(str(part) for part in (path, last_modified, *parts)).encode()).hexdigest()
+    return f'"{digest[:32]}"', int(last_modified.timestamp()) if last_modified else None
+
+
+def _conditional(request: HttpRequest, etag: str, last_modified: int | None) -> HttpResponse | None:
+    """A 304 (safe methods) or 412 (unsafe methods) when the client's validators allow it."""
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is not None and response.status_code == 304:
+        response["ETag"] = etag
+        patch_vary_headers(response, ["Cookie"])
+    return response
+
+
+def _respond(payload: dict, etag: str, last_modified: int | None, status: int = 200) -> JsonResponse:
+    response = JsonResponse(payload, status=status)
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ["Cookie"])
+    return response
+
+
+def _scope_validators(request: HttpRequest, scope, *parts) -> tuple[str, int | None]:
+    stamp = scope.order_by().aggregate(last=Max("updated_at"), count=Count("pk"))
+    return _validators(request.get_full_path(), stamp["last"], stamp["count"], *parts)
+
+
+def _animal_scope(request: HttpRequest):
+    animals = Animal.objects.all()
+    type_key = facets.type_key(facets.clean_type(request.GET.get("type")))
+    if type_key and type_key != "all":
+        animals = animals.alias(type_key=Lower("type")).filter(type_key=type_key)
+    status = request.GET.get("status")
+    if status:
+        if status not in AnimalStatus.values:
+            raise ApiError(400, "Unknown status.", allowed=AnimalStatus.values)
+        animals = animals.filter(status=status)
+    return animals
+
+
+def _enqueue_variants(animal: Animal) -> None:
+    if animal.image:
+        enqueue("images.refresh_variants", animal_id=animal.pk, source=animal.image.name)
+
+
+@query_budget(8)
+@api_view("GET", "POST")
+def animals(request: HttpRequest) -> HttpResponse:
+    if request.method == "POST":
+        _require_user(request, staff=True)
+        form = AnimalForm(_body(request), request.FILES)
+        if not form.is_valid():
+            raise _form_error(form)
+        animal = form.save(commit=False)
+        animal.created_by = request.user
+        animal.save()
+        _enqueue_variants(animal)
+        location = reverse("core:api_animal", args=[animal.pk])
+        etag, last_modified = _validators(location, animal.updated_at, animal.pk)
+        response = _respond(_serialize_animal(animal, list(ANIMAL_FIELDS)), etag, last_modified, status=201)
+        response["Location"] = location
+        return response
+
+    fields = _fields(request, ANIMAL_FIELDS)
+    scope = _animal_scope(request)
+    etag, last_modified = _scope_validators(request, scope)
+    not_modified = _conditional(request, etag, last_modified)
+    if not_modified:
+        return not_modified
+    payload = _page(
+        request,
+        _only(scope, fields, ANIMAL_FIELDS),
+        Animal.CATALOG_ORDERING,
+        lambda animal: _serialize_animal(animal, fields),
+    )
+    return _respond(payload, etag, last_modified)
+
+
+@query_budget(11)
+@api_view("GET", "PATCH", "DELETE")
+def animal(request: HttpRequest, pk: int) -> HttpResponse:
+    animal = _get(Animal.objects.select_related("created_by"), pk)
+    etag, last_modified = _validators(request.get_full_path(), animal.updated_at, animal.pk)
+    if request.method == "GET":
+        fields = _fields(request, ANIMAL_FIELDS)
+        return _conditional(request, etag, last_modified) or _respond(
+            _serialize_animal(animal, fields), etag, last_modified
+        )
+
+    if not can_manage_animal(animal, request.user):
+        _require_user(request)
+        raise ApiError(403, "You do not have permission to modify this animal.")
+    # If-Match / If-Unmodified-Since give clients optimistic concurrency (412 on a stale copy).
+    precondition_failed = _conditional(request, etag, last_modified)
+    if precondition_failed:
+        return precondition_failed
+
+    if request.method == "DELETE":
+        animal.delete()
+        return HttpResponse(status=204)
+
+    data = model_to_dict(animal, fields=[name for name in AnimalForm.Meta.fields if name != "image"])
+    data.update(_body(request).items())
+    form = AnimalForm(data, instance=animal)
+    if not form.is_valid():
+        raise _form_error(form)
+    animal = form.save()
+    if "image" in form.changed_data:
+        _enqueue_variants(animal)
+    etag, last_modified = _validators(request.get_full_path(), animal.updated_at, animal.pk)
+    return _respond(_serialize_animal(animal, list(ANIMAL_FIELDS)), etag, last_modified)
+
+
+@query_budget(15)
+@api_view("POST")
+def animal_requests(request: HttpRequest, pk: int) -> HttpResponse:
+    _require_user(request)
+    animal = _get(Animal.objects.all(), pk)
+    reason = request_block_reason(animal, request.user)
+    if reason:
+        raise ApiError(409 if animal.status == AnimalStatus.ADOPTED else 403, reason)
+    wait = ratelimit.check(request, "request_create", keys=("ip", "user"))
+    if wait:
+        retry_after = math.ceil(wait)
+        raise ApiError(429, "Too many requests; slow down.", {"Retry-After": str(retry_after)}, retry_after=retry_after)
+
+    form = AdoptionRequestForm(_body(request))
+    if not form.is_valid():
+        raise _form_error(form)
+    adoption_request, created = submit_request(form, request.user, animal)
+    if not created:
+        raise ApiError(409, "You have already requested this animal.", request=adoption_request.pk)
+    fields = list(REQUEST_FIELDS)
+    location = reverse("core:api_request", args=[adoption_request.pk])
+    etag, last_modified = _validators(location, adoption_request.updated_at, adoption_request.pk, request.user.pk)
+    response = _respond(_serialize_request(adoption_request, fields), etag, last_modified, status=201)
+    response["Location"] = location
+    return response
+
+
+def _request_scope(request: HttpRequest):
+    scope = AdoptionRequest.objects.all()
+    if not request.user.is_staff:
+        return scope.filter(user=request.user)
+    animal_filter = request.GET.get("animal", "")
+    if animal_filter:
+        if not (animal_filter.isascii() and animal_filter.isdecimal() and len(animal_filter) <= 18):
+            raise ApiError(400, "animal must be an id.")
+        scope = scope.filter(animal_id=animal_filter)
+    if request.GET.get("user"):
+        scope = scope.filter(user__username=request.GET["user"].strip())
+    return scope
+
+
+@query_budget(5)
+@api_view("GET")
+def requests(request: HttpRequest) -> HttpResponse:
+    _require_user(request)
+    fields = _fields(request, REQUEST_FIELDS)
+    scope = _request_scope(request)
+    status = request.GET.get("status")
+    if status:
+        if status not in RequestStatus.values:
+            raise ApiError(400, "Unknown status.", allowed=RequestStatus.values)
+        scope = scope.filter(status=status)
+    # Deleting an animal cascades to its requests without touching updated_at; the count catches that.
+    etag, last_modified = _scope_validators(request, scope, request.user.pk)
+    not_modified = _conditional(request, etag, last_modified)
+    if not_modified:
+        return not_modified
+    payload = _page(
+        request,
+        _only(scope, fields, REQUEST_FIELDS),
+        REQUEST_ORDERING,
+        lambda adoption_request: _serialize_request(adoption_request, fields),
+    )
+    return _respond(payload, etag, last_modified)
+
+
+@query_budget(4)
+@api_view("GET")
+def request_detail(request: HttpRequest, pk: int) -> HttpResponse:
+    _require_user(request)
+    adoption_request = _get(_request_scope(request).select_related("animal", "user"), pk)
+    fields = _fields(request, REQUEST_FIELDS)
+    etag, last_modified = _validators(
+        request.get_full_path(), adoption_request.updated_at, adoption_request.pk, request.user.pk
+    )
+    return _conditional(request, etag, last_modified) or _respond(
+        _serialize_request(adoption_request, fields), etag, last_modified
+    )
+
+
+@query_budget(30)
+@api_view("POST")
+def request_actions(request: HttpRequest) -> HttpResponse:
+    """Staff batch endpoint: ``{"actions": [{"id": 1, "action": "approve"}, ...]}``."""
+    _require_user(request, staff=True)
+    actions = _body(request).get("actions")
+    if not isinstance(actions, list) or not all(isinstance(item, dict) for item in actions):
+        raise ApiError(400, "actions must be a list of {id, action} objects.")
+    try:
+        result = apply_actions(((item.get("id"), item.get("action")) for item in actions), actor=request.user)
+    except (TypeError, ValueError):
+        raise ApiError(400, "Every action needs an integer id.")
+    return JsonResponse(
+        {
+            "applied": len(result.applied),
+            "results": [
+                {"id": outcome.request_id, "action": outcome.action, "ok": outcome.ok, "error": outcome.error or None}
+                for outcome in result.outcomes
+            ],
+        }
+    )
@@ -0,0 +1,129 @@
+"""Moving finished adoptions out of the live tables.
+
+An approved request leaves its animal ``Adopted`` and the other requests
+``Rejected`` for good, and those rows would otherwise sit in the catalog, the
+request dashboard and their indexes forever. :func:`archive_adoptions` moves
+adopted animals untouched since a cutoff, with all of their requests, into
+ArchivedAnimal and ArchivedAdoptionRequest. Rows keep their ids, so the
+transition log (keyed by id, without constraints) still describes them, and the
+animal page and "My requests" read the archive.
+
+Resolved requests of animals still in the catalog stay live: the unique
+(user, animal) constraint on them is what stops a rejected adopter from simply
+applying again.
+
+Each batch is one short transaction. Animals are locked with ``SKIP LOCKED``,
+in the same order as ``apply_actions``, so rows being changed right now are
+left for the next run.
+"""
+
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import facets
+from .caching import invalidate_catalog
+from .models import (
+    AdoptionRequest,
+    Animal,
+    AnimalStatus,
+    ArchivedAdoptionRequest,
+    ArchivedAnimal,
+    SimilarAnimal,
+    SimilarityPosting,
+)
+
+ARCHIVE_AFTER = timedelta(days=180)
+ARCHIVE_BATCH_SIZE = 500
+
+ANIMAL_FIELDS = (
+    "id",
+    "name",
+    "type",
+    "age",
+    "description",
+    "image",
+    "image_variants",
+    "status",
+    "created_by_id",
+    "created_at",
+    "updated_at",
+    "approved_requests",
+    "rejected_requests",
+)
+REQUEST_FIELDS = ("id", "user_id", "animal_id", "animal__name", "message", "status", "created_at", "updated_at")
+
+
+@dataclass
+class ArchiveResult:
+    animals: int = 0
+    requests: int = 0
+    dry_run: bool = False
+
+
+def _adopted(cutoff: datetime):
+    return Animal.objects.filter(status_rank=Animal.STATUS_RANKS[AnimalStatus.ADOPTED], updated_at__lt=cutoff)
+
+
+def _copy_requests(rows: list[dict], now: datetime) -> None:
+    ArchivedAdoptionRequest.objects.bulk_create(
+        [
+            ArchivedAdoptionRequest(animal_name=row.pop("animal__name"), archived_at=now, **row)
+            for row in rows
+        ],
+        batch_size=1000,
+    )
+
+
+def _archive_animals(cutoff: datetime, batch_size: int) -> tuple[int, int]:
+    with transaction.atomic():
+        rows = list(
+            _adopted(cutoff).select_for_update(skip_locked=True).order_by("pk").values(*ANIMAL_FIELDS)[:batch_size]
+        )
+        if not rows:
+            return 0, 0
+        ids = [row["id"] for row in rows]
+        requests = list(AdoptionRequest.objects.filter(animal_id__in=ids).values(*REQUEST_FIELDS))
+        now = timezone.now()
+        ArchivedAnimal.objects.bulk_create([ArchivedAnimal(archived_at=now, **row) for row in rows], batch_size=1000)
+        _copy_requests(requests, now)
+        # _raw_delete skips the per-row delete signals; facets and cached pages are settled below in bulk,
+        # and the transition log is meant to outlive the rows.
+        SimilarAnimal.objects.filter(Q(animal_id__in=ids) | Q(similar_id__in=ids))._raw_delete(DEFAULT_DB_ALIAS)
+        SimilarityPosting.objects.filter(animal_id__in=ids)._raw_delete(DEFAULT_DB_ALIAS)
+        AdoptionRequest.objects.filter(animal_id__in=ids)._raw_delete(DEFAULT_DB_ALIAS)
+        Animal.objects.filter(pk__in=ids)._raw_delete(DEFAULT_DB_ALIAS)
+        for type_key, count in Counter(facets.type_key(row["type"]) for row in rows).items():
+            facets.move((type_key, AnimalStatus.ADOPTED), None, count)
+        transaction.on_commit(invalidate_catalog)
+    return len(rows), len(requests)
+
+
+def archive_adoptions(
+    cutoff: datetime | None = None,
+    *,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    pause: float = 0.0,
+    dry_run: bool = False,
+) -> ArchiveResult:
+    """Archive adopted animals last changed before ``cutoff``, with their requests, a batch at a time."""
+    cutoff = cutoff or timezone.now() - ARCHIVE_AFTER
+    result = ArchiveResult(dry_run=dry_run)
+    if dry_run:
+        result.animals = _adopted(cutoff).count()
+        result.requests = AdoptionRequest.objects.filter(animal__in=_adopted(cutoff)).count()
+        return result
+    while True:
+        animals, requests = _archive_animals(cutoff, batch_size)
+        if not animals:
+            break
+        result.animals += animals
+        result.requests += requests
+        if pause:
+            time.sleep(pause)
+    return result
@@ -0,0 +1,73 @@
+"""Fewer queries to find out who is asking.
+
+``AuthenticationMiddleware`` replaces Django's so that ``request.user`` and
+``await request.auser()`` share one lookup per request; async views that
+render templates would otherwise load the user twice. ``CachedModelBackend``
+keeps signed-in users in the cache for ``USER_CACHE_TIMEOUT`` seconds, keyed
+by primary key and dropped whenever the user is saved or deleted (see
+core.signals). With the per-process locmem cache, other workers would keep
+serving the old copy (staff flag, active flag, password hash) for up to that
+timeout, so it defaults to 0 (off) unless CACHE_URL names a shared cache.
+"""
+
+from functools import partial
+
+from django.conf import settings
+from django.contrib import auth
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.middleware import AuthenticationMiddleware as BaseAuthenticationMiddleware
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+
+
+def user_cache_key(user_id) -> str:
+    return f"auth-user:{user_id}"
+
+
+def forget_user(user_id) -> None:
+    cache.delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        timeout = getattr(settings, "USER_CACHE_TIMEOUT", 0)
+        if not timeout:
+            return super().get_user(user_id)
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, timeout)
+        return user
+
+    async def aget_user(self, user_id):
+        timeout = getattr(settings, "USER_CACHE_TIMEOUT", 0)
+        if not timeout:
+            return await super().aget_user(user_id)
+        key = user_cache_key(user_id)
+        user = await cache.aget(key)
+        if user is None:
+            user = await super().aget_user(user_id)
+            if user is not None:
+                await cache.aset(key, user, timeout)
+        return user
+
+
+def _get_user(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = auth.get_user(request)
+    return request._cached_user
+
+
+async def _auser(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = await auth.aget_user(request)
+    return request._cached_user
+
+
+class AuthenticationMiddleware(BaseAuthenticationMiddleware):
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(partial(_get_user, request))
+        request.auser = partial(_auser, request)
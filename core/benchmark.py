@@ -0,0 +1,231 @@
+"""Drive the ``core`` URLs through the test client and summarise latency, queries and bytes.
+
+Each scenario names a URL pattern from ``core.urls`` and says who requests it
+and with what arguments. Writes run inside a transaction that is rolled back,
+so repeated runs see the same data. Results are plain dicts so they can be
+saved as a baseline JSON and compared with a later run.
+"""
+
+import random
+import statistics
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+from django.contrib.auth.models import User
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, reverse
+
+from . import urls
+from .instrumentation import percentile
+from .models import AdoptionRequest, Animal, AnimalStatus
+
+
+@dataclass
+class Fixtures:
+    """Rows the scenarios pick their arguments from."""
+
+    animal_ids: list[int]
+    available_ids: list[int]
+    types: list[str]
+    request_ids: list[int]
+    user: User
+    staff: User
+
+    @classmethod
+    def load(cls) -> "Fixtures":
+        users = User.objects.filter(is_staff=False, is_active=True).order_by("pk")
+        user = users.filter(adoptionrequest__isnull=False).first() or users.first()
+        staff = User.objects.filter(is_staff=True, is_active=True).order_by("pk").first()
+        if user is None or staff is None or not Animal.objects.exists():
+            raise LookupError("Benchmarks need animals, a staff user and a regular user; run seed_animals first.")
+        requested = AdoptionRequest.objects.filter(user=user).values("animal_id")
+        return cls(
+            animal_ids=list(Animal.objects.order_by("?").values_list("pk", flat=True)[:500]),
+            available_ids=list(
+                Animal.objects.filter(status=AnimalStatus.AVAILABLE)
+                .exclude(created_by=user)
+                .exclude(pk__in=requested)
+                .order_by("?")
+                .values_list("pk", flat=True)[:500]
+            ),
+            types=list(Animal.objects.values_list("type", flat=True).distinct()[:20]),
+            request_ids=list(AdoptionRequest.objects.filter(user=user).values_list("pk", flat=True)[:500]),
+            user=user,
+            staff=staff,
+        )
+
+
+@dataclass
+class Scenario:
+    name: str
+    url_name: str
+    role: str = "anonymous"  # anonymous, user or staff
+    method: str = "get"
+    args: Callable[[Fixtures, random.Random], list] = lambda fixtures, rng: []
+    query: Callable[[Fixtures, random.Random], dict] = lambda fixtures, rng: {}
+    data: dict = field(default_factory=dict)
+
+    @property
+    def writes(self) -> bool:
+        return self.method != "get"
+
+
+SCENARIOS = [
+    Scenario("home", "home"),
+    Scenario("home:user", "home", role="user"),
+    Scenario("home:type", "home", query=lambda f, rng: {"type": rng.choice(f.types).lower()}),
+    Scenario("home:search", "home", query=lambda f, rng: {"q": rng.choice(f.types)}),
+    Scenario("animal_search", "animal_search", query=lambda f, rng: {"q": rng.choice(f.types)[:3]}),
+    Scenario("login", "login"),
+    Scenario("signup", "signup"),
+    Scenario("animal_detail", "animal_detail", args=lambda f, rng: [rng.choice(f.animal_ids)]),
+    Scenario("animal_detail:user", "animal_detail", role="user", args=lambda f, rng: [rng.choice(f.animal_ids)]),
+    Scenario("animal_create:form", "animal_create", role="staff"),
+    Scenario("animal_update:form", "animal_update", role="staff", args=lambda f, rng: [rng.choice(f.animal_ids)]),
+    Scenario(
+        "request_create",
+        "request_create",
+        role="user",
+        method="post",
+        args=lambda f, rng: [rng.choice(f.available_ids or f.animal_ids)],
+        data={"message": "Benchmark request"},
+    ),
+    Scenario("my_requests", "my_requests", role="user"),
+    Scenario("animal_manage_list", "animal_manage_list", role="staff"),
+    Scenario("manage_requests", "manage_requests", role="staff"),
+    Scenario("manage_requests:pending", "manage_requests", role="staff", query=lambda f, rng: {"status": "Pending"}),
+    Scenario("api_animals", "api_animals"),
+    Scenario("api_animal", "api_animal", args=lambda f, rng: [rng.choice(f.animal_ids)]),
+    Scenario(
+        "api_animal_requests",
+        "api_animal_requests",
+        role="user",
+        method="post",
+        args=lambda f, rng: [rng.choice(f.available_ids or f.animal_ids)],
+        data={"message": "Benchmark request"},
+    ),
+    Scenario("api_requests", "api_requests", role="user"),
+    Scenario("api_request", "api_request", role="user", args=lambda f, rng: [rng.choice(f.request_ids or [0])]),
+    Scenario("api_requests:staff", "api_requests", role="staff"),
+]
+
+
+def uncovered_url_names() -> list[str]:
+    """``core`` URL names that no scenario exercises (logout, deletes and the like)."""
+    covered = {scenario.url_name for scenario in SCENARIOS}
+    return sorted(
+        pattern.name
+        for pattern in urls.urlpatterns
+        if isinstance(pattern, URLPattern) and pattern.name and pattern.name not in covered
+    )
+
+
+def _summarise(samples: list[dict]) -> dict:
+    latencies = [sample["ms"] for sample in samples]
+    statuses: dict[str, int] = defaultdict(int)
+    for sample in samples:
+        statuses[str(sample["status"])] += 1
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for sample in samples if sample["status"] >= 500),
+        "statuses": dict(statuses),
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "queries": round(statistics.fmean(sample["queries"] for sample in samples), 2),
+        "max_queries": max(sample["queries"] for sample in samples),
+        "bytes": round(statistics.fmean(sample["bytes"] for sample in samples)),
+        "budget": samples[-1]["budget"],
+    }
+
+
+def _request(client: Client, scenario: Scenario, fixtures: Fixtures, rng: random.Random) -> dict:
+    path = reverse(f"core:{scenario.url_name}", args=scenario.args(fixtures, rng))
+    connection = connections[DEFAULT_DB_ALIAS]
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        if scenario.writes:
+            with transaction.atomic():
+                response = getattr(client, scenario.method)(path, scenario.data)
+                transaction.set_rollback(True)
+        else:
+            response = client.get(path, scenario.query(fixtures, rng))
+        body = b"".join(response) if response.streaming else response.content
+        elapsed = (time.perf_counter() - started) * 1000
+    # The view's declared @query_budget, when ViewStatsMiddleware is installed.
+    budget = getattr(getattr(response, "view_stats", None), "budget", None)
+    return {"ms": elapsed, "queries": len(queries), "bytes": len(body), "status": response.status_code, "budget": budget}
+
+
+def run(
+    scenarios: list[Scenario],
+    *,
+    requests: int = 50,
+    concurrency: int = 4,
+    warmup: int = 2,
+    seed: int = 0,
+    fixtures: Fixtures | None = None,
+) -> dict:
+    """Run every scenario ``requests`` times over ``concurrency`` threads; return per-scenario stats."""
+    fixtures = fixtures or Fixtures.load()
+    local = threading.local()
+
+    def client_for(role: str) -> Client:
+        clients = local.__dict__.setdefault("clients", {})
+        if role not in clients:
+            clients[role] = Client(raise_request_exception=False)
+            if role != "anonymous":
+                clients[role].force_login(fixtures.staff if role == "staff" else fixtures.user)
+        return clients[role]
+
+    def worker(scenario: Scenario, count: int, worker_seed: int) -> list[dict]:
+        rng = random.Random(worker_seed)
+        client = client_for(scenario.role)
+        try:
+            return [_request(client, scenario, fixtures, rng) for _ in range(count)]
+        finally:
+            connections.close_all()
+
+    results = {}
+    # Repeated writes from one client would otherwise be measured as 429s from core.ratelimit.
+    with override_settings(RATE_LIMITS={}), ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for scenario in scenarios:
+            for _ in range(warmup):
+                _request(client_for(scenario.role), scenario, fixtures, random.Random(seed))
+            # SQLite takes one writer at a time; concurrent writes would only measure lock timeouts.
+            threads = 1 if scenario.writes and connections[DEFAULT_DB_ALIAS].vendor == "sqlite" else concurrency
+            shares = [requests // threads + (1 if n < requests % threads else 0) for n in range(threads)]
+            started = time.perf_counter()
+            batches = pool.map(worker, [scenario] * threads, shares, [seed + n for n in range(threads)])
+            samples = [sample for batch in batches for sample in batch]
+            wall = time.perf_counter() - started
+            results[scenario.name] = {**_summarise(samples), "rps": round(len(samples) / wall, 1) if wall else 0.0}
+    return results
+
+
+def compare(current: dict, baseline: dict, tolerance: float = 0.2, noise_ms: float = 2.0) -> list[str]:
+    """Human-readable regressions of ``current`` against ``baseline`` (both ``run`` results)."""
+    regressions = []
+    for name, stats in current.items():
+        if stats.get("budget") is not None and stats["max_queries"] > stats["budget"]:
+            regressions.append(f"{name}: {stats['max_queries']} queries, over its budget of {stats['budget']}")
+        before = baseline.get(name)
+        if before is None:
+            continue
+        for metric in ("p50_ms", "p95_ms", "p99_ms"):
+            if stats[metric] > before[metric] * (1 + tolerance) and stats[metric] - before[metric] > noise_ms:
+                regressions.append(f"{name}: {metric} {before[metric]} -> {stats[metric]}")
+        if stats["max_queries"] > before["max_queries"]:
+            regressions.append(f"{name}: max queries {before['max_queries']} -> {stats['max_queries']}")
+        if stats["bytes"] > before["bytes"] * (1 + tolerance):
+            regressions.append(f"{name}: bytes {before['bytes']} -> {stats['bytes']}")
+        if stats["errors"] > before["errors"]:
+            regressions.append(f"{name}: errors {before['errors']} -> {stats['errors']}")
+    return regressions
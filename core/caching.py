@@ -0,0 +1,26 @@
+import hashlib
+
+from django.core.cache import cache
+
+CATALOG_VERSION_KEY = "catalog:version"
+
+
+def catalog_version() -> int:
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, 1, timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY, 1)
+    return version
+
+
+def invalidate_catalog() -> None:
+    """Orphan every cached catalog fragment by bumping the shared version."""
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, 1, timeout=None)
+
+
+def catalog_key(name: str, *parts) -> str:
+    digest = hashlib.md5("\x1f".join(str(part) for part in parts).encode(), usedforsecurity=False).hexdigest()
+    return f"catalog:v{catalog_version()}:{name}:{digest}"
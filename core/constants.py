@@ -1,2 +1,23 @@
 ANIMAL_TYPE_KEYS = ["dog", "cat", "bird", "rabbit", "monkey"]
 ANIMAL_TYPE_CHOICES = [(key, key.title()) for key in ANIMAL_TYPE_KEYS]
+
+CATALOG_PAGE_SIZE = 24
+CATALOG_CACHE_TIMEOUT = 60 * 15
+DASHBOARD_PAGE_SIZE = 50
+# Skipped rows named in a bulk action's summary message.
+SKIPPED_SHOWN = 5
+API_MAX_PAGE_SIZE = 100
+SEARCH_RESULT_LIMIT = 48
+# Request transitions shown on an animal's page to staff.
+HISTORY_LIMIT = 50
+# Nearest neighbours stored per animal (core.similarity) and how many the detail page shows.
+SIMILAR_NEIGHBOURS = 12
+SIMILAR_SHOWN = 4
+
+# Generated image variants (see core.images); widths are in CSS pixels at 1x/2x.
+THUMBNAIL_WIDTHS = (320, 640)
+THUMBNAIL_ASPECT = (4, 3)
+FULL_IMAGE_WIDTHS = (480, 960, 1440)
+
+# Bulk animal import (core.transfer): file extension -> format.
+IMPORT_FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
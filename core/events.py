@@ -0,0 +1,227 @@
+"""Live updates for the request dashboard and the catalog, as server-sent events.
+
+Writes publish small events once their transaction commits: ``requests``
+events (request id, animal id, old and new status) for staff and ``animals``
+events (animal id, new status) for everyone. Each worker process fans events
+out to its open streams in memory. With PostgreSQL, events travel through
+``NOTIFY`` on one channel and every process keeps a single ``LISTEN``
+connection, so a change made in one worker reaches streams held by all of
+them. Other databases only reach streams in the publishing process, which is
+enough for ``runserver`` and single-worker setups.
+
+Streams are only served by the ASGI app; a WSGI worker would be pinned by each
+one, so :func:`stream` answers ``204`` there and the browser stops retrying.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+from contextlib import asynccontextmanager
+from functools import lru_cache, partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.http import Http404, HttpRequest, HttpResponse, StreamingHttpResponse
+from django.utils.module_loading import import_string
+from django.views.decorators.http import require_safe
+
+from .instrumentation import query_budget
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "pet_adoption_events"
+# NOTIFY payloads must stay under 8000 bytes.
+MAX_PAYLOAD = 7000
+# Topic -> whether only staff may follow it.
+TOPICS = {"animals": False, "requests": True}
+# Sent to every stream when events may have been missed; clients catch up by reloading.
+RESET = ("reset", {})
+
+
+def request_event(transition) -> tuple[str, dict]:
+    return (
+        "requests",
+        {
+            "id": transition.request_id,
+            "animal_id": transition.animal_id,
+            "from": transition.from_status,
+            "to": transition.to_status,
+        },
+    )
+
+
+def animal_event(animal_id: int, status: str) -> tuple[str, dict]:
+    return "animals", {"id": animal_id, "status": status}
+
+
+def publish(events: list[tuple[str, dict]]) -> None:
+    """Send ``events`` to live streams once the current transaction commits."""
+    if events:
+        # robust: a broadcaster hiccup must not turn a committed write into an error page.
+        transaction.on_commit(partial(_send, list(events)), robust=True)
+
+
+def _send(events: list[tuple[str, dict]]) -> None:
+    broadcaster().publish(events)
+
+
+class _Subscriber:
+    def __init__(self, topics: set[str]):
+        self.topics = topics | {RESET[0]}
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=getattr(settings, "EVENTS_QUEUE_SIZE", 100))
+        self.overflowed = False
+
+    def deliver(self, events: list) -> None:
+        events = [event for event in events if event[0] in self.topics]
+        if events:
+            try:
+                self.loop.call_soon_threadsafe(self._put, events)
+            except RuntimeError:
+                # The stream's event loop has closed.
+                pass
+
+    def _put(self, events: list) -> None:
+        try:
+            self.queue.put_nowait(events)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class Broadcaster:
+    """Fans events out to the streams open in this process."""
+
+    def __init__(self, alias: str = DEFAULT_DB_ALIAS):
+        self.alias = alias
+        self._subscribers: set[_Subscriber] = set()
+        self._lock = threading.Lock()
+
+    def publish(self, events: list) -> None:
+        self.dispatch(events)
+
+    def dispatch(self, events: list) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.deliver(events)
+
+    async def start(self) -> None:
+        pass
+
+    @asynccontextmanager
+    async def subscribe(self, topics: set[str]):
+        await self.start()
+        subscriber = _Subscriber(topics)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        try:
+            yield subscriber
+        finally:
+            with self._lock:
+                self._subscribers.discard(subscriber)
+
+
+class PostgresBroadcaster(Broadcaster):
+    """``NOTIFY`` on publish; one ``LISTEN`` connection per process feeds the local streams."""
+
+    def __init__(self, alias: str = DEFAULT_DB_ALIAS):
+        super().__init__(alias)
+        self._listener: asyncio.Task | None = None
+
+    def publish(self, events: list) -> None:
+        payloads, chunk, size = [], [], 2
+        for event in map(json.dumps, events):
+            if chunk and size + len(event) + 1 > MAX_PAYLOAD:
+                payloads.append(f"[{','.join(chunk)}]")
+                chunk, size = [], 2
+            chunk.append(event)
+            size += len(event) + 1
+        payloads.append(f"[{','.join(chunk)}]")
+        with connections[self.alias].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload", [CHANNEL, payloads])
+
+    async def start(self) -> None:
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    def _connection_params(self) -> dict:
+        params = connections[self.alias].get_connection_params()
+        # Django's sync cursor class and type adapters do not apply to this raw async connection.
+        params.pop("cursor_factory", None)
+        params.pop("context", None)
+        return params
+
+    async def _listen(self) -> None:
+        import psycopg
+
+        delay = 1.0
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(autocommit=True, **self._connection_params()) as conn:
+                    await conn.execute(f"LISTEN {CHANNEL}")
+                    delay = 1.0
+                    async for notify in conn.notifies():
+                        self.dispatch([tuple(event) for event in json.loads(notify.payload)])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Lost the %s listener; reconnecting in %.0fs.", CHANNEL, delay, exc_info=True)
+            self.dispatch([RESET])
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30.0)
+
+
+@lru_cache(maxsize=None)
+def _broadcaster(backend: str):
+    return import_string(backend)()
+
+
+def broadcaster() -> Broadcaster:
+    return _broadcaster(getattr(settings, "EVENTS_BROADCASTER", "core.events.Broadcaster"))
+
+
+def _format(events: list) -> str:
+    return "".join(f"event: {topic}\ndata: {json.dumps(data)}\n\n" for topic, data in events)
+
+
+async def _events(topic: str):
+    loop = asyncio.get_running_loop()
+    closes_at = loop.time() + settings.EVENTS_MAX_AGE
+    # Browsers reconnect on their own when a stream ends; EVENTS_MAX_AGE keeps workers recyclable.
+    yield f"retry: {settings.EVENTS_RETRY_MS}\n\n"
+    async with broadcaster().subscribe({topic}) as subscriber:
+        while (remaining := closes_at - loop.time()) > 0:
+            try:
+                events = await asyncio.wait_for(
+                    subscriber.queue.get(), timeout=min(settings.EVENTS_HEARTBEAT, remaining)
+                )
+            except TimeoutError:
+                # Keeps proxies from closing an idle connection.
+                yield ": ping\n\n"
+                continue
+            if subscriber.overflowed:
+                yield _format([RESET])
+                return
+            yield _format(events)
+
+
+@query_budget(2)
+@require_safe
+async def stream(request: HttpRequest, topic: str) -> HttpResponse:
+    """Server-sent events for ``topic``: "animals" for anyone, "requests" for staff."""
+    if topic not in TOPICS:
+        raise Http404("Unknown event stream.")
+    user = await request.auser()
+    if TOPICS[topic] and not user.is_staff:
+        return HttpResponse(status=403)
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    # Hand the request's database connection back before settling in for minutes.
+    await sync_to_async(connections.close_all)()
+    response = StreamingHttpResponse(_events(topic), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
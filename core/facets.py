@@ -0,0 +1,77 @@
+"""Maintenance of ``AnimalTypeFacet`` counters.
+
+``Animal.type`` is free text, so the facet key is the case-folded, whitespace
+collapsed spelling; the filter on ``home`` matches ``lower(type)`` against it.
+Saves and deletes go through the signal receivers in core.signals; code that
+changes ``Animal.status`` with queryset ``update()`` must call :func:`move`.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, Min
+from django.db.models.functions import Greatest, Lower
+
+from .models import Animal, AnimalStatus, AnimalTypeFacet
+
+STATUS_COLUMNS = {
+    AnimalStatus.AVAILABLE: "available_count",
+    AnimalStatus.PENDING: "pending_count",
+    AnimalStatus.ADOPTED: "adopted_count",
+}
+
+
+def clean_type(value: str) -> str:
+    return " ".join((value or "").split())
+
+
+def type_key(value: str) -> str:
+    return clean_type(value).lower()
+
+
+def _shift(type_value: str, status: str, delta: int) -> None:
+    key = type_key(type_value)
+    column = STATUS_COLUMNS.get(status)
+    if not key or column is None or not delta:
+        return
+    change = {column: Greatest(F(column) + delta, 0)}
+    if not AnimalTypeFacet.objects.filter(key=key).update(**change) and delta > 0:
+        AnimalTypeFacet.objects.get_or_create(key=key, defaults={"label": clean_type(type_value)})
+        AnimalTypeFacet.objects.filter(key=key).update(**change)
+
+
+def move(before: tuple | None, after: tuple | None, count: int = 1) -> None:
+    """Move ``count`` animals from one (type, status) bucket to another."""
+    if before == after:
+        return
+    with transaction.atomic():
+        if before:
+            _shift(*before, -count)
+        if after:
+            _shift(*after, count)
+
+
+def visible_facets():
+    return AnimalTypeFacet.objects.exclude(available_count=0, pending_count=0, adopted_count=0)
+
+
+@transaction.atomic
+def rebuild() -> int:
+    """Recount every facet from the Animal table (used to repair drift)."""
+    rows = (
+        Animal.objects.annotate(key=Lower("type"))
+        .values("key", "status")
+        .annotate(n=Count("pk"), label=Min("type"))
+        .order_by()
+    )
+    facets: dict[str, AnimalTypeFacet] = {}
+    for row in rows:
+        facet = facets.setdefault(row["key"], AnimalTypeFacet(key=row["key"], label=row["label"]))
+        facet.label = min(facet.label, row["label"])
+        setattr(facet, STATUS_COLUMNS[row["status"]], row["n"])
+    AnimalTypeFacet.objects.exclude(key__in=facets).delete()
+    AnimalTypeFacet.objects.bulk_create(
+        facets.values(),
+        update_conflicts=True,
+        unique_fields=["key"],
+        update_fields=["label", *STATUS_COLUMNS.values()],
+    )
+    return len(facets)
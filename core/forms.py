@@ -1,7 +1,11 @@
+import zipfile
+from pathlib import PurePosixPath
+
 from django import forms
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth.models import User
 
+from .constants import IMPORT_FORMATS
 from .models import Animal, AdoptionRequest
 
 class AnimalForm(forms.ModelForm):
@@ -16,11 +20,30 @@ class AnimalForm(forms.ModelForm):
         self.fields["type"].widget.attrs.update({"placeholder": "e.g. Cat or Arabic name"})
 
     def clean_type(self):
-        value = (self.cleaned_data.get("type") or "").strip()
+        value = " ".join((self.cleaned_data.get("type") or "").split())
         if not value:
             raise forms.ValidationError("Please provide an animal type.")
         return value
 
+class AnimalImportForm(forms.Form):
+    rows = forms.FileField(label="Animals file", help_text="CSV with a header row, or JSON Lines (.jsonl).")
+    images = forms.FileField(
+        label="Photos (zip)", required=False, help_text="Files named in the image column, at their paths in the zip."
+    )
+    dry_run = forms.BooleanField(label="Only check the file", required=False)
+
+    def clean_rows(self):
+        upload = self.cleaned_data["rows"]
+        if PurePosixPath(upload.name).suffix.lower() not in IMPORT_FORMATS:
+            raise forms.ValidationError("Upload a .csv or .jsonl file.")
+        return upload
+
+    def clean_images(self):
+        upload = self.cleaned_data.get("images")
+        if upload and not zipfile.is_zipfile(upload):
+            raise forms.ValidationError("Photos must be uploaded as a zip archive.")
+        return upload
+
 class AdoptionRequestForm(forms.ModelForm):
     class Meta:
         model = AdoptionRequest
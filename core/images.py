@@ -0,0 +1,152 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING
+
+from django.core.files.base import ContentFile
+
+from .constants import FULL_IMAGE_WIDTHS, THUMBNAIL_ASPECT, THUMBNAIL_WIDTHS
+from .models import Animal, ArchivedAnimal
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+# Pillow is imported inside the functions that resize photos, so web workers only
+# load it once they handle an upload; the job worker pays for it instead.
+
+FORMAT_OPTIONS = {
+    "avif": ("AVIF", {"quality": 55}),
+    "webp": ("WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+MIME_TYPES = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg"}
+
+
+def available_formats() -> list[str]:
+    from PIL import Image
+
+    Image.init()
+    return [fmt for fmt in ("avif", "webp") if FORMAT_OPTIONS[fmt][0] in Image.SAVE]
+
+
+def _encode(img: "Image.Image", fmt: str) -> bytes:
+    pil_format, options = FORMAT_OPTIONS[fmt]
+    if fmt == "jpeg" and img.mode != "RGB":
+        img = img.convert("RGB")
+    buffer = BytesIO()
+    img.save(buffer, pil_format, **options)
+    return buffer.getvalue()
+
+
+def _variant_name(source_name: str, kind: str, width: int, fmt: str) -> str:
+    path = PurePosixPath(source_name)
+    extension = "jpg" if fmt == "jpeg" else fmt
+    return str(path.with_name(f"{path.stem}_{kind}_{width}w.{extension}"))
+
+
+def _open(field_file, largest: int) -> "Image.Image":
+    from PIL import Image, ImageOps
+
+    field_file.open("rb")
+    try:
+        img = Image.open(field_file)
+        # Let the JPEG decoder downscale while reading; originals are often 4000px+.
+        img.draft("RGB", (largest * 2, largest * 2))
+        img = ImageOps.exif_transpose(img)
+        img.load()
+    finally:
+        field_file.close()
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA" if "transparency" in img.info or img.mode in ("LA", "PA") else "RGB")
+    return img
+
+
+def build_variants(animal) -> dict:
+    """Render thumbnail and full-size variants of ``animal.image`` next to the original.
+
+    Returns the manifest stored on ``Animal.image_variants``: for each kind and
+    format, a mapping of pixel width to storage name. Variants carry no EXIF data.
+    """
+    from PIL import Image, ImageOps
+
+    field_file = animal.image
+    storage = field_file.storage
+    img = _open(field_file, max(FULL_IMAGE_WIDTHS))
+    formats = available_formats()
+    manifest = {"source": field_file.name, "width": img.width, "height": img.height, "thumb": {}, "full": {}}
+
+    ratio_w, ratio_h = THUMBNAIL_ASPECT
+    for width in THUMBNAIL_WIDTHS:
+        height = round(width * ratio_h / ratio_w)
+        thumb = ImageOps.fit(img, (width, height), Image.Resampling.LANCZOS)
+        # The smallest thumbnail also gets a JPEG for browsers without WebP/AVIF.
+        thumb_formats = [*formats, "jpeg"] if width == THUMBNAIL_WIDTHS[0] else formats
+        for fmt in thumb_formats:
+            name = storage.save(_variant_name(field_file.name, "thumb", width, fmt), ContentFile(_encode(thumb, fmt)))
+            manifest["thumb"].setdefault(fmt, {})[str(width)] = name
+
+    widths = [w for w in FULL_IMAGE_WIDTHS if w < img.width] + [min(img.width, max(FULL_IMAGE_WIDTHS))]
+    for width in dict.fromkeys(widths):
+        resized = img if width == img.width else img.resize(
+            (width, round(img.height * width / img.width)), Image.Resampling.LANCZOS
+        )
+        for fmt in formats:
+            name = storage.save(_variant_name(field_file.name, "full", width, fmt), ContentFile(_encode(resized, fmt)))
+            manifest["full"].setdefault(fmt, {})[str(width)] = name
+    return manifest
+
+
+def delete_variants(manifest: dict, storage) -> None:
+    for kind in ("thumb", "full"):
+        for names in manifest.get(kind, {}).values():
+            for name in names.values():
+                storage.delete(name)
+
+
+def _twins(pk, name: str):
+    """Other animals whose image is the same stored file (uploads are deduplicated by content)."""
+    return Animal.objects.exclude(pk=pk).filter(image=name)
+
+
+def _shared(pk, name: str) -> bool:
+    # Archived adoptions may show the same deduplicated file, so their copies of the variants are kept too.
+    return _twins(pk, name).exists() or ArchivedAnimal.objects.filter(image=name).exists()
+
+
+def refresh_variants(animal) -> None:
+    """Regenerate (or drop) variants after ``animal.image`` changed."""
+    previous = animal.image_variants
+    if previous and not _shared(animal.pk, previous.get("source")):
+        delete_variants(previous, animal.image.storage)
+    manifest = {}
+    if animal.image:
+        twin = _twins(animal.pk, animal.image.name).only("image_variants").first()
+        if twin and twin.image_variants.get("source") == animal.image.name:
+            manifest = twin.image_variants
+        else:
+            manifest = build_variants(animal)
+    animal.image_variants = manifest
+    animal.save(update_fields=["image_variants"])
+
+
+def forget_variants(animal_id: int, manifest: dict) -> None:
+    """Delete the variants of a deleted animal unless another animal, live or archived, shows the same file."""
+    if manifest and not _shared(animal_id, manifest.get("source")):
+        delete_variants(manifest, Animal._meta.get_field("image").storage)
+
+
+def variants_are_current(animal) -> bool:
+    if not animal.image:
+        return not animal.image_variants
+    return animal.image_variants.get("source") == animal.image.name
+
+
+def variant_url(animal, kind: str = "full", width: int = 960) -> str:
+    """Best single WebP (or original) URL no wider than ``width``."""
+    if not animal.image:
+        return ""
+    names = (animal.image_variants.get(kind) or {}).get("webp") if variants_are_current(animal) else None
+    if not names:
+        return animal.image.url
+    widths = sorted(int(w) for w in names)
+    chosen = max([w for w in widths if w <= width] or widths[:1])
+    return animal.image.storage.url(names[str(chosen)])
@@ -0,0 +1,314 @@
+"""Per-request query, DB-time and render-time accounting.
+
+``ViewStatsMiddleware`` times every resolved request, counts its SQL through a
+connection ``execute_wrapper`` and keeps the last ``VIEW_STATS_BUFFER_SIZE``
+samples in an in-process ring buffer for the staff stats page. It runs in
+whichever mode the rest of the stack does, so async views stay on the event
+loop; the wrapper sits on every connection, including those opened in
+``sync_to_async`` threads, and counts for whichever request is current. A
+streamed response is recorded once its body has been sent, so the queries its
+iterator runs count too. Template rendering is timed by ``TimedDjangoTemplates``
+(configured as the template backend), with the SQL that lazy querysets run
+during rendering counted as DB time rather than render time.
+
+Views declare how many queries they may run with ``@query_budget(n)``. A
+request over budget is logged, or raises ``QueryBudgetExceeded`` when
+``QUERY_BUDGETS_STRICT`` is on, which is how test runs enforce the budgets.
+"""
+
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar["Sample | None"] = ContextVar("view_stats_sample", default=None)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_budget(queries: int):
+    """Declare the most SQL queries one request to the decorated view (function or class) may run."""
+
+    def decorator(view):
+        view.query_budget = queries
+        return view
+
+    return decorator
+
+
+@dataclass
+class Sample:
+    view: str = ""
+    method: str = ""
+    status: int = 0
+    queries: int = 0
+    db_ms: float = 0.0
+    render_ms: float = 0.0
+    total_ms: float = 0.0
+    bytes: int | None = None
+    budget: int | None = None
+    at: str = ""
+    rendering: bool = field(default=False, repr=False)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.queries > self.budget
+
+    def server_timing(self) -> str:
+        return (
+            f'db;dur={self.db_ms:.1f};desc="{self.queries} queries", '
+            f"render;dur={self.render_ms:.1f}, total;dur={self.total_ms:.1f}"
+        )
+
+
+class RingBuffer:
+    def __init__(self, size: int):
+        self._samples: deque[Sample] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def append(self, sample: Sample) -> None:
+        with self._lock:
+            self._samples.append(sample)
+
+    def snapshot(self) -> list[Sample]:
+        with self._lock:
+            return list(self._samples)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._samples.clear()
+
+
+buffer = RingBuffer(getattr(settings, "VIEW_STATS_BUFFER_SIZE", 1000))
+
+
+def percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def summary(samples: list[Sample]) -> list[dict]:
+    """Per-view aggregates, slowest p95 first."""
+    by_view: dict[str, list[Sample]] = {}
+    for sample in samples:
+        by_view.setdefault(sample.view, []).append(sample)
+    rows = []
+    for view, group in by_view.items():
+        totals = [sample.total_ms for sample in group]
+        sizes = [sample.bytes for sample in group if sample.bytes is not None]
+        rows.append(
+            {
+                "view": view,
+                "requests": len(group),
+                "p50_ms": percentile(totals, 50),
+                "p95_ms": percentile(totals, 95),
+                "db_ms": statistics.fmean(sample.db_ms for sample in group),
+                "render_ms": statistics.fmean(sample.render_ms for sample in group),
+                "queries": statistics.fmean(sample.queries for sample in group),
+                "max_queries": max(sample.queries for sample in group),
+                "budget": group[-1].budget,
+                "over_budget": sum(1 for sample in group if sample.over_budget),
+                "bytes": round(statistics.fmean(sizes)) if sizes else None,
+            }
+        )
+    return sorted(rows, key=lambda row: row["p95_ms"], reverse=True)
+
+
+def pool_stats() -> dict[str, dict]:
+    """psycopg pool counters (size, available, waiting, errors, ...) for each pooled alias in this process."""
+    stats = {}
+    for alias in connections:
+        pool = getattr(connections[alias], "pool", None)
+        if pool is not None:
+            stats[alias] = pool.get_stats()
+    return stats
+
+
+def _count_query(execute, sql, params, many, context):
+    sample = _current.get()
+    # SQLite opens transactions with an explicit BEGIN; other backends do not run one, so budgets ignore it.
+    if sample is None or sql == "BEGIN":
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        sample.queries += 1
+        sample.db_ms += (time.perf_counter() - started) * 1000
+
+
+def _install_counter(connection) -> None:
+    if _count_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_count_query)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    _install_counter(connection)
+
+
+# Connections live per thread; those that async views open in sync_to_async threads get the counter here.
+connection_created.connect(_on_connection_created, dispatch_uid="core.instrumentation.count_queries")
+
+
+class ViewStatsMiddleware:
+    """Record a ``Sample`` per resolved request and send a ``Server-Timing`` header (except on streamed responses)."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        self.strict = getattr(settings, "QUERY_BUDGETS_STRICT", False)
+        self.server_timing = getattr(settings, "SERVER_TIMING_HEADER", settings.DEBUG)
+
+    def _start(self, request) -> Sample:
+        # Connections this thread opened before the counter was registered.
+        for alias in connections:
+            _install_counter(connections[alias])
+        return Sample(method=request.method)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        sample = self._start(request)
+        token = _current.set(sample)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, sample, started)
+
+    async def __acall__(self, request):
+        sample = self._start(request)
+        token = _current.set(sample)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, sample, started)
+
+    def _finish(self, request, response, sample: Sample, started: float):
+        match = request.resolver_match
+        if match is None:
+            return response
+        sample.view = match.view_name
+        sample.status = response.status_code
+        # Class-based views carry the budget on the class rather than the as_view() function.
+        view_class = getattr(match.func, "view_class", None)
+        sample.budget = getattr(match.func, "query_budget", getattr(view_class, "query_budget", None))
+        response.view_stats = sample
+        if response.streaming:
+            sample.bytes = 0
+            stream = self._astream if response.is_async else self._stream
+            response.streaming_content = stream(response.streaming_content, sample, started)
+            return response
+        sample.bytes = len(response.content)
+        self._record(sample, started)
+        if self.server_timing:
+            response["Server-Timing"] = sample.server_timing()
+        return response
+
+    def _stream(self, content, sample: Sample, started: float):
+        chunks = iter(content)
+        while True:
+            # Set around each step only: between steps the context belongs to the server.
+            token = _current.set(sample)
+            try:
+                chunk = next(chunks, None)
+            finally:
+                _current.reset(token)
+            if chunk is None:
+                break
+            sample.bytes += len(chunk)
+            yield chunk
+        self._record(sample, started)
+
+    async def _astream(self, content, sample: Sample, started: float):
+        chunks = aiter(content)
+        while True:
+            token = _current.set(sample)
+            try:
+                chunk = await anext(chunks, None)
+            finally:
+                _current.reset(token)
+            if chunk is None:
+                break
+            sample.bytes += len(chunk)
+            yield chunk
+        self._record(sample, started)
+
+    def _record(self, sample: Sample, started: float) -> None:
+        sample.total_ms = (time.perf_counter() - started) * 1000
+        sample.at = timezone.now().isoformat(timespec="seconds")
+        buffer.append(sample)
+        if sample.over_budget:
+            message = f"{sample.view} ran {sample.queries} queries; its budget is {sample.budget}."
+            if self.strict:
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+
+def assert_query_budget(response) -> None:
+    """For tests: fail if the request behind a test-client ``response`` exceeded its view's budget.
+
+    Read a streamed response's body first; its queries are only counted once it has been sent.
+    """
+    sample = getattr(response, "view_stats", None)
+    if sample is None:
+        raise AssertionError("No view stats on the response; is ViewStatsMiddleware installed?")
+    if sample.over_budget:
+        raise QueryBudgetExceeded(f"{sample.view} ran {sample.queries} queries; its budget is {sample.budget}.")
+
+
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        sample = _current.get()
+        if sample is None or sample.rendering:
+            return super().render(context, request)
+        sample.rendering = True
+        db_before = sample.db_ms
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            sample.render_ms += elapsed - (sample.db_ms - db_before)
+            sample.rendering = False
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The standard Django template backend, with rendering time charged to the current request."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+def as_dicts(samples: list[Sample]) -> list[dict]:
+    return [{key: value for key, value in asdict(sample).items() if key != "rendering"} for sample in samples]
@@ -0,0 +1,132 @@
+"""A small database-backed job queue.
+
+Jobs are rows in ``core_job``. Workers claim them with ``SELECT ... FOR UPDATE
+SKIP LOCKED`` so several ``runworker`` processes can share the table without an
+external broker. Handlers are registered with :func:`task` and receive the job
+payload as keyword arguments.
+"""
+
+import logging
+import traceback
+from datetime import timedelta
+from typing import Callable
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+_registry: dict[str, Callable[..., None]] = {}
+
+RETRY_BASE_DELAY = timedelta(seconds=15)
+
+
+class UnknownTask(LookupError):
+    pass
+
+
+def task(name: str):
+    def decorator(func):
+        _registry[name] = func
+        return func
+
+    return decorator
+
+
+def enqueue(task_name: str, *, run_at=None, max_attempts: int = 5, **payload) -> Job:
+    if task_name not in _registry:
+        raise UnknownTask(task_name)
+    return Job.objects.create(
+        task=task_name,
+        payload=payload,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts,
+    )
+
+
+def enqueue_many(task_name: str, payloads: list[dict], *, max_attempts: int = 5) -> list[Job]:
+    """Queue one job per payload with a single INSERT, e.g. after a bulk import."""
+    if task_name not in _registry:
+        raise UnknownTask(task_name)
+    now = timezone.now()
+    return Job.objects.bulk_create(
+        [Job(task=task_name, payload=payload, run_at=now, max_attempts=max_attempts) for payload in payloads]
+    )
+
+
+def claim(limit: int) -> list[int]:
+    """Mark up to ``limit`` due jobs as running and return their ids."""
+    if limit <= 0:
+        return []
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=JobStatus.QUEUED, run_at__lte=now)
+            .order_by("run_at")
+            .values_list("pk", flat=True)[:limit]
+        )
+        if ids:
+            Job.objects.filter(pk__in=ids).update(
+                status=JobStatus.RUNNING, locked_at=now, attempts=F("attempts") + 1, updated_at=now
+            )
+    return ids
+
+
+def execute(job_id: int) -> str:
+    job = Job.objects.get(pk=job_id)
+    try:
+        handler = _registry.get(job.task)
+        if handler is None:
+            raise UnknownTask(job.task)
+        handler(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            job.status = JobStatus.FAILED
+        else:
+            job.status = JobStatus.QUEUED
+            job.run_at = timezone.now() + RETRY_BASE_DELAY * 2 ** (job.attempts - 1)
+        job.last_error = error
+        logger.warning("Job %s (%s) failed on attempt %s", job.pk, job.task, job.attempts, exc_info=True)
+    else:
+        job.status = JobStatus.DONE
+        job.last_error = ""
+    job.locked_at = None
+    job.save(update_fields=["status", "run_at", "last_error", "locked_at", "updated_at"])
+    return job.status
+
+
+def take_over(task_name: str, limit: int) -> list[dict]:
+    """Mark up to ``limit`` other due ``task_name`` jobs done and return their payloads.
+
+    For handlers that are cheaper run once over many payloads. Call it inside the
+    transaction that does their work, so a failure puts them back in the queue.
+    """
+    now = timezone.now()
+    jobs = list(
+        Job.objects.select_for_update(skip_locked=True)
+        .filter(task=task_name, status=JobStatus.QUEUED, run_at__lte=now)
+        .order_by("run_at")
+        .values_list("pk", "payload")[:limit]
+    )
+    if jobs:
+        Job.objects.filter(pk__in=[pk for pk, _ in jobs]).update(status=JobStatus.DONE, updated_at=now)
+    return [payload for _, payload in jobs]
+
+
+def requeue_stale(older_than: timedelta) -> int:
+    """Put back jobs whose worker died mid-run."""
+    cutoff = timezone.now() - older_than
+    return Job.objects.filter(status=JobStatus.RUNNING, locked_at__lt=cutoff).update(
+        status=JobStatus.QUEUED, locked_at=None, updated_at=timezone.now()
+    )
+
+
+def retry(queryset) -> int:
+    return queryset.exclude(status=JobStatus.RUNNING).update(
+        status=JobStatus.QUEUED, run_at=timezone.now(), attempts=0, locked_at=None, updated_at=timezone.now()
+    )
@@ -0,0 +1,28 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.archive import ARCHIVE_AFTER, ARCHIVE_BATCH_SIZE, archive_adoptions
+
+
+class Command(BaseCommand):
+    help = "Move adopted animals older than a cutoff, with their adoption requests, into the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=ARCHIVE_AFTER.days, help="Archive what has not changed for this many days."
+        )
+        parser.add_argument("--batch-size", type=int, default=ARCHIVE_BATCH_SIZE)
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches.")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be archived.")
+
+    def handle(self, *args, days, batch_size, pause, dry_run, **options):
+        if days < 0:
+            raise CommandError("--days cannot be negative.")
+        cutoff = timezone.now() - timedelta(days=days)
+        result = archive_adoptions(cutoff, batch_size=max(batch_size, 1), pause=pause, dry_run=dry_run)
+        verb = "Would archive" if dry_run else "Archived"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {result.animals} adopted animal(s) and {result.requests} request(s).")
+        )
@@ -0,0 +1,94 @@
+import json
+import logging
+import platform
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+
+from core import benchmark
+from core.models import AdoptionRequest, Animal
+
+
+class Command(BaseCommand):
+    help = "Benchmark the core views through the test client; optionally save or compare a baseline JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=50, help="Measured requests per scenario.")
+        parser.add_argument("--concurrency", type=int, default=4, help="Client threads per scenario.")
+        parser.add_argument("--warmup", type=int, default=2, help="Unmeasured requests per scenario.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--only", nargs="*", default=[], help="Scenario names or URL names to run.")
+        parser.add_argument("--save", metavar="PATH", help="Write the results as a baseline JSON file.")
+        parser.add_argument("--compare", metavar="PATH", help="Compare against a baseline saved with --save.")
+        parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed latency/bytes growth (0.2 = 20%%).")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be at least 1.")
+        scenarios = [
+            scenario
+            for scenario in benchmark.SCENARIOS
+            if not options["only"] or {scenario.name, scenario.url_name} & set(options["only"])
+        ]
+        if not scenarios:
+            raise CommandError("No scenario matches --only.")
+        try:
+            fixtures = benchmark.Fixtures.load()
+        except LookupError as exc:
+            raise CommandError(str(exc))
+
+        if options["verbosity"] < 2:
+            # Failed requests are counted in the report; their tracebacks would bury it.
+            logging.getLogger("django.request").setLevel(logging.CRITICAL)
+        results = benchmark.run(
+            scenarios,
+            requests=options["requests"],
+            concurrency=options["concurrency"],
+            warmup=options["warmup"],
+            seed=options["seed"],
+            fixtures=fixtures,
+        )
+
+        self.stdout.write(
+            f"{'scenario':<26}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'rps':>8}{'queries':>9}{'budget':>8}{'bytes':>9}  statuses"
+        )
+        for name, stats in results.items():
+            self.stdout.write(
+                f"{name:<26}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}"
+                f"{stats['rps']:>8.1f}{stats['queries']:>9.1f}{stats['budget'] if stats['budget'] is not None else '-':>8}"
+                f"{stats['bytes']:>9}  {stats['statuses']}"
+            )
+        uncovered = benchmark.uncovered_url_names()
+        if uncovered and not options["only"]:
+            self.stdout.write(f"Not benchmarked: {', '.join(uncovered)}")
+
+        if options["save"]:
+            document = {
+                "created_at": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "animals": Animal.objects.count(),
+                "requests": AdoptionRequest.objects.count(),
+                "settings": {key: options[key] for key in ("requests", "concurrency", "warmup", "seed")},
+                "results": results,
+            }
+            Path(options["save"]).write_text(json.dumps(document, indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Saved baseline to {options['save']}."))
+
+        baseline = {}
+        if options["compare"]:
+            try:
+                baseline = json.loads(Path(options["compare"]).read_text())["results"]
+            except (OSError, ValueError, KeyError) as exc:
+                raise CommandError(f"Cannot read baseline {options['compare']}: {exc}")
+        # Query budgets are checked on every run; latency, bytes and errors only against a baseline.
+        regressions = benchmark.compare(results, baseline, tolerance=options["tolerance"])
+        for line in regressions:
+            self.stderr.write(f"Regression: {line}")
+        if not regressions and options["compare"]:
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {options['compare']}."))
+        elif regressions and options["fail_on_regression"]:
+            raise CommandError(f"{len(regressions)} regression(s).")
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from core.images import refresh_variants, variants_are_current
+from core.models import Animal
+
+
+class Command(BaseCommand):
+    help = "Generate thumbnails and responsive WebP/AVIF variants for existing animal photos."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Rebuild variants even if they are up to date.")
+        parser.add_argument("--batch-size", type=int, default=200)
+
+    def handle(self, *args, force=False, batch_size=200, **options):
+        animals = Animal.objects.exclude(image="").exclude(image__isnull=True).only("pk", "image", "image_variants")
+        built = failed = 0
+        for animal in animals.order_by("pk").iterator(chunk_size=batch_size):
+            if not force and variants_are_current(animal):
+                continue
+            try:
+                refresh_variants(animal)
+            except (OSError, ValueError) as exc:
+                failed += 1
+                self.stderr.write(f"Animal {animal.pk} ({animal.image.name}): {exc}")
+                continue
+            built += 1
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Built variants for animal {animal.pk}")
+        self.stdout.write(self.style.SUCCESS(f"Built variants for {built} animal(s); {failed} failed."))
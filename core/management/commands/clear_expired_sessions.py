@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from core.sessions import CLEAR_BATCH_SIZE, clear_expired
+
+
+class Command(BaseCommand):
+    help = "Delete expired database sessions in small batches (a gentler clearsessions)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=CLEAR_BATCH_SIZE)
+        parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches.")
+
+    def handle(self, *args, batch_size, pause, **options):
+        deleted = clear_expired(batch_size=max(batch_size, 1), pause=pause)
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired session(s)."))
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+
+from core.caching import invalidate_catalog
+from core.images import refresh_variants
+from core.models import Animal, ArchivedAnimal
+from core.storage import is_hashed
+
+
+class Command(BaseCommand):
+    help = "Move animal photos uploaded before content hashing to hashed names, merging identical files."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true")
+        parser.add_argument(
+            "--delete-originals", action="store_true", help="Delete the old files once no animal, live or archived, refers to them."
+        )
+
+    def handle(self, *args, dry_run=False, delete_originals=False, **options):
+        animals = Animal.objects.exclude(image="").exclude(image__isnull=True).only("pk", "image", "image_variants")
+        storage = Animal._meta.get_field("image").storage
+        moved: dict[str, str] = {}
+        failed = 0
+        for animal in animals.order_by("pk"):
+            old = animal.image.name
+            if is_hashed(old):
+                continue
+            if old not in moved:
+                if dry_run:
+                    moved[old] = old
+                    continue
+                try:
+                    with storage.open(old, "rb") as source:
+                        moved[old] = storage.save(old, source)
+                except OSError as exc:
+                    failed += 1
+                    self.stderr.write(f"Animal {animal.pk} ({old}): {exc}")
+                    continue
+            if dry_run:
+                continue
+            Animal.objects.filter(pk=animal.pk).update(image=moved[old])
+            animal.image.name = moved[old]
+            refresh_variants(animal)
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Animal {animal.pk}: {old} -> {moved[old]}")
+
+        if dry_run:
+            self.stdout.write(f"{len(moved)} file(s) would be renamed.")
+            return
+        if moved:
+            invalidate_catalog()
+        deleted = 0
+        if delete_originals:
+            for old in moved:
+                if not Animal.objects.filter(image=old).exists() and not ArchivedAnimal.objects.filter(image=old).exists():
+                    storage.delete(old)
+                    deleted += 1
+        merged = len(moved) - len(set(moved.values()))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Renamed {len(moved)} file(s), {merged} merged as duplicates; "
+                f"deleted {deleted} original(s); {failed} failed."
+            )
+        )
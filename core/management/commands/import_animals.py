@@ -0,0 +1,48 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core import transfer
+from core.constants import IMPORT_FORMATS
+
+
+class Command(BaseCommand):
+    help = "Import animals from a CSV or JSON Lines file, validating each row like the add-animal form."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="A .csv or .jsonl file, or - for standard input.")
+        parser.add_argument("--format", choices=sorted(set(IMPORT_FORMATS.values())), help="Defaults to the extension.")
+        parser.add_argument("--images", help="Zip archive or directory holding the files named in the image column.")
+        parser.add_argument("--user", help="Staff username recorded as the creator (defaults to the first staff user).")
+        parser.add_argument("--chunk-size", type=int, default=transfer.IMPORT_CHUNK_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Validate every row without saving anything.")
+
+    def handle(self, *args, path, format, images, user, chunk_size, dry_run, **options):
+        staff = User.objects.filter(is_staff=True, is_active=True)
+        creator = (staff.filter(username=user) if user else staff.order_by("pk")).first()
+        if creator is None:
+            raise CommandError(f"No active staff user {user!r}." if user else "Create a staff user first.")
+        try:
+            fmt = format or transfer.format_for(path)
+            source = transfer.ImageSource(images) if images else None
+        except (transfer.UnsupportedFormat, OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+        try:
+            result = transfer.import_animals(
+                transfer.read_rows(stream, fmt), creator, source, chunk_size=max(chunk_size, 1), dry_run=dry_run
+            )
+        finally:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+            if source is not None:
+                source.close()
+
+        for line, error in result.errors:
+            self.stderr.write(f"Line {line}: {error}")
+        verb = "would be imported" if dry_run else "imported"
+        self.stdout.write(
+            self.style.SUCCESS(f"{result.created} animal(s) {verb}; {len(result.errors)} row(s) rejected.")
+        )
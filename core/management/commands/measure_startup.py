@@ -0,0 +1,122 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter: boot the ASGI app the way the gunicorn master does, then
+# fork workers (or, without preloading, fork first and boot in each) and report memory.
+PROBE = r"""
+import gc, json, os, sys, time
+
+def memory():
+    fields = {}
+    try:
+        with open("/proc/self/smaps_rollup") as handle:
+            for line in handle:
+                name, _, value = line.partition(":")
+                if value.strip().endswith("kB"):
+                    fields[name] = int(value.split()[0])
+    except OSError:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return {"rss_kb": rss // 1024 if sys.platform == "darwin" else rss}
+    return {
+        "rss_kb": fields.get("Rss", 0),
+        "pss_kb": fields.get("Pss", 0),
+        "private_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+def boot():
+    # pet_adoption.asgi would warm the templates itself; the parent switched that off so it can be timed apart.
+    started = time.perf_counter()
+    import pet_adoption.asgi
+    from core.warmup import warm_templates
+    imported = time.perf_counter()
+    templates = warm_templates() if warm else 0
+    return {
+        "import_ms": (imported - started) * 1000,
+        "warm_ms": (time.perf_counter() - imported) * 1000,
+        "templates": templates,
+        "modules": sorted(m for m in ("PIL", "django.contrib.admin", "psycopg", "psycopg2", "boto3") if m in sys.modules),
+    }
+
+workers, preload, warm = int(sys.argv[1]), sys.argv[2] == "1", sys.argv[3] == "1"
+report = boot() if preload else {}
+if preload:
+    report["master"] = memory()
+    gc.freeze()
+children = []
+for _ in range(workers):
+    read_end, write_end = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        worker = {} if preload else boot()
+        gc.collect()
+        worker.update(memory())
+        os.write(write_end, json.dumps(worker).encode())
+        os._exit(0)
+    os.close(write_end)
+    children.append((pid, read_end))
+report["workers"] = []
+for pid, read_end in children:
+    with os.fdopen(read_end) as handle:
+        report["workers"].append(json.loads(handle.read()))
+    os.waitpid(pid, 0)
+print(json.dumps(report))
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure cold boot time of the ASGI app and memory per forked worker."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=3)
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument(
+            "--no-preload", action="store_true", help="Boot in each worker after forking (gunicorn without preload_app)."
+        )
+
+    def handle(self, *args, runs, workers, no_preload, **options):
+        if not hasattr(os, "fork"):
+            self.stderr.write("Forking workers is not supported on this platform.")
+            return
+        env = {
+            **os.environ,
+            "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "pet_adoption.settings"),
+            "TEMPLATES_WARM_AT_BOOT": "False",
+        }
+        warm = "1" if settings.TEMPLATES_WARM_AT_BOOT else "0"
+        command = [sys.executable, "-c", PROBE, str(max(workers, 1)), "0" if no_preload else "1", warm]
+        reports, totals = [], []
+        for _ in range(max(runs, 1)):
+            started = time.perf_counter()
+            result = subprocess.run(command, env=env, capture_output=True, text=True, check=False)
+            totals.append((time.perf_counter() - started) * 1000)
+            if result.returncode:
+                self.stderr.write(result.stderr)
+                return
+            reports.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+        # Boot timings come from the master, or from every worker when each one boots itself.
+        booted = [boot for report in reports for boot in (report["workers"] if no_preload else [report])]
+        self.stdout.write(f"Mode: {'boot in each worker' if no_preload else 'preloaded in the master'}, {runs} run(s)")
+        self.stdout.write(f"Process start to workers ready: {statistics.median(totals):.0f} ms (median)")
+        self.stdout.write(f"App import: {statistics.median(b['import_ms'] for b in booted):.0f} ms (median)")
+        self.stdout.write(
+            f"Template warm-up: {statistics.median(b['warm_ms'] for b in booted):.0f} ms for {booted[-1]['templates']} template(s)"
+        )
+        self.stdout.write(f"Heavy modules loaded at boot: {', '.join(booted[-1]['modules']) or 'none'}")
+        last = reports[-1]
+        if "master" in last:
+            self.stdout.write(f"Master RSS: {last['master']['rss_kb'] / 1024:.1f} MiB")
+        for number, worker in enumerate(last["workers"], 1):
+            line = f"Worker {number}: RSS {worker['rss_kb'] / 1024:.1f} MiB"
+            if "pss_kb" in worker:
+                line += f", PSS {worker['pss_kb'] / 1024:.1f} MiB, private {worker['private_kb'] / 1024:.1f} MiB"
+            self.stdout.write(line)
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from core import similarity
+
+
+class Command(BaseCommand):
+    help = "Recompute every animal's similar pets (run after migrating, and now and then to correct drift)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=similarity.BATCH_SIZE)
+
+    def handle(self, *args, batch_size, **options):
+        count = similarity.rebuild(batch_size=max(batch_size, 1))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt similar pets for {count} animal(s)."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from core import facets
+from core.caching import invalidate_catalog
+
+
+class Command(BaseCommand):
+    help = "Recount the animal type facets shown in the catalog filter."
+
+    def handle(self, *args, **options):
+        count = facets.rebuild()
+        invalidate_catalog()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} type facet(s)."))
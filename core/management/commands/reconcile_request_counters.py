@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from core.adoptions import reconcile_counters
+from core.caching import invalidate_catalog
+
+
+class Command(BaseCommand):
+    help = "Recount the per-status adoption request counters stored on each animal."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report how many animals have drifted.")
+
+    def handle(self, *args, dry_run, **options):
+        count = reconcile_counters(dry_run=dry_run)
+        if dry_run:
+            self.stdout.write(f"{count} animal(s) have request counters out of step.")
+            return
+        if count:
+            invalidate_catalog()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled request counters on {count} animal(s)."))
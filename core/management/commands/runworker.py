@@ -0,0 +1,84 @@
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+# Children are spawned, not forked, so they never share the parent's DB connection.
+# This module is re-imported in each child before Django is set up, hence the
+# deferred imports of core.jobs below.
+
+
+def _init_process():
+    import django
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    django.setup()
+
+
+def _run_job(job_id: int) -> str:
+    from core import jobs
+
+    return jobs.execute(job_id)
+
+
+class Command(BaseCommand):
+    help = "Process queued background jobs with a pool of worker processes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--processes", type=int, default=os.cpu_count() or 2)
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--stale-after", type=int, default=600, help="Requeue running jobs older than N seconds.")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is drained.")
+        parser.add_argument(
+            "--clear-sessions-every", type=int, default=3600, help="Delete expired sessions every N seconds (0: never)."
+        )
+
+    def handle(self, *args, processes, poll_interval, stale_after, once, clear_sessions_every, **options):
+        from core import jobs
+        from core.sessions import clear_expired
+
+        stopping = False
+
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        self.stdout.write(f"Worker started with {processes} process(es).")
+        context = multiprocessing.get_context("spawn")
+        in_flight = set()
+        next_stale_check = 0.0
+        next_session_sweep = 0.0 if clear_sessions_every else float("inf")
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context, initializer=_init_process) as pool:
+            while not stopping:
+                if time.monotonic() >= next_stale_check:
+                    requeued = jobs.requeue_stale(timedelta(seconds=stale_after))
+                    if requeued:
+                        self.stderr.write(f"Requeued {requeued} stale job(s).")
+                    next_stale_check = time.monotonic() + 60
+                if time.monotonic() >= next_session_sweep:
+                    cleared = clear_expired()
+                    if cleared:
+                        self.stdout.write(f"Deleted {cleared} expired session(s).")
+                    next_session_sweep = time.monotonic() + clear_sessions_every
+                for job_id in jobs.claim(processes - len(in_flight)):
+                    in_flight.add(pool.submit(_run_job, job_id))
+                if not in_flight:
+                    if once:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+                done, in_flight = wait(in_flight, timeout=poll_interval, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is not None:
+                        self.stderr.write(f"Worker process error: {future.exception()!r}")
+            if in_flight:
+                self.stdout.write(f"Waiting for {len(in_flight)} running job(s) to finish...")
+                wait(in_flight)
+        self.stdout.write("Worker stopped.")
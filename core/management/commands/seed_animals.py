@@ -0,0 +1,146 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from core import facets, similarity
+from core.adoptions import reconcile_counters
+from core.caching import invalidate_catalog
+from core.models import AdoptionRequest, Animal, AnimalStatus, RequestStatus
+
+SEED_PREFIX = "seed-"
+
+# Rough shape of a shelter's intake: mostly dogs and cats, a long tail of small pets.
+TYPE_WEIGHTS = {
+    "Dog": 38,
+    "Cat": 34,
+    "Rabbit": 8,
+    "Bird": 6,
+    "Guinea Pig": 4,
+    "Hamster": 4,
+    "Ferret": 2,
+    "Turtle": 2,
+    "Fish": 2,
+}
+STATUS_WEIGHTS = {AnimalStatus.AVAILABLE: 55, AnimalStatus.PENDING: 20, AnimalStatus.ADOPTED: 25}
+NAMES = (
+    "Bella Luna Max Charlie Milo Coco Rocky Daisy Simba Nala Oliver Leo Lucy Bailey Cooper Zoe Ginger Oscar "
+    "Pepper Shadow Smokey Mango Biscuit Hazel Willow Juniper Pumpkin Clover Maple Ziggy Noodle Pickles"
+).split()
+ADJECTIVES = "gentle playful shy curious calm energetic affectionate loyal clever cuddly".split()
+MESSAGES = (
+    "",
+    "We have a fenced garden and lots of time for walks.",
+    "I work from home and would love a companion.",
+    "Our kids have been asking for a pet for years.",
+    "I have adopted before and know the routine.",
+)
+
+
+def _weighted(rng: random.Random, weights: dict):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _request_statuses(rng: random.Random, animal_status: str) -> list[str]:
+    """Request statuses consistent with how ``apply_actions`` leaves an animal."""
+    if animal_status == AnimalStatus.ADOPTED:
+        return [RequestStatus.APPROVED] + [RequestStatus.REJECTED] * rng.randint(0, 3)
+    if animal_status == AnimalStatus.PENDING:
+        return [RequestStatus.PENDING] * min(1 + int(rng.expovariate(0.7)), 6) + [RequestStatus.REJECTED] * rng.randint(
+            0, 1
+        )
+    return [] if rng.random() < 0.7 else [RequestStatus.REJECTED] * rng.randint(1, 2)
+
+
+class Command(BaseCommand):
+    help = "Bulk-create users, animals and adoption requests for load testing."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=500, help="Adopter accounts to create.")
+        parser.add_argument("--staff", type=int, default=3, help="Staff accounts; they own the animals.")
+        parser.add_argument("--animals", type=int, default=5000)
+        parser.add_argument("--days", type=int, default=365, help="Spread creation times over this many days.")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=None, help="Random seed, for repeatable datasets.")
+        parser.add_argument("--password", default="seed-password")
+        parser.add_argument("--clear", action="store_true", help="Delete previously seeded data first.")
+
+    def handle(self, *args, users, staff, animals, days, batch_size, seed, password, clear, **options):
+        if users < 1 or staff < 1:
+            raise CommandError("--users and --staff must be at least 1.")
+        seeded = User.objects.filter(username__startswith=SEED_PREFIX)
+        if clear:
+            deleted, _ = seeded.delete()
+            self.stdout.write(f"Deleted {deleted} previously seeded row(s).")
+        elif seeded.exists():
+            raise CommandError("Seeded data already exists; pass --clear to replace it.")
+
+        rng = random.Random(seed)
+        now = timezone.now()
+        password_hash = make_password(password)
+
+        with transaction.atomic():
+            staff_users = User.objects.bulk_create(
+                [
+                    User(username=f"{SEED_PREFIX}staff-{n:03d}", password=password_hash, is_staff=True)
+                    for n in range(1, staff + 1)
+                ]
+            )
+            adopters = User.objects.bulk_create(
+                [
+                    User(username=f"{SEED_PREFIX}user-{n:05d}", email=f"user{n}@example.com", password=password_hash)
+                    for n in range(1, users + 1)
+                ],
+                batch_size=batch_size,
+            )
+
+            animal_rows = []
+            for n in range(animals):
+                animal_type = _weighted(rng, TYPE_WEIGHTS)
+                animal_rows.append(
+                    Animal(
+                        name=f"{rng.choice(NAMES)} {n + 1}",
+                        type=animal_type,
+                        age=min(int(rng.expovariate(1 / 3)), 18),
+                        description=f"A {rng.choice(ADJECTIVES)} {animal_type.lower()} looking for a home.",
+                        status=_weighted(rng, STATUS_WEIGHTS),
+                        created_by=rng.choice(staff_users),
+                    )
+                )
+            created = Animal.objects.bulk_create(animal_rows, batch_size=batch_size)
+            # auto_now_add ignores preset values on insert, so backdate in a second pass.
+            for animal in created:
+                animal.created_at = animal.updated_at = now - timedelta(seconds=rng.uniform(0, days * 86400))
+            Animal.objects.bulk_update(created, ["created_at", "updated_at"], batch_size=batch_size)
+
+            request_rows = []
+            for animal in created:
+                statuses = _request_statuses(rng, animal.status)
+                for user, status in zip(rng.sample(adopters, min(len(statuses), len(adopters))), statuses):
+                    request_rows.append(
+                        AdoptionRequest(user=user, animal=animal, status=status, message=rng.choice(MESSAGES))
+                    )
+            requests = AdoptionRequest.objects.bulk_create(request_rows, batch_size=batch_size)
+            for adoption_request in requests:
+                age = (now - adoption_request.animal.created_at).total_seconds()
+                adoption_request.created_at = adoption_request.updated_at = now - timedelta(
+                    seconds=rng.uniform(0, age)
+                )
+            AdoptionRequest.objects.bulk_update(requests, ["created_at", "updated_at"], batch_size=batch_size)
+
+            # bulk_create bypasses the signals that keep facets, request counters and cached pages current.
+            facets.rebuild()
+            reconcile_counters()
+        invalidate_catalog()
+        similarity.rebuild(batch_size=batch_size)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {len(staff_users)} staff, {len(adopters)} adopter(s), "
+                f"{len(created)} animal(s) and {len(requests)} adoption request(s)."
+            )
+        )
@@ -0,0 +1,131 @@
+"""Serve ``MEDIA_ROOT`` with long-lived caching and byte ranges.
+
+Content-hashed names (see core.storage) are served ``immutable`` for a year;
+anything else left over from before hashing gets a short ``max-age`` and is
+revalidated by ETag. Single ``Range`` requests are answered with ``206`` so
+browsers and CDNs can resume or seek; multi-range requests get the whole file.
+Under ASGI the file is read chunk by chunk in a worker thread, since Django
+would otherwise read a sync iterator into memory before sending any of it.
+"""
+
+import mimetypes
+import re
+from pathlib import Path
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpRequest, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils._os import safe_join
+from django.utils.http import http_date, parse_etags
+from django.views.decorators.http import require_safe
+
+from .storage import is_hashed
+
+MUTABLE_CACHE_CONTROL = "public, max-age=3600"
+CHUNK_SIZE = 64 * 1024
+RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def _byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """(first, last) byte offsets for a single ``Range`` header, or ``None`` to send everything.
+
+    Raises ``ValueError`` when the range cannot be satisfied.
+    """
+    match = RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if not first:
+        # bytes=-N: the last N bytes.
+        length = int(last)
+        if not length:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    first = int(first)
+    last = min(int(last), size - 1) if last else size - 1
+    if first >= size or first > last:
+        raise ValueError(header)
+    return first, last
+
+
+def _read(path: Path, first: int, length: int):
+    with path.open("rb") as handle:
+        handle.seek(first)
+        while length > 0:
+            chunk = handle.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+
+
+async def _aread(path: Path, first: int, length: int):
+    """:func:`_read` for ASGI, one chunk at a time off the event loop."""
+    chunks = _read(path, first, length)
+    next_chunk = sync_to_async(next, thread_sensitive=False)
+    try:
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+    finally:
+        chunks.close()
+
+
+@require_safe
+def serve(request: HttpRequest, path: str) -> HttpResponse:
+    try:
+        full_path = Path(safe_join(settings.MEDIA_ROOT, path))
+    except SuspiciousFileOperation:
+        raise Http404("Not found.")
+    try:
+        stat = full_path.stat()
+    except (FileNotFoundError, NotADirectoryError):
+        raise Http404("Not found.")
+    if not full_path.is_file():
+        raise Http404("Not found.")
+
+    hashed = is_hashed(path)
+    etag = f'"{full_path.stem}"' if hashed else f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+        "Cache-Control": settings.MEDIA_CACHE_CONTROL if hashed else MUTABLE_CACHE_CONTROL,
+        "Accept-Ranges": "bytes",
+    }
+    if etag in parse_etags(request.headers.get("If-None-Match", "")):
+        response = HttpResponseNotModified()
+        for name, value in headers.items():
+            response[name] = value
+        return response
+
+    content_type, encoding = mimetypes.guess_type(full_path.name)
+    size = stat.st_size
+    first, last = 0, size - 1
+    status = 200
+    range_header = request.headers.get("Range")
+    # If-Range: only honour the range if the client's copy is still this file.
+    if range_header and request.headers.get("If-Range", etag) == etag:
+        try:
+            byte_range = _byte_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+        if byte_range:
+            (first, last), status = byte_range, 206
+            headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+
+    length = last - first + 1 if size else 0
+    content_type = content_type or "application/octet-stream"
+    if request.method == "HEAD":
+        response = HttpResponse(status=status, content_type=content_type)
+    else:
+        read = _aread if isinstance(request, ASGIRequest) else _read
+        response = StreamingHttpResponse(read(full_path, first, length), status=status, content_type=content_type)
+    for name, value in headers.items():
+        response[name] = value
+    response["Content-Length"] = str(length)
+    if encoding:
+        response["Content-Encoding"] = encoding
+    return response
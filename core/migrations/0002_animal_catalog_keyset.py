@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:54
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='animal',
+            name='status_rank',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(status='Available', then=models.Value(0)), models.When(status='Pending', then=models.Value(1)), default=models.Value(2)), output_field=models.PositiveSmallIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(models.F('status_rank'), models.OrderBy(models.F('created_at'), descending=True), models.OrderBy(models.F('id'), descending=True), name='animal_catalog_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(django.db.models.functions.text.Lower('type'), models.F('status_rank'), models.OrderBy(models.F('created_at'), descending=True), models.OrderBy(models.F('id'), descending=True), name='animal_type_catalog_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_animal_catalog_keyset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='animal',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:59
+
+from django.db import migrations, models
+
+STATUS_COLUMNS = {"Available": "available_count", "Pending": "pending_count", "Adopted": "adopted_count"}
+
+
+def build_facets(apps, schema_editor):
+    Animal = apps.get_model("core", "Animal")
+    AnimalTypeFacet = apps.get_model("core", "AnimalTypeFacet")
+    facets = {}
+    for raw_type in Animal.objects.order_by().values_list("type", flat=True).distinct():
+        cleaned = " ".join(raw_type.split())
+        if cleaned != raw_type:
+            Animal.objects.filter(type=raw_type).update(type=cleaned)
+    rows = Animal.objects.order_by().values_list("type", "status").annotate(n=models.Count("pk"))
+    for type_value, status, count in rows:
+        key = type_value.lower()
+        facet = facets.setdefault(key, AnimalTypeFacet(key=key, label=type_value))
+        facet.label = min(facet.label, type_value)
+        setattr(facet, STATUS_COLUMNS[status], getattr(facet, STATUS_COLUMNS[status]) + count)
+    AnimalTypeFacet.objects.bulk_create(facets.values())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_job_queue'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AnimalTypeFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=50, unique=True)),
+                ('label', models.CharField(max_length=50)),
+                ('available_count', models.PositiveIntegerField(default=0)),
+                ('pending_count', models.PositiveIntegerField(default=0)),
+                ('adopted_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['key'],
+            },
+        ),
+        migrations.RunPython(build_facets, migrations.RunPython.noop),
+    ]
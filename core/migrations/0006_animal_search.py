@@ -0,0 +1,67 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:01
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Postgres only: the column is a plain text column elsewhere and search falls back to icontains.
+SEARCH_SQL = """
+CREATE OR REPLACE FUNCTION core_animal_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.name, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.type, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_animal_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, type, description, search_vector ON core_animal
+    FOR EACH ROW EXECUTE FUNCTION core_animal_search_vector_update();
+
+UPDATE core_animal SET search_vector = NULL;
+
+CREATE INDEX animal_search_vector_idx ON core_animal USING gin (search_vector);
+
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm') THEN
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+        CREATE INDEX animal_name_trgm_idx ON core_animal USING gin (name gin_trgm_ops);
+    END IF;
+END
+$$;
+"""
+
+REVERSE_SQL = """
+DROP INDEX IF EXISTS animal_name_trgm_idx;
+DROP INDEX IF EXISTS animal_search_vector_idx;
+DROP TRIGGER IF EXISTS core_animal_search_vector_trigger ON core_animal;
+DROP FUNCTION IF EXISTS core_animal_search_vector_update();
+"""
+
+
+def install_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(SEARCH_SQL)
+
+
+def remove_search(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(REVERSE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_animal_type_facet'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='animal',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(install_search, remove_search),
+    ]
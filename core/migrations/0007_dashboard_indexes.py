@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_animal_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='adoptionrequest',
+            index=models.Index(models.OrderBy(models.F('created_at'), descending=True), models.OrderBy(models.F('id'), descending=True), name='request_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='adoptionrequest',
+            index=models.Index(models.F('status'), models.OrderBy(models.F('created_at'), descending=True), models.OrderBy(models.F('id'), descending=True), name='request_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='adoptionrequest',
+            index=models.Index(models.F('animal'), models.F('status'), models.OrderBy(models.F('created_at'), descending=True), models.OrderBy(models.F('id'), descending=True), name='request_animal_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='adoptionrequest',
+            index=models.Index(models.F('user'), models.OrderBy(models.F('created_at'), descending=True), models.OrderBy(models.F('id'), descending=True), name='request_user_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='animal',
+            index=models.Index(models.OrderBy(models.F('created_at'), descending=True), models.OrderBy(models.F('id'), descending=True), name='animal_created_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_dashboard_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='adoptionrequest',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='animal',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
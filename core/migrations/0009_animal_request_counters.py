@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:17
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+COUNTER_FIELDS = {"Pending": "pending_requests", "Approved": "approved_requests", "Rejected": "rejected_requests"}
+
+
+def count_requests(apps, schema_editor):
+    Animal = apps.get_model("core", "Animal")
+    AdoptionRequest = apps.get_model("core", "AdoptionRequest")
+    Animal.objects.update(
+        **{
+            field: Coalesce(
+                models.Subquery(
+                    AdoptionRequest.objects.filter(animal=models.OuterRef("pk"), status=status)
+                    .order_by()
+                    .values("animal")
+                    .annotate(n=models.Count("pk"))
+                    .values("n")
+                ),
+                0,
+            )
+            for status, field in COUNTER_FIELDS.items()
+        }
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='animal',
+            name='approved_requests',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='animal',
+            name='pending_requests',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='animal',
+            name='rejected_requests',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_requests, migrations.RunPython.noop),
+    ]
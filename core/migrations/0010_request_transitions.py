@@ -0,0 +1,51 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:28
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+# Postgres only: the log is appended in time order, so a BRIN index on "at" stays tiny
+# and cheap to maintain while still serving time-range scans over millions of rows.
+BRIN_SQL = "CREATE INDEX transition_at_brin ON core_requesttransition USING brin (at)"
+REVERSE_SQL = "DROP INDEX IF EXISTS transition_at_brin"
+
+
+def add_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(BRIN_SQL)
+
+
+def drop_brin_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(REVERSE_SQL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_animal_request_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action', models.CharField(max_length=10)),
+                ('from_status', models.CharField(blank=True, max_length=10)),
+                ('to_status', models.CharField(max_length=10)),
+                ('at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('animal', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.animal')),
+                ('cause', models.ForeignKey(blank=True, db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='core.adoptionrequest')),
+                ('request', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='transitions', to='core.adoptionrequest')),
+            ],
+            options={
+                'ordering': ['-at', '-id'],
+                'indexes': [models.Index(models.F('animal'), models.OrderBy(models.F('at'), descending=True), models.OrderBy(models.F('id'), descending=True), name='transition_animal_at_idx'), models.Index(models.F('request'), models.OrderBy(models.F('at'), descending=True), models.OrderBy(models.F('id'), descending=True), name='transition_request_at_idx')],
+            },
+        ),
+        migrations.RunPython(add_brin_index, drop_brin_index),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:41
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_request_transitions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarAnimal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('score', models.FloatField()),
+                ('animal', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.animal')),
+                ('similar', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.animal')),
+            ],
+            options={
+                'ordering': ['animal', 'rank'],
+                'constraints': [models.UniqueConstraint(fields=('animal', 'rank'), name='similar_animal_rank_uniq')],
+            },
+        ),
+    ]
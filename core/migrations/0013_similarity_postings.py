@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_adoption_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SimilarityTerm',
+            fields=[
+                ('term', models.TextField(primary_key=True, serialize=False)),
+                ('document_frequency', models.PositiveIntegerField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SimilarityPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.TextField()),
+                ('weight', models.FloatField()),
+                ('animal', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.animal')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('term', 'animal'), name='similarity_posting_term_uniq')],
+            },
+        ),
+    ]
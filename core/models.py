@@ -1,5 +1,9 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Lower
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 class AnimalStatus(models.TextChoices):
     AVAILABLE = "Available"
@@ -12,16 +16,118 @@ class Animal(models.Model):
     age = models.PositiveIntegerField()
     description = models.TextField(blank=True)
     image = models.ImageField(upload_to="animals/", blank=True, null=True)
+    # Manifest of generated thumbnails/responsive sizes, see core.images.build_variants.
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     status = models.CharField(max_length=10, choices=AnimalStatus.choices, default=AnimalStatus.AVAILABLE)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Request counts by status, kept in step with AdoptionRequest by core.adoptions (see reconcile_counters).
+    pending_requests = models.PositiveIntegerField(default=0, editable=False)
+    approved_requests = models.PositiveIntegerField(default=0, editable=False)
+    rejected_requests = models.PositiveIntegerField(default=0, editable=False)
+    # Maintained by a database trigger on Postgres (migration 0006); GIN-indexed there.
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+    # Stored so the catalog sort (available, pending, adopted, newest first) can be served by an index.
+    status_rank = models.GeneratedField(
+        expression=Case(
+            When(status=AnimalStatus.AVAILABLE, then=Value(0)),
+            When(status=AnimalStatus.PENDING, then=Value(1)),
+            default=Value(2),
+        ),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
+
+    CATALOG_ORDERING = ("status_rank", "-created_at", "-id")
+    STATUS_RANKS = {AnimalStatus.AVAILABLE: 0, AnimalStatus.PENDING: 1, AnimalStatus.ADOPTED: 2}
+    REQUEST_COUNTERS = ("pending_requests", "approved_requests", "rejected_requests")
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(F("status_rank"), F("created_at").desc(), F("id").desc(), name="animal_catalog_idx"),
+            models.Index(
+                Lower("type"), F("status_rank"), F("created_at").desc(), F("id").desc(), name="animal_type_catalog_idx"
+            ),
+            models.Index(F("created_at").desc(), F("id").desc(), name="animal_created_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.name} ({self.status})"
 
+    def save(self, *args, **kwargs):
+        # type is free text; collapse stray whitespace so lower(type) lines up with AnimalTypeFacet.key.
+        self.type = " ".join((self.type or "").split())
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "updated_at" not in update_fields:
+            # API ETags are derived from updated_at, so partial saves must bump it too.
+            kwargs["update_fields"] = [*update_fields, "updated_at"]
+        elif update_fields is None and not self._state.adding and not kwargs.get("force_insert"):
+            # The request counters only move through F() updates; a full save must not write back a stale copy.
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and not field.generated and field.name not in self.REQUEST_COUNTERS
+            ]
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored type/status so facet counts can be moved on save without re-reading the row.
+        instance._stored_facet = (instance.__dict__.get("type"), instance.__dict__.get("status"))
+        return instance
+
+class AnimalTypeFacet(models.Model):
+    """Per-type animal counts for the catalog filter, kept current by core.facets."""
+
+    key = models.CharField(max_length=50, unique=True)
+    label = models.CharField(max_length=50)
+    available_count = models.PositiveIntegerField(default=0)
+    pending_count = models.PositiveIntegerField(default=0)
+    adopted_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["key"]
+
+    def __str__(self) -> str:
+        return f"{self.label} ({self.total})"
+
+    @property
+    def total(self) -> int:
+        return self.available_count + self.pending_count + self.adopted_count
+
+class SimilarAnimal(models.Model):
+    """One of an animal's nearest neighbours (type, age band, description), maintained by core.similarity."""
+
+    # The unique (animal, rank) index below serves lookups; similar keeps its own for cascading deletes.
+    animal = models.ForeignKey(Animal, on_delete=models.CASCADE, db_index=False, related_name="+")
+    similar = models.ForeignKey(Animal, on_delete=models.CASCADE, related_name="+")
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ["animal", "rank"]
+        constraints = [models.UniqueConstraint(fields=["animal", "rank"], name="similar_animal_rank_uniq")]
+
+class SimilarityTerm(models.Model):
+    """How many animals had a core.similarity term at the last rebuild; the term "*" counts every animal."""
+
+    term = models.TextField(primary_key=True)
+    document_frequency = models.PositiveIntegerField()
+
+class SimilarityPosting(models.Model):
+    """One weight of an animal's unit TF-IDF vector (core.similarity), looked up by term."""
+
+    # The unique (term, animal) index below serves lookups by term; animal keeps its own for cascading deletes.
+    term = models.TextField()
+    animal = models.ForeignKey(Animal, on_delete=models.CASCADE, related_name="+")
+    weight = models.FloatField()
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["term", "animal"], name="similarity_posting_term_uniq")]
+
 class RequestStatus(models.TextChoices):
     PENDING = "Pending"
     APPROVED = "Approved"
@@ -33,10 +139,157 @@ class AdoptionRequest(models.Model):
     message = models.TextField(blank=True)
     status = models.CharField(max_length=10, choices=RequestStatus.choices, default=RequestStatus.PENDING)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         unique_together = ("user", "animal")  
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(F("created_at").desc(), F("id").desc(), name="request_created_idx"),
+            models.Index(F("status"), F("created_at").desc(), F("id").desc(), name="request_status_created_idx"),
+            models.Index(F("animal"), F("status"), F("created_at").desc(), F("id").desc(), name="request_animal_status_idx"),
+            models.Index(F("user"), F("created_at").desc(), F("id").desc(), name="request_user_created_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"{self.user.username} -> {self.animal.name} ({self.status})"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored animal/status so Animal request counters can be moved on save.
+        # With either field deferred there is nothing to remember; pre_save reads the row instead.
+        stored = (instance.__dict__.get("animal_id"), instance.__dict__.get("status"))
+        instance._stored_counter = None if None in stored else stored
+        return instance
+
+class RequestTransition(models.Model):
+    """One status change of an adoption request, written by core.adoptions.
+
+    Append-only: rows are never updated or deleted, and the foreign keys carry
+    no database constraint so history outlives the rows it describes.
+    """
+
+    SUBMIT, EDIT = "submit", "edit"
+
+    # Only the composite (column, at) indexes below are kept; single-column FK indexes would just slow inserts.
+    request = models.ForeignKey(
+        AdoptionRequest,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        related_name="transitions",
+    )
+    animal = models.ForeignKey(
+        Animal, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name="+"
+    )
+    # The request whose approve/reject/reset caused this change, when it was not this one.
+    cause = models.ForeignKey(
+        AdoptionRequest,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    actor = models.ForeignKey(
+        User, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, null=True, blank=True, related_name="+"
+    )
+    action = models.CharField(max_length=10)
+    from_status = models.CharField(max_length=10, blank=True)
+    to_status = models.CharField(max_length=10)
+    at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-at", "-id"]
+        # Postgres also gets a BRIN index on "at" (migration 0010) for time-range scans of the whole log.
+        indexes = [
+            models.Index(F("animal"), F("at").desc(), F("id").desc(), name="transition_animal_at_idx"),
+            models.Index(F("request"), F("at").desc(), F("id").desc(), name="transition_request_at_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"#{self.request_id} {self.from_status or '-'} -> {self.to_status} ({self.action})"
+
+class ArchivedAnimal(models.Model):
+    """An adopted animal moved out of Animal by core.archive, under its original id."""
+
+    id = models.BigIntegerField(primary_key=True)
+    name = models.CharField(max_length=100)
+    type = models.CharField(max_length=50)
+    age = models.PositiveIntegerField()
+    description = models.TextField(blank=True)
+    image = models.ImageField(upload_to="animals/", blank=True, null=True)
+    image_variants = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=AnimalStatus.choices, default=AnimalStatus.ADOPTED)
+    # Unlike Animal, the record outlives the staff account that created it.
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    approved_requests = models.PositiveIntegerField(default=0)
+    rejected_requests = models.PositiveIntegerField(default=0)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-updated_at", "-id"]
+        indexes = [models.Index(F("updated_at").desc(), F("id").desc(), name="archived_animal_updated_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.status})"
+
+class ArchivedAdoptionRequest(models.Model):
+    """A request of an archived animal, moved out of AdoptionRequest by core.archive under its original id."""
+
+    id = models.BigIntegerField(primary_key=True)
+    # The composite index below leads with user.
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False, related_name="+")
+    # Points into ArchivedAnimal, without a constraint.
+    animal_id = models.BigIntegerField()
+    animal_name = models.CharField(max_length=100)
+    message = models.TextField(blank=True)
+    status = models.CharField(max_length=10, choices=RequestStatus.choices)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ["-created_at", "-id"]
+        indexes = [
+            models.Index(F("user"), F("created_at").desc(), F("id").desc(), name="archived_request_user_idx"),
+            models.Index(F("animal_id"), F("created_at").desc(), F("id").desc(), name="archived_request_animal_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.user_id} -> {self.animal_name} ({self.status})"
+
+class JobStatus(models.TextChoices):
+    QUEUED = "Queued"
+    RUNNING = "Running"
+    DONE = "Done"
+    FAILED = "Failed"
+
+class Job(models.Model):
+    """A unit of deferred work, claimed by ``manage.py runworker`` (see core.jobs)."""
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=JobStatus.choices, default=JobStatus.QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["run_at"], condition=Q(status=JobStatus.QUEUED), name="job_ready_idx"),
+            models.Index(fields=["locked_at"], condition=Q(status=JobStatus.RUNNING), name="job_running_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.task} #{self.pk} ({self.status})"
@@ -0,0 +1,136 @@
+import base64
+import binascii
+import datetime
+import json
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+@dataclass
+class KeysetPage:
+    items: list
+    next_cursor: str = ""
+    previous_cursor: str = ""
+    per_page: int = 0
+    is_first: bool = True
+
+    @property
+    def has_next(self) -> bool:
+        return bool(self.next_cursor)
+
+    @property
+    def has_previous(self) -> bool:
+        return bool(self.previous_cursor)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+
+@dataclass
+class KeysetPaginator:
+    """Cursor pagination over a fixed, unique ordering.
+
+    Each page is a single index range scan: the cursor stores the sort key of the
+    boundary row and the next page filters past it, so the cost does not depend on
+    how deep the reader has scrolled.
+    """
+
+    queryset: QuerySet
+    ordering: Sequence[str]
+    per_page: int = 24
+    _fields: list = field(init=False, repr=False)
+
+    def __post_init__(self):
+        opts = self.queryset.model._meta
+        self._fields = []
+        for name in self.ordering:
+            descending = name.startswith("-")
+            attname = name.lstrip("-")
+            model_field = opts.pk if attname == "pk" else opts.get_field(attname)
+            self._fields.append((attname, descending, getattr(model_field, "output_field", None) or model_field))
+
+    def page(self, after: str | None = None, before: str | None = None) -> KeysetPage:
+        if before:
+            return self._page_before(self.decode(before))
+        values = self.decode(after) if after else None
+        qs = self.queryset.order_by(*self.ordering)
+        if values is not None:
+            qs = qs.filter(self._seek(values, forward=True))
+        rows = list(qs[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        return KeysetPage(
+            items=rows,
+            next_cursor=self.encode(rows[-1]) if has_more else "",
+            previous_cursor=self.encode(rows[0]) if values is not None and rows else "",
+            per_page=self.per_page,
+            is_first=values is None,
+        )
+
+    def _page_before(self, values: list) -> KeysetPage:
+        reverse_ordering = [name[1:] if name.startswith("-") else f"-{name}" for name in self.ordering]
+        qs = self.queryset.order_by(*reverse_ordering).filter(self._seek(values, forward=False))
+        rows = list(qs[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page][::-1]
+        return KeysetPage(
+            items=rows,
+            next_cursor=self.encode(rows[-1]) if rows else "",
+            previous_cursor=self.encode(rows[0]) if has_more else "",
+            per_page=self.per_page,
+            is_first=not has_more,
+        )
+
+    def _seek(self, values: list, forward: bool) -> Q:
+        # (a, b, c) past the cursor == a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z),
+        # with the comparison flipped for descending columns.
+        condition = Q()
+        equal = Q()
+        for (attname, descending, _), value in zip(self._fields, values):
+            lookup = "lt" if descending == forward else "gt"
+            condition |= equal & Q(**{f"{attname}__{lookup}": value})
+            equal &= Q(**{attname: value})
+        return condition
+
+    def encode(self, obj) -> str:
+        values = [getattr(obj, attname) for attname, _, _ in self._fields]
+        raw = json.dumps(values, default=_encode_value, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def is_valid(self, cursor: str) -> bool:
+        try:
+            self.decode(cursor)
+        except InvalidCursor:
+            return False
+        return True
+
+    def decode(self, cursor: str) -> list:
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(raw)
+        except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+            raise InvalidCursor(cursor) from exc
+        if not isinstance(values, list) or len(values) != len(self._fields):
+            raise InvalidCursor(cursor)
+        # A value of the wrong JSON type (a number where a timestamp belongs) raises TypeError, not ValidationError.
+        try:
+            return [model_field.to_python(value) for (_, _, model_field), value in zip(self._fields, values)]
+        except (ValidationError, TypeError, ValueError) as exc:
+            raise InvalidCursor(cursor) from exc
+
+
+def _encode_value(value):
+    # Full precision on purpose: DjangoJSONEncoder drops microseconds, which would skip rows.
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
@@ -0,0 +1,137 @@
+"""Token-bucket rate limits for the endpoints bots like to hammer.
+
+Each scope (``signup``, ``login``, ``request_create``, ...) has a rate in
+``RATE_LIMITS`` such as ``"10/5m"``: a bucket of 10 tokens that refills
+evenly over five minutes. A request takes one token from a bucket per key
+(client IP, signed-in user, attempted username); if any bucket is empty the
+request is refused with ``429`` and a ``Retry-After`` header.
+
+Buckets live in the ``RATE_LIMIT_CACHE`` cache, so they are shared between
+workers when that cache is Redis or file based. ``RATE_LIMITER`` names the
+class that keeps them, for deployments that want an atomic Redis script
+instead; the cache-backed default can let a few extra requests through
+when the same key is hit concurrently.
+"""
+
+import hashlib
+import math
+import re
+import time
+from dataclasses import dataclass
+from functools import lru_cache, wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.shortcuts import render
+from django.utils.module_loading import import_string
+
+RATE = re.compile(r"^(\d+)/(\d*)([smhd])$")
+UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+@dataclass(frozen=True)
+class Rate:
+    capacity: int
+    period: float
+
+    @classmethod
+    def parse(cls, value: str) -> "Rate":
+        match = RATE.match(value.replace(" ", ""))
+        if not match:
+            raise ValueError(f"Invalid rate {value!r}; expected e.g. '5/m' or '10/15m'.")
+        capacity, count, unit = match.groups()
+        return cls(int(capacity), int(count or 1) * UNITS[unit])
+
+
+class CacheTokenBucket:
+    """Token buckets stored as (tokens, last update) pairs in a Django cache."""
+
+    def __init__(self, alias: str = "default"):
+        self.cache = caches[alias]
+
+    def consume(self, key: str, rate: Rate) -> float:
+        """Take one token; return 0 if there was one, else the seconds until there will be."""
+        now = time.time()
+        tokens, updated = self.cache.get(key) or (rate.capacity, now)
+        tokens = min(rate.capacity, tokens + (now - updated) * rate.capacity / rate.period)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) * rate.period / rate.capacity
+        self.cache.set(key, (tokens, now), timeout=math.ceil(rate.period))
+        return wait
+
+
+@lru_cache(maxsize=None)
+def _limiter(backend: str, alias: str):
+    return import_string(backend)(alias)
+
+
+def limiter():
+    return _limiter(
+        getattr(settings, "RATE_LIMITER", "core.ratelimit.CacheTokenBucket"),
+        getattr(settings, "RATE_LIMIT_CACHE", "default"),
+    )
+
+
+def client_ip(request) -> str:
+    """The client address, taken from ``X-Forwarded-For`` behind ``RATE_LIMIT_PROXY_COUNT`` trusted proxies."""
+    proxies = getattr(settings, "RATE_LIMIT_PROXY_COUNT", 0)
+    forwarded = [part.strip() for part in request.META.get("HTTP_X_FORWARDED_FOR", "").split(",") if part.strip()]
+    if proxies and len(forwarded) >= proxies:
+        return forwarded[-proxies]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _identities(request, keys) -> list[tuple[str, str]]:
+    identities = []
+    for key in keys:
+        if key == "ip":
+            value = client_ip(request)
+        elif key == "user":
+            value = str(request.user.pk) if request.user.is_authenticated else ""
+        elif key == "username":
+            value = request.POST.get("username", "").strip().lower()
+        else:
+            raise ValueError(f"Unknown rate limit key {key!r}.")
+        if value:
+            identities.append((key, value))
+    return identities
+
+
+def check(request, scope: str, keys=("ip",)) -> float:
+    """Charge this request to ``scope``'s buckets; return seconds to wait (0 when allowed)."""
+    rate = getattr(settings, "RATE_LIMITS", {}).get(scope)
+    if not rate:
+        return 0.0
+    rate = Rate.parse(rate)
+    wait = 0.0
+    for key, value in _identities(request, keys):
+        digest = hashlib.sha256(value.encode()).hexdigest()[:32]
+        wait = max(wait, limiter().consume(f"ratelimit:{scope}:{key}:{digest}", rate))
+    return wait
+
+
+def too_many_requests(request, wait: float):
+    retry_after = max(math.ceil(wait), 1)
+    response = render(request, "429.html", {"retry_after": retry_after}, status=429)
+    response["Retry-After"] = str(retry_after)
+    return response
+
+
+def rate_limit(scope: str, keys=("ip",), methods=("POST",)):
+    """Refuse ``methods`` requests to the decorated view once ``scope``'s buckets run dry."""
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method in methods:
+                wait = check(request, scope, keys)
+                if wait:
+                    return too_many_requests(request, wait)
+            return view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
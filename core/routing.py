@@ -0,0 +1,157 @@
+"""Send safe, read-only requests to the ``replica`` database when one is configured.
+
+``ReplicaRoutingMiddleware`` opts a request into the replica when it uses a
+safe method, its view is not marked ``@primary_only`` and the client has not
+written anything in the last ``DATABASE_REPLICA_MAX_LAG`` seconds (a cookie
+pins them to the primary after each write, so they read their own writes).
+``PrimaryReplicaRouter`` then sends reads for that request to the replica
+while it is reachable and its replay lag is under the same bound; otherwise
+everything falls back to ``default``. Writes, and reads inside a transaction,
+always use ``default``.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+REPLICA = "replica"
+PIN_COOKIE = "primary_pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+# Sessions and users are read on every request and must reflect a login or logout immediately.
+PRIMARY_APPS = {"sessions", "auth"}
+
+_read_replica: ContextVar[bool] = ContextVar("read_replica", default=False)
+
+
+def replica_configured() -> bool:
+    return REPLICA in settings.DATABASES
+
+
+def max_lag() -> float:
+    return getattr(settings, "DATABASE_REPLICA_MAX_LAG", 5.0)
+
+
+def primary_only(view):
+    """Never serve the decorated view from the replica, e.g. views that write or must see fresh data."""
+    view.primary_only = True
+    return view
+
+
+@contextmanager
+def primary():
+    """Read from ``default`` inside the block, e.g. while filling a shared cache."""
+    token = _read_replica.set(False)
+    try:
+        yield
+    finally:
+        _read_replica.reset(token)
+
+
+class ReplicaHealth:
+    """Per-process view of whether the replica is usable, re-checked every few seconds."""
+
+    LAG_SQL = {
+        # 0 when the replica has replayed everything it received (idle primary),
+        # NULL -> 0 when the database is not a streaming replica at all.
+        "postgresql": (
+            "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+            "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+        ),
+    }
+
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._checked_at = float("-inf")
+        self._healthy = True
+        self.lag: float | None = None
+
+    def lag_seconds(self) -> float:
+        connection = connections[REPLICA]
+        sql = self.LAG_SQL.get(connection.vendor)
+        if sql is None:
+            # Other backends (SQLite files standing in locally) only get a liveness check.
+            sql = "SELECT 0"
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+            return float(cursor.fetchone()[0] or 0)
+
+    def healthy(self) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at < self.interval:
+            return self._healthy
+        with self._lock:
+            if now - self._checked_at < self.interval:
+                return self._healthy
+            try:
+                self.lag = self.lag_seconds()
+                healthy = self.lag <= max_lag()
+                if not healthy:
+                    logger.warning("Replica is %.1fs behind; reading from the primary.", self.lag)
+            except DatabaseError as exc:
+                self.lag = None
+                healthy = False
+                logger.warning("Replica unavailable (%s); reading from the primary.", exc)
+            self._healthy, self._checked_at = healthy, time.monotonic()
+            return healthy
+
+
+health = ReplicaHealth(getattr(settings, "DATABASE_REPLICA_CHECK_INTERVAL", 5.0))
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (
+            not _read_replica.get()
+            or model._meta.app_label in PRIMARY_APPS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        return REPLICA if health.healthy() else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _read_replica.set(False)
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_replica.reset(token)
+        if request.method not in SAFE_METHODS and replica_configured():
+            # Keep this client on the primary until the replica has caught up with its write.
+            pin = int(max_lag()) + 1
+            response.set_cookie(PIN_COOKIE, str(int(time.time()) + pin), max_age=pin, httponly=True, samesite="Lax")
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            replica_configured()
+            and request.method in SAFE_METHODS
+            and not getattr(view_func, "primary_only", False)
+            and not self._pinned(request)
+        ):
+            _read_replica.set(True)
+
+    @staticmethod
+    def _pinned(request) -> bool:
+        try:
+            return int(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+        except ValueError:
+            return False
@@ -0,0 +1,64 @@
+"""Animal search backed by the trigger-maintained ``Animal.search_vector``.
+
+On Postgres, full-text matches come from the GIN index on ``search_vector`` and
+are ranked; when nothing matches (usually a typo) names are matched by trigram
+similarity if ``pg_trgm`` is installed. Other databases fall back to
+``icontains`` so development setups keep working.
+"""
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connections
+from django.db.models import F, Q, QuerySet
+
+_trigram_available: dict[str, bool] = {}
+
+
+def _is_postgres(queryset: QuerySet) -> bool:
+    return connections[queryset.db].vendor == "postgresql"
+
+
+def trigram_available(alias: str) -> bool:
+    if alias not in _trigram_available:
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            _trigram_available[alias] = cursor.fetchone() is not None
+    return _trigram_available[alias]
+
+
+def text_query(query: str) -> SearchQuery:
+    return SearchQuery(query, search_type="websearch", config="english")
+
+
+def filter_animals(queryset: QuerySet, query: str) -> QuerySet:
+    """Unranked matches, for callers that keep their own ordering (e.g. the admin).
+
+    Names also match on any part ("bel" finds Bella), which full-text search,
+    matching whole words, would miss; the trigram index on name serves it.
+    """
+    if not _is_postgres(queryset):
+        return queryset.filter(Q(name__icontains=query) | Q(type__icontains=query) | Q(description__icontains=query))
+    return queryset.filter(Q(search_vector=text_query(query)) | Q(name__icontains=query))
+
+
+def search_animals(queryset: QuerySet, query: str, limit: int) -> list:
+    """Best ``limit`` animals for ``query``, most relevant first."""
+    query = query.strip()
+    if not query:
+        return []
+    if not _is_postgres(queryset):
+        return list(filter_animals(queryset, query)[:limit])
+
+    tsquery = text_query(query)
+    # Every match is ranked before the limit applies; cutting the matches first would rank an arbitrary subset.
+    results = list(
+        queryset.filter(search_vector=tsquery)
+        .annotate(rank=SearchRank(F("search_vector"), tsquery))
+        .order_by("-rank", "status_rank", "-created_at", "-id")[:limit]
+    )
+    if results or not trigram_available(queryset.db):
+        return results
+    return list(
+        queryset.filter(name__trigram_word_similar=query)
+        .annotate(rank=TrigramWordSimilarity(query, "name"))
+        .order_by("-rank", "status_rank", "-created_at", "-id")[:limit]
+    )
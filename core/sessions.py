@@ -0,0 +1,31 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DatabaseSessionStore
+from django.utils import timezone
+
+CLEAR_BATCH_SIZE = 1000
+
+
+def clear_expired(batch_size: int = CLEAR_BATCH_SIZE, pause: float = 0.0) -> int:
+    """Delete expired database sessions ``batch_size`` rows at a time; return how many went.
+
+    Unlike ``clearsessions``' single DELETE, each batch is its own short
+    statement, so a large backlog never holds locks or one long transaction.
+    Cookie and cache sessions expire on their own and are left alone.
+    """
+    store = import_module(settings.SESSION_ENGINE).SessionStore
+    if not issubclass(store, DatabaseSessionStore):
+        return 0
+    sessions = store.get_model_class().objects
+    deleted = 0
+    while True:
+        keys = list(
+            sessions.filter(expire_date__lt=timezone.now()).values_list("session_key", flat=True)[:batch_size]
+        )
+        if not keys:
+            return deleted
+        deleted += sessions.filter(session_key__in=keys).delete()[0]
+        if pause:
+            time.sleep(pause)
@@ -0,0 +1,109 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import events, facets, similarity
+from .adoptions import log_transition, move_request_counter
+from .auth import forget_user
+from .caching import invalidate_catalog
+from .jobs import enqueue
+from .models import AdoptionRequest, Animal
+
+
+@receiver(post_save, sender=Animal)
+@receiver(post_delete, sender=Animal)
+@receiver(post_save, sender=AdoptionRequest)
+@receiver(post_delete, sender=AdoptionRequest)
+def invalidate_catalog_cache(sender, **kwargs):
+    # After commit: a page cached under the new version before then could still hold the old rows.
+    transaction.on_commit(invalidate_catalog)
+
+
+@receiver(pre_save, sender=Animal)
+def remember_stored_facet(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        instance._stored_facet = None
+        return
+    stored = getattr(instance, "_stored_facet", None)
+    if not stored or None in stored:
+        instance._stored_facet = Animal.objects.filter(pk=instance.pk).values_list("type", "status").first()
+
+
+@receiver(post_save, sender=Animal)
+def record_animal_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    before = instance._stored_facet
+    current = (instance.type, instance.status)
+    facets.move(before, current)
+    if before and before[1] != instance.status:
+        events.publish([events.animal_event(instance.pk, instance.status)])
+    if similarity.needs_refresh(before, instance, update_fields):
+        enqueue("similar.refresh", animal_ids=[instance.pk])
+    instance._stored_facet = current
+
+
+@receiver(post_delete, sender=Animal)
+def move_facet_on_delete(sender, instance, **kwargs):
+    facets.move(getattr(instance, "_stored_facet", None) or (instance.type, instance.status), None)
+
+
+@receiver(post_delete, sender=Animal)
+def forget_variants_on_delete(sender, instance, **kwargs):
+    # A job, so files are only removed once the delete has committed, and off the request.
+    if instance.image_variants:
+        enqueue("images.forget_variants", animal_id=instance.pk, manifest=instance.image_variants)
+
+
+def _read_stored_counter(instance) -> None:
+    if not getattr(instance, "_stored_counter", None):
+        instance._stored_counter = (
+            AdoptionRequest.objects.filter(pk=instance.pk).values_list("animal_id", "status").first()
+        )
+
+
+def _deleted_with_animal(origin) -> bool:
+    return isinstance(origin, Animal) or getattr(origin, "model", None) is Animal
+
+
+@receiver(pre_save, sender=AdoptionRequest)
+def remember_stored_counter(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        instance._stored_counter = None
+        return
+    _read_stored_counter(instance)
+
+
+@receiver(pre_delete, sender=AdoptionRequest)
+def remember_deleted_counter(sender, instance, origin=None, **kwargs):
+    # A deferred animal or status cannot be loaded once the row is gone.
+    if not _deleted_with_animal(origin):
+        _read_stored_counter(instance)
+
+
+@receiver(post_save, sender=AdoptionRequest)
+def record_request_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    before = instance._stored_counter
+    current = (instance.animal_id, instance.status)
+    move_request_counter(before, current)
+    if before is None or before[1] != instance.status:
+        # Whoever saved it (submit_request, the admin) may say who acted via _actor.
+        log_transition(instance, before[1] if before else "", getattr(instance, "_actor", None))
+    instance._stored_counter = current
+
+
+@receiver(post_delete, sender=AdoptionRequest)
+def move_counter_on_delete(sender, instance, origin=None, **kwargs):
+    if _deleted_with_animal(origin):
+        # The animal, counters and all, is being deleted along with its requests.
+        return
+    move_request_counter(instance._stored_counter, None)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    forget_user(instance.pk)
@@ -0,0 +1,243 @@
+"""Precomputed "similar pets" for the animal page.
+
+Every animal is a sparse TF-IDF vector over three kinds of term: its type, its
+age band and the keywords in its description. Type and age are weighted up so a
+playful rabbit is not offered to someone looking at a playful dog. The
+``SIMILAR_NEIGHBOURS`` closest animals by cosine similarity that are not yet
+adopted are stored in ``SimilarAnimal``, so the page reads them with one
+indexed lookup.
+
+Scores come from an inverted index (term -> [(animal, weight), ...]): each
+animal is only compared with animals that share a term with it. The index is
+kept in ``SimilarityPosting``, with document frequencies in ``SimilarityTerm``.
+``rebuild`` recomputes every vector and every list, one batch at a time.
+``refresh`` re-vectorizes the given animals against the stored frequencies,
+then reads only the postings of the terms involved to recompute those animals
+and every list they now belong in or have to leave. It runs as a background
+job when an animal is added, edited, or adopted or un-adopted. Document
+frequencies drift as animals come and go; a periodic ``rebuild``
+(``rebuild_similar_animals``, also needed once after migrating) evens that out.
+"""
+
+import math
+import re
+from collections import Counter, defaultdict
+from heapq import nlargest
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Q
+
+from .constants import SIMILAR_NEIGHBOURS
+from .models import Animal, AnimalStatus, SimilarAnimal, SimilarityPosting, SimilarityTerm
+
+BATCH_SIZE = 500
+WORD = re.compile(r"[a-z]{3,}")
+STOP_WORDS = frozenset(
+    "about and are but can for from has have her him his home its looking loves not our she that the their them "
+    "they this very was who will with you your".split()
+)
+# (oldest age in the band, band)
+AGE_BANDS = ((1, "baby"), (3, "young"), (7, "adult"))
+TERM_WEIGHTS = {"type": 3.0, "age": 1.5, "word": 1.0}
+# SimilarityTerm row holding the number of animals indexed.
+ALL_ANIMALS = "*"
+# Scores this close are treated as equal when deciding which lists to recompute.
+TIE = 1e-9
+# Animal fields the vectors are built from.
+FEATURE_FIELDS = frozenset({"type", "age", "description"})
+
+
+def age_band(age: int) -> str:
+    return next((band for oldest, band in AGE_BANDS if age <= oldest), "senior")
+
+
+def terms(animal_type: str, age: int, description: str) -> Counter:
+    counts = Counter(f"word:{word}" for word in WORD.findall(description.lower()) if word not in STOP_WORDS)
+    counts[f"type:{' '.join(animal_type.lower().split())}"] += 1
+    counts[f"age:{age_band(age)}"] += 1
+    return counts
+
+
+def vectorize(counts: dict[int, Counter], document_frequency, total: int) -> dict[int, dict[str, float]]:
+    """Unit TF-IDF vectors for term ``counts``; terms missing from ``document_frequency`` count once."""
+    vectors = {}
+    for pk, animal_terms in counts.items():
+        vector = {
+            term: (1 + math.log(count))
+            * (math.log((1 + total) / (1 + document_frequency.get(term, 1))) + 1)
+            * TERM_WEIGHTS[term.partition(":")[0]]
+            for term, count in animal_terms.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        vectors[pk] = {term: weight / norm for term, weight in vector.items()}
+    return vectors
+
+
+class Index:
+    """An inverted index over (part of) the animals' vectors."""
+
+    def __init__(self, vectors: dict[int, dict[str, float]], candidates: set[int]):
+        self.vectors = vectors
+        self.candidates = candidates
+        self.postings: dict[str, list[tuple[int, float]]] = defaultdict(list)
+        for pk, vector in vectors.items():
+            for term, weight in vector.items():
+                self.postings[term].append((pk, weight))
+
+    @classmethod
+    def load(cls, terms: Iterable[str]) -> "Index":
+        """The stored postings of ``terms``: enough to score any animal whose terms are all among them."""
+        vectors: dict[int, dict[str, float]] = defaultdict(dict)
+        candidates: set[int] = set()
+        for term, pk, weight, status in (
+            SimilarityPosting.objects.filter(term__in=set(terms))
+            .values_list("term", "animal_id", "weight", "animal__status")
+            .iterator(chunk_size=5000)
+        ):
+            vectors[pk][term] = weight
+            if status != AnimalStatus.ADOPTED:
+                candidates.add(pk)
+        return cls(vectors, candidates)
+
+    def scores(self, pk: int) -> dict[int, float]:
+        """Cosine similarity of ``pk`` with every animal sharing a term with it."""
+        scores: dict[int, float] = defaultdict(float)
+        for term, weight in self.vectors.get(pk, {}).items():
+            for other, other_weight in self.postings[term]:
+                scores[other] += weight * other_weight
+        scores.pop(pk, None)
+        return scores
+
+    def neighbours(self, pk: int, scores: dict[int, float] | None = None) -> list[tuple[int, float]]:
+        scores = self.scores(pk) if scores is None else scores
+        return nlargest(
+            SIMILAR_NEIGHBOURS,
+            ((other, score) for other, score in scores.items() if other in self.candidates),
+            key=lambda item: (item[1], -item[0]),
+        )
+
+
+def _rows(animals):
+    return animals.values_list("pk", "type", "age", "description", "status")
+
+
+def _write(neighbours: dict[int, list[tuple[int, float]]]) -> None:
+    with transaction.atomic():
+        # Animals deleted since the index was loaded must not be written back.
+        mentioned = set(neighbours) | {other for rows in neighbours.values() for other, _ in rows}
+        existing = set(Animal.objects.filter(pk__in=mentioned).values_list("pk", flat=True))
+        SimilarAnimal.objects.filter(animal_id__in=neighbours).delete()
+        SimilarAnimal.objects.bulk_create(
+            [
+                SimilarAnimal(animal_id=pk, similar_id=other, rank=rank, score=score)
+                for pk, rows in neighbours.items()
+                if pk in existing
+                for rank, (other, score) in enumerate(other_row for other_row in rows if other_row[0] in existing)
+            ],
+            batch_size=1000,
+        )
+
+
+def _store_postings(vectors: dict[int, dict[str, float]]) -> None:
+    with transaction.atomic():
+        SimilarityPosting.objects.filter(animal_id__in=vectors).delete()
+        existing = set(Animal.objects.filter(pk__in=vectors).values_list("pk", flat=True))
+        SimilarityPosting.objects.bulk_create(
+            [
+                SimilarityPosting(term=term, animal_id=pk, weight=weight)
+                for pk, vector in vectors.items()
+                if pk in existing
+                for term, weight in vector.items()
+            ],
+            batch_size=5000,
+        )
+
+
+def rebuild(batch_size: int = BATCH_SIZE) -> int:
+    """Recompute every vector, frequency and neighbour list; return how many animals were indexed."""
+    counts: dict[int, Counter] = {}
+    document_frequency: Counter = Counter()
+    candidates: set[int] = set()
+    for pk, animal_type, age, description, status in _rows(Animal.objects.all()).iterator(chunk_size=2000):
+        counts[pk] = terms(animal_type, age, description or "")
+        document_frequency.update(counts[pk].keys())
+        if status != AnimalStatus.ADOPTED:
+            candidates.add(pk)
+    index = Index(vectorize(counts, document_frequency, len(counts)), candidates)
+    with transaction.atomic():
+        SimilarityTerm.objects.all().delete()
+        SimilarityTerm.objects.bulk_create(
+            [SimilarityTerm(term=term, document_frequency=df) for term, df in document_frequency.items()]
+            + [SimilarityTerm(term=ALL_ANIMALS, document_frequency=len(counts))],
+            batch_size=5000,
+        )
+    pks = sorted(index.vectors)
+    for start in range(0, len(pks), batch_size):
+        batch = pks[start : start + batch_size]
+        _store_postings({pk: index.vectors[pk] for pk in batch})
+        _write({pk: index.neighbours(pk) for pk in batch})
+    return len(pks)
+
+
+def refresh(animal_ids: Iterable[int]) -> int:
+    """Recompute ``animal_ids`` and the lists they enter or leave; return how many lists were rewritten.
+
+    The result is exact for the stored frequencies, so it reads every posting of the
+    animals' terms, including their ``type:`` and ``age:`` terms, which cover a large
+    share of the table. That read costs the same for one animal as for hundreds of
+    the same kinds, so the ``similar.refresh`` job takes over the other queued ones
+    and runs them together.
+    """
+    counts = {
+        pk: terms(animal_type, age, description or "")
+        for pk, animal_type, age, description, _ in _rows(Animal.objects.filter(pk__in=set(animal_ids)))
+    }
+    if not counts:
+        return 0
+    changed = set(counts)
+    wanted = set().union(*counts.values())
+    document_frequency = dict(
+        SimilarityTerm.objects.filter(term__in=wanted | {ALL_ANIMALS}).values_list("term", "document_frequency")
+    )
+    total = document_frequency.pop(ALL_ANIMALS, None) or Animal.objects.count()
+    _store_postings(vectorize(counts, document_frequency, total))
+
+    index = Index.load(wanted)
+    scores = {pk: index.scores(pk) for pk in changed}
+    # The score an animal has to reach to get into each full list. Ties go to the lower
+    # id, and a tie summed in another order can come out a rounding error short.
+    others = set().union(*scores.values()) - changed
+    thresholds = dict(
+        SimilarAnimal.objects.filter(animal_id__in=others, rank=SIMILAR_NEIGHBOURS - 1).values_list(
+            "animal_id", "score"
+        )
+    )
+    affected = set(
+        SimilarAnimal.objects.filter(Q(similar_id__in=changed) & ~Q(animal_id__in=changed)).values_list(
+            "animal_id", flat=True
+        )
+    )
+    for pk in changed & index.candidates:
+        affected.update(other for other, score in scores[pk].items() if score >= thresholds.get(other, 0.0) - TIE)
+    affected -= changed
+    neighbours = {pk: index.neighbours(pk, scores[pk]) for pk in changed}
+    if affected:
+        # Their lists are recomputed in full, which takes the postings of all of their terms.
+        extra = set(
+            SimilarityPosting.objects.filter(animal_id__in=affected).values_list("term", flat=True).distinct()
+        )
+        if extra - wanted:
+            index = Index.load(wanted | extra)
+        neighbours.update((pk, index.neighbours(pk)) for pk in affected)
+    _write(neighbours)
+    return len(neighbours)
+
+
+def needs_refresh(before: tuple | None, animal: Animal, update_fields=None) -> bool:
+    """Whether saving ``animal`` (stored as ``before`` = (type, status)) can change any neighbour list."""
+    if before is None:
+        return True
+    if (before[1] == AnimalStatus.ADOPTED) != (animal.status == AnimalStatus.ADOPTED):
+        return True
+    return update_fields is None or bool(FEATURE_FIELDS & set(update_fields))
@@ -0,0 +1,53 @@
+"""Content-addressed media storage.
+
+Uploads are stored under the SHA-256 of their bytes (``animals/<digest>.jpeg``)
+instead of the uploaded file name, so a URL never changes meaning and can be
+cached forever, and identical uploads share one file. Variants written by
+core.images go through the same storage and get hashed names too.
+"""
+
+import hashlib
+import re
+from pathlib import PurePosixPath
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+DIGEST_LENGTH = 32
+HASHED_NAME = re.compile(rf"(?:^|/)[0-9a-f]{{{DIGEST_LENGTH}}}\.[0-9a-z]+$")
+
+
+def content_digest(content: File) -> str:
+    digest = hashlib.sha256()
+    for chunk in content.chunks():  # chunks() rewinds first
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()[:DIGEST_LENGTH]
+
+
+def is_hashed(name: str) -> bool:
+    """Whether ``name`` was written by a content-addressed storage, i.e. safe to cache as immutable."""
+    return bool(HASHED_NAME.search(name or ""))
+
+
+class ContentAddressedMixin:
+    """Name files after their content; saving bytes that are already stored writes nothing."""
+
+    def hashed_name(self, name: str, content) -> str:
+        path = PurePosixPath(name)
+        suffix = path.suffix.lower() or ".bin"
+        return str(path.with_name(f"{content_digest(content)}{suffix}"))
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        name = self.hashed_name(self.generate_filename(name), content)
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length=max_length)
+
+
+class HashedFileSystemStorage(ContentAddressedMixin, FileSystemStorage):
+    pass
@@ -0,0 +1,14 @@
+"""Content-addressed media on S3 or an S3-compatible server such as MinIO.
+
+Needs the optional ``django-storages[s3]`` package; settings only select this
+backend when ``MEDIA_STORAGE=s3``, and pass it the bucket, endpoint and
+``Cache-Control`` options.
+"""
+
+from storages.backends.s3 import S3Storage
+
+from .storage import ContentAddressedMixin
+
+
+class HashedS3Storage(ContentAddressedMixin, S3Storage):
+    pass
@@ -0,0 +1,32 @@
+from django.db import transaction
+
+from . import similarity
+from .images import forget_variants, refresh_variants
+from .jobs import take_over, task
+from .models import Animal
+
+# Queued refreshes folded into the one running; see similarity.refresh for why.
+REFRESH_BATCH = 200
+
+
+@task("images.refresh_variants")
+def refresh_animal_variants(animal_id: int, source: str = "") -> None:
+    animal = Animal.objects.filter(pk=animal_id).first()
+    if animal is None:
+        return
+    if (animal.image.name or "") != source:
+        # The photo changed again after this job was queued; the newer job owns it.
+        return
+    refresh_variants(animal)
+
+
+@task("images.forget_variants")
+def forget_animal_variants(animal_id: int, manifest: dict) -> None:
+    forget_variants(animal_id, manifest)
+
+
+@task("similar.refresh")
+def refresh_similar_animals(animal_ids: list[int]) -> None:
+    with transaction.atomic():
+        queued = take_over("similar.refresh", REFRESH_BATCH)
+        similarity.refresh(set(animal_ids).union(*(payload["animal_ids"] for payload in queued)))
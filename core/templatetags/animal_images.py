@@ -0,0 +1,62 @@
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from ..constants import THUMBNAIL_ASPECT
+from ..images import MIME_TYPES, variant_url, variants_are_current
+
+register = template.Library()
+
+
+def _variants(animal, kind: str) -> dict:
+    if not animal.image or not variants_are_current(animal):
+        return {}
+    return animal.image_variants.get(kind) or {}
+
+
+def _srcset(storage, names: dict) -> str:
+    return ", ".join(f"{storage.url(name)} {width}w" for width, name in sorted(names.items(), key=lambda i: int(i[0])))
+
+
+@register.simple_tag
+def responsive_image(animal, kind: str = "full", sizes: str = "100vw", loading: str = "lazy"):
+    """Render ``animal.image`` as a ``<picture>`` with AVIF/WebP ``srcset`` candidates.
+
+    Falls back to the original upload when variants have not been generated yet.
+    """
+    if not animal.image:
+        return ""
+    variants = _variants(animal, kind)
+    if not variants:
+        return format_html(
+            '<img src="{}" alt="{}" loading="{}" decoding="async">', animal.image.url, animal.name, loading
+        )
+
+    storage = animal.image.storage
+    sources = format_html_join(
+        "",
+        '<source type="{}" srcset="{}" sizes="{}">',
+        ((MIME_TYPES[fmt], _srcset(storage, variants[fmt]), sizes) for fmt in ("avif", "webp") if fmt in variants),
+    )
+    if kind == "thumb":
+        fallback_width, fallback_name = min(variants["jpeg"].items(), key=lambda i: int(i[0]))
+        fallback_url = storage.url(fallback_name)
+        width = int(fallback_width)
+        height = round(width * THUMBNAIL_ASPECT[1] / THUMBNAIL_ASPECT[0])
+    else:
+        fallback_url = animal.image.url
+        width, height = animal.image_variants["width"], animal.image_variants["height"]
+    return format_html(
+        '<picture>{}<img src="{}" alt="{}" width="{}" height="{}" loading="{}" decoding="async"></picture>',
+        sources,
+        fallback_url,
+        animal.name,
+        width,
+        height,
+        loading,
+    )
+
+
+@register.simple_tag
+def image_variant_url(animal, kind: str = "full", width: int = 960) -> str:
+    """Best single WebP (or original) URL no wider than ``width``, for JS-driven images."""
+    return variant_url(animal, kind, width)
@@ -0,0 +1,112 @@
+"""Batch request actions: locking aside, what ``apply_actions`` writes and refuses to write."""
+
+from django.contrib.auth.models import User
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.adoptions import apply_actions, reconcile_counters
+from core.models import AdoptionRequest, Animal, AnimalStatus, RequestStatus, RequestTransition
+
+from .utils import counted_facets, stored_facets, submit
+
+
+class ApplyActionsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        cls.adopters = [User.objects.create_user(f"adopter{n}", password="pw") for n in range(3)]
+        cls.dog = Animal.objects.create(name="Rex", type="Dog", age=3, created_by=cls.staff)
+        cls.cat = Animal.objects.create(name="Tom", type="Cat", age=5, created_by=cls.staff)
+        cls.dog_requests = [submit(user, cls.dog)[0] for user in cls.adopters]
+        cls.cat_request = submit(cls.adopters[0], cls.cat)[0]
+
+    def statuses(self, animal) -> dict:
+        return dict(AdoptionRequest.objects.filter(animal=animal).values_list("pk", "status"))
+
+    def test_submitted_requests_leave_the_animals_pending(self):
+        self.dog.refresh_from_db()
+        self.assertEqual(self.dog.status, AnimalStatus.PENDING)
+        self.assertEqual(self.dog.pending_requests, 3)
+
+    def test_approve_rejects_the_siblings(self):
+        chosen, *siblings = self.dog_requests
+        result = apply_actions([(chosen.pk, "approve")], actor=self.staff)
+
+        self.assertEqual([outcome.error for outcome in result.outcomes], [""])
+        self.assertEqual(
+            self.statuses(self.dog),
+            {chosen.pk: RequestStatus.APPROVED, **{sibling.pk: RequestStatus.REJECTED for sibling in siblings}},
+        )
+        self.dog.refresh_from_db()
+        self.assertEqual(self.dog.status, AnimalStatus.ADOPTED)
+        self.assertEqual((self.dog.pending_requests, self.dog.approved_requests, self.dog.rejected_requests), (0, 1, 2))
+        caused = RequestTransition.objects.filter(cause_id=chosen.pk)
+        self.assertEqual(set(caused.values_list("request_id", flat=True)), {sibling.pk for sibling in siblings})
+        self.assertEqual(set(caused.values_list("actor_id", flat=True)), {self.staff.pk})
+
+    def test_mixed_batch(self):
+        first, second, third = self.dog_requests
+        result = apply_actions(
+            [(second.pk, "reject"), (first.pk, "approve"), (self.cat_request.pk, "reject")], actor=self.staff
+        )
+
+        self.assertTrue(all(outcome.ok for outcome in result.outcomes))
+        self.assertEqual(
+            self.statuses(self.dog),
+            {first.pk: RequestStatus.APPROVED, second.pk: RequestStatus.REJECTED, third.pk: RequestStatus.REJECTED},
+        )
+        self.assertEqual(self.statuses(self.cat), {self.cat_request.pk: RequestStatus.REJECTED})
+        self.assertEqual(
+            dict(Animal.objects.values_list("pk", "status")),
+            {self.dog.pk: AnimalStatus.ADOPTED, self.cat.pk: AnimalStatus.AVAILABLE},
+        )
+
+    def test_rejecting_one_of_several_keeps_the_animal_pending(self):
+        apply_actions([(self.dog_requests[0].pk, "reject")], actor=self.staff)
+        self.dog.refresh_from_db()
+        self.assertEqual(self.dog.status, AnimalStatus.PENDING)
+
+    def test_reset_reopens_every_request(self):
+        apply_actions([(self.dog_requests[0].pk, "approve")], actor=self.staff)
+        apply_actions([(self.dog_requests[1].pk, "reset")], actor=self.staff)
+        self.assertEqual(set(self.statuses(self.dog).values()), {RequestStatus.PENDING})
+        self.dog.refresh_from_db()
+        self.assertEqual((self.dog.status, self.dog.pending_requests), (AnimalStatus.PENDING, 3))
+
+    def test_rejecting_a_request_that_is_not_pending_writes_nothing(self):
+        apply_actions([(self.dog_requests[0].pk, "approve")], actor=self.staff)
+        self.dog.refresh_from_db()
+        statuses, transitions = self.statuses(self.dog), RequestTransition.objects.count()
+
+        result = apply_actions([(self.dog_requests[0].pk, "reject")], actor=self.staff)
+
+        self.assertEqual(result.outcomes[0].error, "request is approved, not pending")
+        self.assertEqual(result.applied, [])
+        self.assertEqual(self.statuses(self.dog), statuses)
+        self.assertEqual(RequestTransition.objects.count(), transitions)
+        updated_at = self.dog.updated_at
+        self.dog.refresh_from_db()
+        self.assertEqual((self.dog.status, self.dog.updated_at), (AnimalStatus.ADOPTED, updated_at))
+
+    def test_unknown_requests_and_actions_are_skipped(self):
+        result = apply_actions([(10**9, "approve"), (self.dog_requests[0].pk, "adopt")], actor=self.staff)
+        self.assertEqual(
+            [outcome.error for outcome in result.outcomes], ["request no longer exists", "unknown action"]
+        )
+        self.assertEqual(set(self.statuses(self.dog).values()), {RequestStatus.PENDING})
+
+    def test_ids_that_are_not_numbers_are_refused(self):
+        with self.assertRaises(ValueError):
+            apply_actions([("abc", "approve")], actor=self.staff)
+        client = Client()
+        client.force_login(self.staff)
+        response = client.post(reverse("core:manage_requests"), {"request_id": "abc", "action": "approve"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_counters_and_facets_match_a_recount(self):
+        first, second, _ = self.dog_requests
+        apply_actions([(second.pk, "reject"), (self.cat_request.pk, "approve")], actor=self.staff)
+        apply_actions([(first.pk, "approve"), (self.cat_request.pk, "reset")], actor=self.staff)
+
+        self.assertEqual(reconcile_counters(dry_run=True), 0)
+        self.assertEqual(stored_facets(), counted_facets())
@@ -0,0 +1,110 @@
+"""``archive_adoptions`` moves adopted animals and their requests out whole, and nothing else."""
+
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core import similarity
+from core.adoptions import apply_actions, reconcile_counters
+from core.archive import ANIMAL_FIELDS, REQUEST_FIELDS, archive_adoptions
+from core.models import (
+    AdoptionRequest,
+    Animal,
+    ArchivedAdoptionRequest,
+    ArchivedAnimal,
+    RequestStatus,
+    SimilarAnimal,
+    SimilarityPosting,
+)
+
+from .utils import STORAGES, counted_facets, stored_facets, submit
+
+
+@override_settings(STORAGES=STORAGES)
+class ArchiveAdoptionsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        cls.adopters = [User.objects.create_user(f"adopter{n}", password="pw") for n in range(3)]
+        cls.adopted = Animal.objects.create(
+            name="Rex", type="Dog", age=3, description="A playful dog", created_by=cls.staff
+        )
+        cls.live = Animal.objects.create(name="Tom", type="Dog", age=4, description="A gentle dog", created_by=cls.staff)
+        cls.fresh = Animal.objects.create(name="Max", type="Dog", age=2, description="A calm dog", created_by=cls.staff)
+        winner, *_ = (submit(user, cls.adopted)[0] for user in cls.adopters)
+        cls.turned_down = submit(cls.adopters[0], cls.live)[0]
+        submit(cls.adopters[1], cls.live)
+        fresh_request = submit(cls.adopters[0], cls.fresh)[0]
+        apply_actions([(winner.pk, "approve"), (cls.turned_down.pk, "reject")], actor=cls.staff)
+        apply_actions([(fresh_request.pk, "approve")], actor=cls.staff)
+        similarity.rebuild()
+        # Everything is old enough except the most recent adoption.
+        long_ago = timezone.now() - timedelta(days=365)
+        Animal.objects.exclude(pk=cls.fresh.pk).update(updated_at=long_ago)
+        AdoptionRequest.objects.exclude(animal=cls.fresh).update(updated_at=long_ago)
+
+    def archive(self, **kwargs):
+        return archive_adoptions(timezone.now() - timedelta(days=180), **kwargs)
+
+    def test_dry_run_counts_without_moving(self):
+        result = self.archive(dry_run=True)
+        self.assertEqual((result.animals, result.requests), (1, 3))
+        self.assertFalse(ArchivedAnimal.objects.exists())
+
+    def test_archived_copies_are_complete(self):
+        animal = Animal.objects.filter(pk=self.adopted.pk).values(*ANIMAL_FIELDS).get()
+        requests = list(AdoptionRequest.objects.filter(animal=self.adopted).order_by("pk").values(*REQUEST_FIELDS))
+
+        result = self.archive(batch_size=1)
+
+        self.assertEqual((result.animals, result.requests), (1, 3))
+        self.assertEqual(ArchivedAnimal.objects.filter(pk=self.adopted.pk).values(*ANIMAL_FIELDS).get(), animal)
+        archived = ArchivedAdoptionRequest.objects.order_by("pk").values(*REQUEST_FIELDS[:3], *REQUEST_FIELDS[4:])
+        self.assertEqual(
+            list(archived),
+            [{name: row[name] for name in REQUEST_FIELDS if name != "animal__name"} for row in requests],
+        )
+        self.assertEqual(set(ArchivedAdoptionRequest.objects.values_list("animal_name", flat=True)), {"Rex"})
+
+    def test_live_rows_are_gone(self):
+        self.archive()
+        self.assertFalse(Animal.objects.filter(pk=self.adopted.pk).exists())
+        self.assertFalse(AdoptionRequest.objects.filter(animal_id=self.adopted.pk).exists())
+        self.assertFalse(SimilarAnimal.objects.filter(similar_id=self.adopted.pk).exists())
+        self.assertFalse(SimilarAnimal.objects.filter(animal_id=self.adopted.pk).exists())
+        self.assertFalse(SimilarityPosting.objects.filter(animal_id=self.adopted.pk).exists())
+
+    def test_recent_adoptions_and_catalog_animals_stay(self):
+        self.archive()
+        self.assertEqual(set(Animal.objects.values_list("pk", flat=True)), {self.live.pk, self.fresh.pk})
+        # The resolved request keeps blocking a second one from the same adopter.
+        self.assertEqual(
+            AdoptionRequest.objects.get(pk=self.turned_down.pk).status, RequestStatus.REJECTED
+        )
+        self.assertFalse(submit(self.adopters[0], self.live)[1])
+
+    def test_facets_and_counters_stay_right(self):
+        self.archive()
+        self.assertEqual(stored_facets(), counted_facets())
+        self.assertEqual(stored_facets()["dog"], (0, 1, 1))
+        self.assertEqual(reconcile_counters(dry_run=True), 0)
+
+    def test_animal_page_falls_back_to_the_archive(self):
+        self.archive()
+        client = Client()
+        response = client.get(reverse("core:animal_detail", args=[self.adopted.pk]))
+        self.assertContains(response, "Rex")
+        self.assertContains(response, "This pet found a home.")
+
+        client.force_login(self.adopters[1])
+        response = client.get(reverse("core:animal_detail", args=[self.adopted.pk]))
+        self.assertContains(response, "your request was rejected")
+        self.assertContains(client.get(reverse("core:my_requests")), "Earlier requests")
+
+    def test_a_second_run_finds_nothing(self):
+        self.archive()
+        result = self.archive()
+        self.assertEqual((result.animals, result.requests), (0, 0))
@@ -0,0 +1,55 @@
+"""Catalog pages cached while a write is still open must not outlive its commit."""
+
+import threading
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+
+from core.adoptions import submit_request
+from core.forms import AdoptionRequestForm
+from core.models import Animal, AnimalStatus
+from core.views import _catalog_fragment
+
+
+def fill_from_another_connection() -> dict:
+    """Render the catalog grid the way a concurrent request would: its own thread, its own connection."""
+    result = {}
+
+    def run():
+        try:
+            result.update(_catalog_fragment("", {}))
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    thread.join()
+    return result
+
+
+@skipUnless(connection.vendor == "postgresql", "needs a second connection reading during a write")
+class CatalogInvalidationTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        self.adopter = User.objects.create_user("adopter", password="pw")
+        self.rex = Animal.objects.create(name="Rex", type="Dog", age=3, created_by=self.staff)
+
+    def test_fill_inside_a_write_transaction_is_not_served_after_commit(self):
+        with transaction.atomic():
+            added = Animal.objects.create(name="Luna", type="Cat", age=2, created_by=self.staff)
+            self.assertNotIn(added.pk, fill_from_another_connection()["ids"])
+        self.assertIn(added.pk, _catalog_fragment("", {})["ids"])
+
+    def test_submit_request_invalidates_after_the_status_flip(self):
+        form = AdoptionRequestForm(data={"message": "Hello"})
+        self.assertTrue(form.is_valid())
+        with transaction.atomic():
+            submit_request(form, self.adopter, self.rex)
+            self.assertIn('data-animal-status="Available"', fill_from_another_connection()["html"])
+        self.rex.refresh_from_db()
+        self.assertEqual(self.rex.status, AnimalStatus.PENDING)
+        self.assertIn('data-animal-status="Pending"', _catalog_fragment("", {})["html"])
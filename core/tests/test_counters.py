@@ -0,0 +1,89 @@
+"""The per-animal request counters stay equal to a COUNT(*) of the requests."""
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from core.adoptions import apply_actions, reconcile_counters
+from core.models import AdoptionRequest, Animal, RequestStatus
+
+from .utils import submit
+
+
+class RequestCounterTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        cls.adopters = [User.objects.create_user(f"adopter{n}", password="pw") for n in range(3)]
+        cls.dog = Animal.objects.create(name="Rex", type="Dog", age=3, created_by=cls.staff)
+        cls.cat = Animal.objects.create(name="Tom", type="Cat", age=5, created_by=cls.staff)
+
+    def counters(self, animal) -> tuple[int, int, int]:
+        animal.refresh_from_db()
+        return animal.pending_requests, animal.approved_requests, animal.rejected_requests
+
+    def assertNoDrift(self):
+        self.assertEqual(reconcile_counters(dry_run=True), 0)
+
+    def test_submit(self):
+        for user in self.adopters:
+            submit(user, self.dog)
+        submit(self.adopters[0], self.dog)  # a double submit counts once
+        self.assertEqual(self.counters(self.dog), (3, 0, 0))
+        self.assertNoDrift()
+
+    def test_approve_reject_reset(self):
+        first, second, third = (submit(user, self.dog)[0] for user in self.adopters)
+        apply_actions([(second.pk, "reject")], actor=self.staff)
+        self.assertEqual(self.counters(self.dog), (2, 0, 1))
+        apply_actions([(first.pk, "approve")], actor=self.staff)
+        self.assertEqual(self.counters(self.dog), (0, 1, 2))
+        apply_actions([(third.pk, "reset")], actor=self.staff)
+        self.assertEqual(self.counters(self.dog), (3, 0, 0))
+        self.assertNoDrift()
+
+    def test_status_and_animal_edited_through_save(self):
+        adoption_request, _ = submit(self.adopters[0], self.dog)
+        adoption_request.status = RequestStatus.REJECTED
+        adoption_request.save()
+        self.assertEqual(self.counters(self.dog), (0, 0, 1))
+        adoption_request.animal = self.cat
+        adoption_request.save()
+        self.assertEqual((self.counters(self.dog), self.counters(self.cat)), ((0, 0, 0), (0, 0, 1)))
+        self.assertNoDrift()
+
+    def test_delete_request(self):
+        kept, deleted, _ = (submit(user, self.dog)[0] for user in self.adopters)
+        apply_actions([(kept.pk, "reject")], actor=self.staff)
+        deleted.delete()
+        # A deferred status must still be known when the row goes.
+        AdoptionRequest.objects.only("message").get(pk=kept.pk).delete()
+        self.assertEqual(self.counters(self.dog), (1, 0, 0))
+        self.assertNoDrift()
+
+    def test_delete_requests_in_bulk(self):
+        for user in self.adopters:
+            submit(user, self.dog)
+            submit(user, self.cat)
+        AdoptionRequest.objects.filter(user=self.adopters[0]).delete()
+        self.assertEqual((self.counters(self.dog), self.counters(self.cat)), ((2, 0, 0), (2, 0, 0)))
+        self.assertNoDrift()
+
+    def test_delete_animal(self):
+        for user in self.adopters:
+            submit(user, self.dog)
+            submit(user, self.cat)
+        self.dog.delete()
+        self.assertEqual(AdoptionRequest.objects.count(), 3)
+        self.assertEqual(self.counters(self.cat), (3, 0, 0))
+        self.assertNoDrift()
+
+    def test_reconcile_repairs_a_corrupted_counter(self):
+        for user in self.adopters:
+            submit(user, self.dog)
+        Animal.objects.filter(pk=self.dog.pk).update(pending_requests=7, rejected_requests=2)
+
+        self.assertEqual(reconcile_counters(dry_run=True), 1)
+        self.assertEqual(self.counters(self.dog), (7, 0, 2))
+        self.assertEqual(reconcile_counters(), 1)
+        self.assertEqual(self.counters(self.dog), (3, 0, 0))
+        self.assertNoDrift()
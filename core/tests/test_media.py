@@ -0,0 +1,88 @@
+"""``media.serve``: caching headers, byte ranges and the ASGI streaming path."""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from core.media import CHUNK_SIZE, MUTABLE_CACHE_CONTROL
+
+HASHED = "animals/0123456789abcdef0123456789abcdef.jpeg"
+CONTENT = bytes(range(256)) * (CHUNK_SIZE // 128 + 3)  # a few chunks and a bit
+
+
+class ServeMediaTests(SimpleTestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        for name in (HASHED, "legacy/photo.jpeg"):
+            path = Path(media_root, name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(CONTENT)
+
+    def get(self, name=HASHED, **headers):
+        return self.client.get(f"/media/{name}", headers=headers)
+
+    def test_whole_file(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT)
+        self.assertEqual(response["Content-Length"], str(len(CONTENT)))
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(response["ETag"], '"0123456789abcdef0123456789abcdef"')
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(self.get("legacy/photo.jpeg")["Cache-Control"], MUTABLE_CACHE_CONTROL)
+
+    def test_single_range(self):
+        response = self.get(Range=f"bytes=100-{CHUNK_SIZE + 99}")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], f"bytes 100-{CHUNK_SIZE + 99}/{len(CONTENT)}")
+        self.assertEqual(response["Content-Length"], str(CHUNK_SIZE))
+        self.assertEqual(b"".join(response.streaming_content), CONTENT[100 : CHUNK_SIZE + 100])
+
+        response = self.get(Range="bytes=-10")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT[-10:])
+
+    def test_unsatisfiable_range(self):
+        for header in (f"bytes={len(CONTENT)}-", "bytes=20-10", "bytes=-0"):
+            with self.subTest(header):
+                response = self.get(Range=header)
+                self.assertEqual(response.status_code, 416)
+                self.assertEqual(response["Content-Range"], f"bytes */{len(CONTENT)}")
+
+    def test_stale_if_range_gets_the_whole_file(self):
+        response = self.get(Range="bytes=0-9", **{"If-Range": '"something-else"'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Length"], str(len(CONTENT)))
+
+    def test_if_none_match(self):
+        for name in (HASHED, "legacy/photo.jpeg"):
+            with self.subTest(name):
+                etag = self.get(name)["ETag"]
+                response = self.get(name, **{"If-None-Match": f'"other", {etag}'})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b"")
+                self.assertEqual(response["ETag"], etag)
+
+    def test_missing_and_outside_files(self):
+        self.assertEqual(self.get("animals/missing.jpeg").status_code, 404)
+        self.assertEqual(self.get("animals").status_code, 404)
+        self.assertEqual(self.get(f"..{os.sep}settings.py").status_code, 404)
+
+    def test_head_has_no_body(self):
+        response = self.client.head(f"/media/{HASHED}", headers={"Range": "bytes=0-9"})
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Length"], "10")
+        self.assertEqual(response.content, b"")
+
+    async def test_asgi_streams_asynchronously(self):
+        response = await self.async_client.get(f"/media/{HASHED}", headers={"Range": "bytes=10-"})
+        self.assertEqual(response.status_code, 206)
+        self.assertTrue(response.is_async)
+        chunks = [chunk async for chunk in response.streaming_content]
+        self.assertEqual(len(chunks), -(-(len(CONTENT) - 10) // CHUNK_SIZE))
+        self.assertEqual(b"".join(chunks), CONTENT[10:])
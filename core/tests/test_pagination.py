@@ -0,0 +1,113 @@
+"""Keyset pagination: walking the catalog ordering both ways, and cursors that do not decode."""
+
+import base64
+import json
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.models import Animal, AnimalStatus
+from core.pagination import InvalidCursor, KeysetPaginator
+
+from .utils import STORAGES
+
+
+def cursor_of(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+@override_settings(STORAGES=STORAGES)
+class KeysetPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        now = timezone.now()
+        statuses = [AnimalStatus.AVAILABLE, AnimalStatus.PENDING, AnimalStatus.ADOPTED]
+        for n in range(23):
+            animal = Animal.objects.create(name=f"Pet {n}", type="Dog", age=1, created_by=cls.staff)
+            # Few distinct timestamps and three ranks, so most rows tie on both and only the id breaks the tie.
+            Animal.objects.filter(pk=animal.pk).update(
+                status=statuses[n % 3], created_at=now - timedelta(minutes=n % 4)
+            )
+        cls.expected = list(Animal.objects.order_by(*Animal.CATALOG_ORDERING).values_list("pk", flat=True))
+
+    def paginator(self, per_page=5) -> KeysetPaginator:
+        return KeysetPaginator(Animal.objects.all(), Animal.CATALOG_ORDERING, per_page=per_page)
+
+    def walk_forward(self, paginator) -> list:
+        pages = [paginator.page()]
+        while pages[-1].has_next:
+            pages.append(paginator.page(after=pages[-1].next_cursor))
+        return pages
+
+    def test_forward_walk_visits_every_row_once_in_order(self):
+        pages = self.walk_forward(self.paginator())
+        self.assertEqual([animal.pk for page in pages for animal in page], self.expected)
+        self.assertEqual([len(page) for page in pages], [5, 5, 5, 5, 3])
+
+    def test_first_and_last_page(self):
+        pages = self.walk_forward(self.paginator())
+        first, last = pages[0], pages[-1]
+        self.assertTrue(first.is_first)
+        self.assertFalse(first.has_previous)
+        self.assertTrue(first.has_next)
+        self.assertFalse(last.is_first)
+        self.assertTrue(last.has_previous)
+        self.assertFalse(last.has_next)
+
+    def test_a_full_last_page_has_no_next(self):
+        pages = self.walk_forward(self.paginator(per_page=23))
+        self.assertEqual(len(pages), 1)
+        self.assertFalse(pages[0].has_next)
+
+    def test_backward_walk_returns_the_same_pages(self):
+        paginator = self.paginator()
+        forward = self.walk_forward(paginator)
+        backward = [forward[-1]]
+        while backward[-1].has_previous:
+            backward.append(paginator.page(before=backward[-1].previous_cursor))
+        self.assertEqual(
+            [[animal.pk for animal in page] for page in reversed(backward)],
+            [[animal.pk for animal in page] for page in forward],
+        )
+        self.assertTrue(backward[-1].is_first)
+
+    def test_round_trip(self):
+        paginator = self.paginator()
+        second = paginator.page(after=paginator.page().next_cursor)
+        third = paginator.page(after=second.next_cursor)
+        again = paginator.page(before=third.previous_cursor)
+        self.assertEqual([animal.pk for animal in again], [animal.pk for animal in second])
+        self.assertEqual(again.next_cursor, second.next_cursor)
+
+    def test_cursors_that_do_not_decode(self):
+        paginator = self.paginator()
+        valid = json.loads(base64.urlsafe_b64decode(paginator.page().next_cursor + "=="))
+        bad = {
+            "not base64": "%%%",
+            "not json": base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+            "not a list": cursor_of({"status_rank": 0}),
+            "too short": cursor_of(valid[:2]),
+            "tampered timestamp": cursor_of([valid[0], "yesterday", valid[2]]),
+            "number for a timestamp": cursor_of([valid[0], 123, valid[2]]),
+            "list for an id": cursor_of([valid[0], valid[1], [1]]),
+        }
+        for label, cursor in bad.items():
+            with self.subTest(label), self.assertRaises(InvalidCursor):
+                paginator.page(after=cursor)
+            with self.subTest(label, direction="before"), self.assertRaises(InvalidCursor):
+                paginator.page(before=cursor)
+
+    def test_bad_cursors_give_page_one_or_400_not_500(self):
+        client = Client()
+        client.force_login(self.staff)
+        for cursor in ("%%%", cursor_of([0, 123, 1]), cursor_of([0, "2026-01-01T00:00:00", {"a": 1}])):
+            with self.subTest(cursor):
+                response = client.get(reverse("core:animal_manage_list"), {"after": cursor})
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.context["page"].is_first)
+                response = client.get(reverse("core:api_animals"), {"after": cursor})
+                self.assertEqual(response.status_code, 400)
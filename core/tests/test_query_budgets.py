@@ -0,0 +1,165 @@
+"""Every view with a ``@query_budget`` runs within it, with ``QUERY_BUDGETS_STRICT`` on."""
+
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import URLPattern, reverse
+
+from core import urls
+from core.instrumentation import assert_query_budget
+from core.models import AdoptionRequest, Animal, AnimalStatus, RequestStatus
+
+from .utils import STORAGES
+
+
+def budgeted_url_names() -> set[str]:
+    names = set()
+    for pattern in urls.urlpatterns:
+        view = pattern.callback
+        if isinstance(pattern, URLPattern) and hasattr(getattr(view, "view_class", view), "query_budget"):
+            names.add(pattern.name)
+    return names
+
+
+@override_settings(QUERY_BUDGETS_STRICT=True, RATE_LIMITS={}, STORAGES=STORAGES)
+class QueryBudgetTests(TransactionTestCase):
+    # Not TestCase: inside its transaction every atomic block adds two SAVEPOINT queries that production does not run.
+
+    def setUp(self):
+        cache.clear()
+        cls = self
+        cls.staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        cls.adopter = User.objects.create_user("adopter", "adopter@example.com", "pw")
+        cls.other = User.objects.create_user("other", password="pw")
+        cls.animals = [
+            Animal.objects.create(
+                name=f"Pet {n}",
+                type="Dog" if n % 2 else "Cat",
+                age=n % 12,
+                description="A playful friend looking for a home.",
+                created_by=cls.staff,
+            )
+            for n in range(30)
+        ]
+        cls.request = AdoptionRequest.objects.create(user=cls.adopter, animal=cls.animals[0], message="Hi")
+        for animal in cls.animals[1:6]:
+            AdoptionRequest.objects.create(user=cls.adopter, animal=animal)
+            AdoptionRequest.objects.create(user=cls.other, animal=animal)
+        cls.free = cls.animals[-1]
+
+    def fetch(self, url_name, args=(), role=None, method="get", data=None, **extra):
+        client = Client()
+        if role:
+            client.force_login(getattr(self, role))
+        response = getattr(client, method)(reverse(f"core:{url_name}", args=args), data, **extra)
+        if response.streaming:
+            b"".join(response)
+        assert_query_budget(response)
+        self.assertLess(response.status_code, 500)
+        return response
+
+    def fetch_json(self, url_name, args=(), role=None, method="post", payload=None):
+        return self.fetch(
+            url_name, args, role, method, json.dumps(payload or {}), content_type="application/json"
+        )
+
+    def test_every_budgeted_view_is_exercised(self):
+        missing = sorted(name for name in budgeted_url_names() if not hasattr(self, f"test_{name}"))
+        self.assertEqual(missing, [])
+
+    def test_home(self):
+        self.fetch("home")
+        self.fetch("home", role="adopter")
+        self.fetch("home", data={"type": "dog"})
+        self.fetch("home", data={"q": "playful"})
+
+    def test_animal_search(self):
+        self.fetch("animal_search", data={"q": "Pet"})
+
+    def test_login(self):
+        self.fetch("login")
+        self.assertEqual(self.fetch("login", method="post", data={"username": "adopter", "password": "pw"}).status_code, 302)
+
+    def test_logout(self):
+        self.fetch("logout", role="adopter", method="post")
+
+    def test_signup(self):
+        self.fetch("signup")
+        data = {"username": "newcomer", "email": "new@example.com", "password1": "A-long-pass-123", "password2": "A-long-pass-123"}
+        self.assertEqual(self.fetch("signup", method="post", data=data).status_code, 302)
+
+    def test_animal_detail(self):
+        for role in (None, "adopter", "staff"):
+            self.fetch("animal_detail", [self.animals[1].pk], role)
+
+    def test_animal_create(self):
+        self.fetch("animal_create", role="staff")
+        data = {"name": "Newbie", "type": "Dog", "age": 1, "description": "", "status": AnimalStatus.AVAILABLE}
+        self.assertEqual(self.fetch("animal_create", role="staff", method="post", data=data).status_code, 302)
+
+    def test_animal_update(self):
+        animal = self.animals[2]
+        self.fetch("animal_update", [animal.pk], "staff")
+        data = {"name": "Renamed", "type": animal.type, "age": animal.age, "description": "", "status": animal.status}
+        self.assertEqual(self.fetch("animal_update", [animal.pk], "staff", "post", data).status_code, 302)
+
+    def test_animal_delete(self):
+        self.assertEqual(self.fetch("animal_delete", [self.animals[3].pk], "staff", "post").status_code, 302)
+
+    def test_request_create(self):
+        self.fetch("request_create", [self.free.pk], "adopter")
+        response = self.fetch("request_create", [self.free.pk], "adopter", "post", {"message": "Please"})
+        self.assertEqual(response.status_code, 302)
+
+    def test_my_requests(self):
+        self.fetch("my_requests", role="adopter")
+
+    def test_animal_manage_list(self):
+        self.fetch("animal_manage_list", role="staff")
+        self.fetch("animal_manage_list", role="staff", data={"status": AnimalStatus.PENDING})
+
+    def test_export(self):
+        self.fetch("export", ["animals", "csv"], "staff")
+        self.fetch("export", ["requests", "jsonl"], "staff")
+
+    def test_manage_requests(self):
+        self.fetch("manage_requests", role="staff")
+        self.fetch("manage_requests", role="staff", data={"status": RequestStatus.PENDING})
+        pending = list(AdoptionRequest.objects.filter(animal__in=self.animals[1:6]).values_list("pk", flat=True))
+        self.fetch("manage_requests", role="staff", method="post", data={"request_id": pending[0], "action": "approve"})
+        self.fetch("manage_requests", role="staff", method="post", data={"request_ids": pending[2:], "bulk_action": "reject"})
+
+    def test_view_stats(self):
+        self.fetch("view_stats", role="staff")
+        self.fetch("view_stats", role="staff", data={"format": "json"})
+
+    def test_events(self):
+        # The test client is not ASGI, so streams answer 204 straight away.
+        self.assertEqual(self.fetch("events", ["animals"]).status_code, 204)
+        self.assertEqual(self.fetch("events", ["requests"], "adopter").status_code, 403)
+
+    def test_api_animals(self):
+        self.fetch("api_animals")
+        self.fetch("api_animals", data={"type": "cat", "status": AnimalStatus.AVAILABLE})
+
+    def test_api_animal(self):
+        self.fetch("api_animal", [self.animals[4].pk])
+        self.fetch_json("api_animal", [self.animals[4].pk], "staff", "patch", {"age": 7})
+
+    def test_api_animal_requests(self):
+        response = self.fetch_json("api_animal_requests", [self.free.pk], "adopter", payload={"message": "Hello"})
+        self.assertEqual(response.status_code, 201)
+
+    def test_api_requests(self):
+        self.fetch("api_requests", role="adopter")
+        self.fetch("api_requests", role="staff", data={"status": RequestStatus.PENDING})
+
+    def test_api_request(self):
+        self.fetch("api_request", [self.request.pk], "adopter")
+
+    def test_api_request_actions(self):
+        pending = AdoptionRequest.objects.filter(animal__in=self.animals[1:6]).values_list("pk", flat=True)
+        payload = {"actions": [{"id": pk, "action": "reject"} for pk in pending]}
+        self.assertEqual(self.fetch_json("api_request_actions", role="staff", payload=payload).status_code, 200)
@@ -0,0 +1,85 @@
+"""Token buckets refuse once empty and refill; a repeated request form post is not a second request."""
+
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from core.models import AdoptionRequest, Animal, AnimalStatus
+from core.ratelimit import CacheTokenBucket, Rate
+
+from .utils import STORAGES, submit
+
+
+class CacheTokenBucketTests(SimpleTestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.bucket = CacheTokenBucket()
+        self.rate = Rate.parse("2/10s")
+        clock = mock.patch("core.ratelimit.time.time", return_value=1000.0)
+        self.now = clock.start()
+        self.addCleanup(clock.stop)
+
+    def test_empty_bucket_waits_then_refills(self):
+        self.assertEqual(self.bucket.consume("k", self.rate), 0)
+        self.assertEqual(self.bucket.consume("k", self.rate), 0)
+        self.assertAlmostEqual(self.bucket.consume("k", self.rate), 5.0)
+
+        self.now.return_value += 4
+        self.assertGreater(self.bucket.consume("k", self.rate), 0)
+        self.now.return_value += 1
+        self.assertEqual(self.bucket.consume("k", self.rate), 0)
+
+        self.now.return_value += 60  # never above capacity
+        self.assertEqual(self.bucket.consume("k", self.rate), 0)
+        self.assertEqual(self.bucket.consume("k", self.rate), 0)
+        self.assertGreater(self.bucket.consume("k", self.rate), 0)
+
+    def test_keys_have_their_own_buckets(self):
+        self.bucket.consume("k", self.rate)
+        self.bucket.consume("k", self.rate)
+        self.assertEqual(self.bucket.consume("other", self.rate), 0)
+
+
+@override_settings(STORAGES=STORAGES)
+class RequestCreateTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        cls.adopter = User.objects.create_user("adopter", password="pw")
+        cls.animals = [Animal.objects.create(name=f"Pet {n}", type="Dog", age=2, created_by=staff) for n in range(3)]
+
+    def setUp(self):
+        caches["default"].clear()
+        self.client.force_login(self.adopter)
+
+    def post(self, animal):
+        return self.client.post(reverse("core:request_create", args=[animal.pk]), {"message": "Hello"})
+
+    def test_double_submit_returns_the_existing_request(self):
+        first, created = submit(self.adopter, self.animals[0], "Hello")
+        self.assertTrue(created)
+        again, created = submit(self.adopter, self.animals[0], "Hello again")
+        self.assertFalse(created)
+        self.assertEqual(again.pk, first.pk)
+        self.assertEqual(again.message, "Hello")
+
+    def test_double_post_keeps_one_request(self):
+        self.assertRedirects(self.post(self.animals[0]), reverse("core:my_requests"))
+        response = self.post(self.animals[0])
+        self.assertRedirects(response, reverse("core:animal_detail", args=[self.animals[0].pk]))
+        self.assertEqual(AdoptionRequest.objects.filter(user=self.adopter).count(), 1)
+        self.assertEqual(Animal.objects.get(pk=self.animals[0].pk).status, AnimalStatus.PENDING)
+
+    @override_settings(RATE_LIMITS={"request_create": "2/m"})
+    def test_posts_past_the_rate_get_429(self):
+        self.post(self.animals[0])
+        self.post(self.animals[1])
+        response = self.post(self.animals[2])
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "30")
+        self.assertFalse(AdoptionRequest.objects.filter(animal=self.animals[2]).exists())
+        # Only posts are charged.
+        self.assertEqual(self.client.get(reverse("core:request_create", args=[self.animals[2].pk])).status_code, 200)
@@ -0,0 +1,90 @@
+"""``similarity.refresh`` agrees with a full ``rebuild`` and runs queued refreshes together."""
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from core import jobs, similarity
+from core.models import Animal, AnimalStatus, Job, JobStatus, SimilarAnimal
+
+WORDS = "playful calm gentle curious shy loyal fluffy energetic quiet cuddly smart brave".split()
+TYPES = ("Dog", "Cat", "Rabbit")
+
+
+def neighbour_lists() -> dict[int, list[tuple[int, float]]]:
+    lists: dict[int, list[tuple[int, float]]] = {}
+    for pk, other, score in SimilarAnimal.objects.order_by("animal_id", "rank").values_list(
+        "animal_id", "similar_id", "score"
+    ):
+        lists.setdefault(pk, []).append((other, score))
+    return lists
+
+
+class RefreshTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        cls.animals = Animal.objects.bulk_create(
+            [
+                Animal(
+                    name=f"Pet {n}",
+                    type=TYPES[n % 3],
+                    age=n % 9,
+                    description=" ".join(WORDS[(n * k) % len(WORDS)] for k in (1, 2, 5)),
+                    status=AnimalStatus.ADOPTED if n % 7 == 0 else AnimalStatus.AVAILABLE,
+                    created_by=staff,
+                )
+                for n in range(40)
+            ]
+        )
+        similarity.rebuild()
+
+    def assertMatchesRebuild(self):
+        refreshed = neighbour_lists()
+        similarity.rebuild()
+        rebuilt = neighbour_lists()
+        self.assertEqual(refreshed.keys(), rebuilt.keys())
+        for pk, rows in rebuilt.items():
+            self.assertEqual([other for other, _ in refreshed[pk]], [other for other, _ in rows], pk)
+            for (_, got), (_, expected) in zip(refreshed[pk], rows):
+                self.assertAlmostEqual(got, expected)
+
+    # The edits below keep every term's document frequency, so the stored ones are still exact.
+    def test_adoption(self):
+        pet = self.animals[3]
+        Animal.objects.filter(pk=pet.pk).update(status=AnimalStatus.ADOPTED)
+        similarity.refresh([pet.pk])
+        self.assertFalse(SimilarAnimal.objects.filter(similar=pet).exists())
+        self.assertMatchesRebuild()
+
+    def test_un_adoption(self):
+        pet = self.animals[14]
+        Animal.objects.filter(pk=pet.pk).update(status=AnimalStatus.AVAILABLE)
+        similarity.refresh([pet.pk])
+        self.assertMatchesRebuild()
+
+    def test_repeated_words(self):
+        pet = self.animals[5]
+        Animal.objects.filter(pk=pet.pk).update(description=f"{pet.description} {pet.description}")
+        similarity.refresh([pet.pk])
+        self.assertMatchesRebuild()
+
+    def test_swapped_descriptions(self):
+        first, second = self.animals[1], self.animals[22]
+        Animal.objects.filter(pk=first.pk).update(description=second.description)
+        Animal.objects.filter(pk=second.pk).update(description=first.description)
+        similarity.refresh([first.pk, second.pk])
+        self.assertMatchesRebuild()
+
+    def test_queued_refreshes_run_together(self):
+        first, second = self.animals[1], self.animals[22]
+        Animal.objects.filter(pk=first.pk).update(description=second.description)
+        Animal.objects.filter(pk=second.pk).update(description=first.description)
+        running = jobs.enqueue("similar.refresh", animal_ids=[first.pk])
+        queued = jobs.enqueue("similar.refresh", animal_ids=[second.pk])
+        jobs.claim(1)
+
+        self.assertEqual(jobs.execute(running.pk), JobStatus.DONE)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, JobStatus.DONE)
+        self.assertFalse(Job.objects.filter(status=JobStatus.QUEUED).exists())
+        self.assertMatchesRebuild()
@@ -0,0 +1,96 @@
+"""``import_animals`` keeps facets and background jobs in step, and inserts only valid rows."""
+
+import io
+import shutil
+import tempfile
+import zipfile
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from core import jobs
+from core.models import Animal, AnimalStatus, Job, JobStatus
+from core.transfer import ImageSource, import_animals, read_rows
+
+from .utils import counted_facets, stored_facets
+
+ROWS = b"""name,type,age,description,status,image
+Rex,Dog,3,A playful dog,,rex.png
+Tom,  cat ,2,A calm cat,,
+,Dog,4,No name,,
+Bun,Rabbit,old,Hops,,
+Max,Dog,5,Lost photo,,max.png
+Lady,Dog,7,A gentle dog,Adopted,
+"""
+
+
+def photo_archive() -> io.BytesIO:
+    image = io.BytesIO()
+    Image.new("RGB", (64, 48), "orange").save(image, "PNG")
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("rex.png", image.getvalue())
+    archive.seek(0)
+    return archive
+
+
+class ImportAnimalsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_user("staff", password="pw", is_staff=True)
+        Animal.objects.create(name="Old", type="Dog", age=1, created_by=cls.staff)
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+        Job.objects.all().delete()
+
+    def run_import(self, **kwargs):
+        images = ImageSource(photo_archive())
+        self.addCleanup(images.close)
+        return import_animals(read_rows(io.BytesIO(ROWS), "csv"), self.staff, images, chunk_size=2, **kwargs)
+
+    def test_invalid_rows_are_reported_and_not_inserted(self):
+        result = self.run_import()
+
+        self.assertEqual(result.created, 3)
+        self.assertEqual([line for line, _ in result.errors], [4, 5, 6])
+        self.assertIn("name:", result.errors[0][1])
+        self.assertIn("age:", result.errors[1][1])
+        self.assertEqual(result.errors[2][1], "image: max.png was not found.")
+        self.assertEqual(
+            sorted(Animal.objects.values_list("name", "type", "status")),
+            [
+                ("Lady", "Dog", AnimalStatus.ADOPTED),
+                ("Old", "Dog", AnimalStatus.AVAILABLE),
+                ("Rex", "Dog", AnimalStatus.AVAILABLE),
+                ("Tom", "cat", AnimalStatus.AVAILABLE),
+            ],
+        )
+
+    def test_facets_follow_the_import(self):
+        self.run_import()
+        self.assertEqual(stored_facets(), counted_facets())
+        self.assertEqual(stored_facets(), {"dog": (2, 0, 1), "cat": (1, 0, 0)})
+
+    def test_jobs_are_queued_for_the_created_animals(self):
+        self.run_import()
+        created = set(Animal.objects.exclude(name="Old").values_list("pk", flat=True))
+        rex = Animal.objects.get(name="Rex")
+
+        variants = Job.objects.get(task="images.refresh_variants")
+        self.assertEqual(variants.payload, {"animal_id": rex.pk, "source": rex.image.name})
+        refreshed = Job.objects.filter(task="similar.refresh").values_list("payload", flat=True)
+        self.assertEqual({pk for payload in refreshed for pk in payload["animal_ids"]}, created)
+
+        self.assertEqual(jobs.execute(variants.pk), JobStatus.DONE)
+        rex.refresh_from_db()
+        self.assertTrue(rex.image_variants)
+
+    def test_dry_run_writes_nothing(self):
+        result = self.run_import(dry_run=True)
+        self.assertEqual((result.created, len(result.errors)), (3, 3))
+        self.assertEqual(Animal.objects.count(), 1)
+        self.assertFalse(Job.objects.exists())
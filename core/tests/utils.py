@@ -0,0 +1,38 @@
+"""Shared fixtures and recounts for the core tests."""
+
+from django.conf import settings
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+from core import facets
+from core.adoptions import submit_request
+from core.forms import AdoptionRequestForm
+from core.models import Animal, AnimalTypeFacet
+
+# For override_settings on tests that render pages: the manifest storage needs collectstatic, which test runs skip.
+STORAGES = {**settings.STORAGES, "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"}}
+
+
+def submit(user, animal, message: str = ""):
+    """Ask to adopt ``animal`` the way the request form does; returns (request, created)."""
+    form = AdoptionRequestForm(data={"message": message})
+    assert form.is_valid(), form.errors
+    return submit_request(form, user, animal)
+
+
+def stored_facets() -> dict:
+    """``AnimalTypeFacet`` counters as (available, pending, adopted) per key, empty facets left out."""
+    return {
+        facet.key: (facet.available_count, facet.pending_count, facet.adopted_count)
+        for facet in AnimalTypeFacet.objects.all()
+        if facet.total
+    }
+
+
+def counted_facets() -> dict:
+    """What :func:`stored_facets` should say, counted from the Animal table."""
+    counts: dict[str, list[int]] = {}
+    for row in Animal.objects.annotate(key=Lower("type")).values("key", "status").annotate(n=Count("pk")).order_by():
+        column = list(facets.STATUS_COLUMNS).index(row["status"])
+        counts.setdefault(row["key"], [0, 0, 0])[column] = row["n"]
+    return {key: tuple(values) for key, values in counts.items()}
@@ -0,0 +1,235 @@
+"""Bulk import and streaming export of animals for shelter partners.
+
+Imports read CSV or JSON Lines one row at a time, validate each row with
+``AnimalForm`` (the same rules as the add-animal page) and insert the valid
+ones with ``bulk_create`` in chunks, one transaction per chunk. Photos named
+in the ``image`` column come from a zip archive or a directory and are stored
+as each row is validated, so a chunk never holds more than one photo in memory.
+
+Exports iterate a ``values_list`` queryset in chunks and yield encoded lines,
+so neither side ever loads a whole table.
+"""
+
+import codecs
+import csv
+import json
+import zipfile
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import AsyncIterator, Iterable, Iterator
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.utils._os import safe_join
+
+from . import facets
+from .caching import invalidate_catalog
+from .constants import IMPORT_FORMATS
+from .forms import AnimalForm
+from .jobs import enqueue_many
+from .models import AdoptionRequest, Animal, AnimalStatus
+
+IMPORT_CHUNK_SIZE = 500
+EXPORT_CHUNK_SIZE = 2000
+
+# Export name -> (queryset, [(column, lookup), ...]).
+EXPORTS = {
+    "animals": (
+        lambda: Animal.objects.order_by("pk"),
+        [
+            ("id", "pk"),
+            ("name", "name"),
+            ("type", "type"),
+            ("age", "age"),
+            ("description", "description"),
+            ("status", "status"),
+            ("image", "image"),
+            ("created_by", "created_by__username"),
+            ("created_at", "created_at"),
+            ("pending_requests", "pending_requests"),
+            ("approved_requests", "approved_requests"),
+            ("rejected_requests", "rejected_requests"),
+        ],
+    ),
+    "requests": (
+        lambda: AdoptionRequest.objects.order_by("pk"),
+        [
+            ("id", "pk"),
+            ("animal_id", "animal_id"),
+            ("animal", "animal__name"),
+            ("user", "user__username"),
+            ("status", "status"),
+            ("message", "message"),
+            ("created_at", "created_at"),
+            ("updated_at", "updated_at"),
+        ],
+    ),
+}
+
+
+class UnsupportedFormat(ValueError):
+    pass
+
+
+def format_for(filename: str) -> str:
+    try:
+        return IMPORT_FORMATS[PurePosixPath(filename).suffix.lower()]
+    except KeyError:
+        raise UnsupportedFormat(f"{filename}: expected a .csv or .jsonl file.")
+
+
+def read_rows(stream: Iterable[bytes], fmt: str) -> Iterator[tuple[int, dict | None]]:
+    """(line number, row) pairs from a binary CSV or JSON Lines stream; ``None`` for unreadable lines."""
+    lines = codecs.iterdecode(stream, "utf-8-sig")
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row if isinstance(row, dict) else None
+
+
+class ImageSource:
+    """Photos referenced by the ``image`` column, from a zip archive or a directory."""
+
+    def __init__(self, source):
+        if isinstance(source, (str, Path)) and Path(source).is_dir():
+            self.root, self.archive = Path(source), None
+        else:
+            self.root, self.archive = None, zipfile.ZipFile(source)
+
+    def get(self, name: str) -> ContentFile | None:
+        name = name.strip().lstrip("/")
+        if self.archive is not None:
+            try:
+                return ContentFile(self.archive.read(name), name=PurePosixPath(name).name)
+            except KeyError:
+                return None
+        try:
+            path = Path(safe_join(self.root, name))
+        except SuspiciousFileOperation:
+            return None
+        return ContentFile(path.read_bytes(), name=path.name) if path.is_file() else None
+
+    def close(self) -> None:
+        if self.archive is not None:
+            self.archive.close()
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list)
+    dry_run: bool = False
+
+
+def _form_errors(form) -> str:
+    return "; ".join(f"{name}: {' '.join(messages)}" for name, messages in form.errors.items())
+
+
+def _insert(animals: list[Animal]) -> list[Animal]:
+    with transaction.atomic():
+        created = Animal.objects.bulk_create(animals)
+        # bulk_create skips the save signals that keep facets, cached pages, variants and similar pets current.
+        for (type_value, status), count in Counter((animal.type, animal.status) for animal in created).items():
+            facets.move(None, (type_value, status), count)
+        photos = [{"animal_id": animal.pk, "source": animal.image.name} for animal in created if animal.image]
+        if photos:
+            enqueue_many("images.refresh_variants", photos)
+        enqueue_many("similar.refresh", [{"animal_ids": [animal.pk for animal in created]}])
+        transaction.on_commit(invalidate_catalog)
+    return created
+
+
+def import_animals(
+    rows: Iterable[tuple[int, dict | None]],
+    user,
+    images: ImageSource | None = None,
+    *,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    dry_run: bool = False,
+) -> ImportResult:
+    """Validate ``rows`` (from :func:`read_rows`) with ``AnimalForm`` and create the valid ones."""
+    result = ImportResult(dry_run=dry_run)
+    image_field = Animal._meta.get_field("image")
+    chunk: list[Animal] = []
+    for line, row in rows:
+        if row is None:
+            result.errors.append((line, "not a JSON object"))
+            continue
+        data = {key: "" if value is None else str(value).strip() for key, value in row.items() if key}
+        data["status"] = data.get("status") or AnimalStatus.AVAILABLE
+        files = {}
+        if data.get("image"):
+            photo = images.get(data["image"]) if images else None
+            if photo is None:
+                result.errors.append((line, f"image: {data['image']} was not found."))
+                continue
+            files["image"] = photo
+        form = AnimalForm(data, files)
+        if not form.is_valid():
+            result.errors.append((line, _form_errors(form)))
+            continue
+        if dry_run:
+            result.created += 1
+            continue
+        animal = form.save(commit=False)
+        animal.created_by = user
+        if files:
+            # Store the photo now (content-addressed, so a failed chunk leaves nothing harmful behind).
+            image_field.pre_save(animal, add=True)
+        chunk.append(animal)
+        if len(chunk) >= chunk_size:
+            result.created += len(_insert(chunk))
+            chunk = []
+    if chunk:
+        result.created += len(_insert(chunk))
+    return result
+
+
+class _Echo:
+    """File-like object whose ``write`` returns what it was given, for ``csv.writer``."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _export(kind: str, fmt: str):
+    queryset, columns = EXPORTS[kind]
+    headers = [column for column, _ in columns]
+    queryset = queryset().values_list(*[lookup for _, lookup in columns])
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        return queryset, writer.writerow(headers), writer.writerow
+    return queryset, "", lambda row: json.dumps(dict(zip(headers, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+def export_lines(kind: str, fmt: str) -> Iterator[str]:
+    """Encoded export of ``kind`` ("animals" or "requests"), yielded a chunk of rows at a time."""
+    queryset, header, encode = _export(kind, fmt)
+    lines = [header]
+    for row in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        lines.append(encode(row))
+        if len(lines) >= EXPORT_CHUNK_SIZE:
+            yield "".join(lines)
+            lines = []
+    yield "".join(lines)
+
+
+async def aexport_lines(kind: str, fmt: str) -> AsyncIterator[str]:
+    """:func:`export_lines` for ASGI: each chunk is fetched and encoded in the sync thread."""
+    lines = export_lines(kind, fmt)
+    next_chunk = sync_to_async(next)
+    while (chunk := await next_chunk(lines, None)) is not None:
+        yield chunk
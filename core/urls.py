@@ -1,10 +1,11 @@
 from django.urls import path
-from . import views
+from . import api, events, views
 
 app_name = "core"
 
 urlpatterns = [
     path("", views.home, name="home"),
+    path("search/", views.animal_search, name="animal_search"),
     path("login/", views.CozyLoginView.as_view(), name="login"),
     path("logout/", views.cozy_logout, name="logout"),
     path("signup/", views.signup, name="signup"),
@@ -15,5 +16,15 @@ urlpatterns = [
     path("adopt/<int:animal_id>/", views.request_create, name="request_create"),
     path("my-requests/", views.my_requests, name="my_requests"),
     path("manage/animals/", views.animal_manage_list, name="animal_manage_list"),
+    path("manage/animals/import/", views.animal_import, name="animal_import"),
+    path("manage/export/<slug:kind>.<slug:fmt>", views.export, name="export"),
     path("manage/requests/", views.manage_requests, name="manage_requests"),
+    path("manage/stats/", views.view_stats, name="view_stats"),
+    path("events/<slug:topic>/", events.stream, name="events"),
+    path("api/animals/", api.animals, name="api_animals"),
+    path("api/animals/<int:pk>/", api.animal, name="api_animal"),
+    path("api/animals/<int:pk>/requests/", api.animal_requests, name="api_animal_requests"),
+    path("api/requests/", api.requests, name="api_requests"),
+    path("api/requests/actions/", api.request_actions, name="api_request_actions"),
+    path("api/requests/<int:pk>/", api.request_detail, name="api_request"),
 ]
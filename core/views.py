@@ -1,62 +1,194 @@
+from asgiref.sync import sync_to_async
 from django.contrib import messages
 from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.views import LoginView
-from django.db.models import BooleanField, Case, CharField, Exists, IntegerField, OuterRef, Subquery, Value, When
-from django.http import HttpRequest, HttpResponse
-from django.shortcuts import get_object_or_404, redirect, render
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce, Lower
+from django.http import Http404, HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.shortcuts import aget_object_or_404, get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import json_script
+from django.utils.http import urlencode
+from django.utils.decorators import method_decorator
+from django.utils.safestring import mark_safe
+
+from . import facets, instrumentation, transfer
+from .adoptions import COUNTER_FIELDS, apply_actions, can_manage_animal, request_block_reason, submit_request
+from .caching import catalog_key
+from .constants import (
+    CATALOG_CACHE_TIMEOUT,
+    CATALOG_PAGE_SIZE,
+    DASHBOARD_PAGE_SIZE,
+    HISTORY_LIMIT,
+    SEARCH_RESULT_LIMIT,
+    SIMILAR_SHOWN,
+    SKIPPED_SHOWN,
+)
+from .forms import AdoptionRequestForm, AnimalForm, AnimalImportForm, SignUpForm
+from .instrumentation import query_budget
+from .jobs import enqueue
+from .models import (
+    AdoptionRequest,
+    Animal,
+    AnimalStatus,
+    AnimalTypeFacet,
+    ArchivedAdoptionRequest,
+    ArchivedAnimal,
+    RequestStatus,
+    RequestTransition,
+    SimilarAnimal,
+)
+from .pagination import InvalidCursor, KeysetPage, KeysetPaginator
+from .ratelimit import rate_limit
+from .routing import primary, primary_only
+from .search import search_animals
+
+
+# Templates may touch the session or lazy relations, so async views render in the sync thread.
+_render = sync_to_async(render)
+_render_to_string = sync_to_async(render_to_string)
+
+
+def _pager_params(**filters) -> str:
+    query = urlencode({key: value for key, value in filters.items() if value})
+    return f"{query}&" if query else ""
+
+
+def _keyset_page(paginator: KeysetPaginator, request: HttpRequest) -> KeysetPage:
+    try:
+        return paginator.page(after=request.GET.get("after"), before=request.GET.get("before"))
+    except InvalidCursor:
+        return paginator.page()
+
+
+def _catalog_fragment(type_key: str, cursor: dict, query: str = "") -> dict:
+    """Rendered catalog grid for one (type filter, page or search), shared by every visitor.
+
+    Cached under the catalog version so any Animal/AdoptionRequest write orphans it.
+    """
+    key = catalog_key("grid", type_key, sorted(cursor.items()), query)
+    fragment = cache.get(key)
+    if fragment is not None:
+        return fragment
+
+    # A lagging replica must not fill the shared cache with rows from before the write that bumped it.
+    with primary():
+        animals = Animal.objects.select_related("created_by")
+        if type_key:
+            animals = animals.alias(type_key=Lower("type")).filter(type_key=type_key)
+        if query:
+            page = KeysetPage(items=search_animals(animals, query, SEARCH_RESULT_LIMIT))
+        else:
+            page = KeysetPaginator(animals, Animal.CATALOG_ORDERING, per_page=CATALOG_PAGE_SIZE).page(**cursor)
+        html = render_to_string(
+            "animals/_catalog.html", {"animals": page, "page": page, "pager_params": _pager_params(type=type_key)}
+        )
+    fragment = {"html": html, "ids": [animal.pk for animal in page]}
+    cache.set(key, fragment, CATALOG_CACHE_TIMEOUT)
+    return fragment
 
-from .forms import AdoptionRequestForm, AnimalForm, SignUpForm
-from .models import AdoptionRequest, Animal, AnimalStatus, RequestStatus
 
+async def _acatalog_fragment(type_key: str, cursor: dict, query: str = "") -> dict:
+    fragment = await cache.aget(catalog_key("grid", type_key, sorted(cursor.items()), query))
+    if fragment is not None:
+        return fragment
+    return await sync_to_async(_catalog_fragment)(type_key, cursor, query)
 
-def home(request: HttpRequest) -> HttpResponse:
-    """Homepage listing available animals with optional type filter."""
-    status_priority = Case(
-        When(status=AnimalStatus.AVAILABLE, then=0),
-        When(status=AnimalStatus.PENDING, then=1),
-        default=2,
-        output_field=IntegerField(),
-    )
-    animals = Animal.objects.all().annotate(status_priority=status_priority).order_by("status_priority", "-created_at")
-    requested_type = (request.GET.get("type") or "").strip()
-    normalized_requested_type = requested_type.lower()
-    if requested_type and normalized_requested_type != "all":
-        animals = animals.filter(type__iexact=requested_type)
 
-    if request.user.is_authenticated:
-        user_requests = AdoptionRequest.objects.filter(user=request.user, animal=OuterRef("pk"))
-        animals = animals.annotate(
-            has_requested=Exists(user_requests),
-            request_status=Subquery(user_requests.values("status")[:1]),
-        )
-    else:
-        animals = animals.annotate(
-            has_requested=Value(False, output_field=BooleanField()),
-            request_status=Value("", output_field=CharField(max_length=10)),
-        )
+async def _type_facets() -> list[AnimalTypeFacet]:
+    key = catalog_key("types")
+    type_facets = await cache.aget(key)
+    if type_facets is None:
+        with primary():
+            type_facets = [facet async for facet in facets.visible_facets()]
+        await cache.aset(key, type_facets, CATALOG_CACHE_TIMEOUT)
+    return type_facets
 
-    animals = animals.order_by("status_priority", "-created_at").select_related("created_by")
 
-    request_form = AdoptionRequestForm()
+# Stands in for the catalog grid while the rest of the page is rendered; see ``home``.
+CATALOG_SLOT = "<!--catalog-slot-->"
+# What the "you might also like" cards on the animal page show.
+SIMILAR_CARD_FIELDS = ("id", "name", "type", "age", "status", "image", "image_variants")
 
-    available_types = list(
-        Animal.objects.order_by("type").values_list("type", flat=True).distinct()
-    )
-    type_options = ["all", *[t for t in available_types if t]]
-    if requested_type and normalized_requested_type != "all" and requested_type not in type_options:
-        type_options.append(requested_type)
 
-    context = {
-        "animals": animals,
-        "filter_type": "all" if not requested_type or normalized_requested_type == "all" else requested_type,
-        "type_options": type_options,
-        "request_form": request_form,
-    }
-    return render(request, "animals/list.html", context)
+@query_budget(8)
+async def home(request: HttpRequest) -> HttpResponse:
+    """Homepage listing available animals with optional type filter.
+
+    The page shell (header, filters, modal) is rendered and flushed first; the
+    grid follows once it has been fetched from the cache or built.
+    """
+    requested_type = facets.clean_type(request.GET.get("type"))
+    type_key = facets.type_key(requested_type)
+    if type_key == "all":
+        type_key = ""
 
+    cursor = next(({d: request.GET[d]} for d in ("after", "before") if request.GET.get(d)), {})
+    if cursor and not KeysetPaginator(Animal.objects.all(), Animal.CATALOG_ORDERING).is_valid(*cursor.values()):
+        cursor = {}
+    query = " ".join((request.GET.get("q") or "").split())[:100]
+    user = await request.auser()
 
+    type_facets = await _type_facets()
+    active_facet = next((facet for facet in type_facets if facet.key == type_key), None)
+
+    context = {
+        "catalog_slot": mark_safe(CATALOG_SLOT),
+        "filter_type": type_key or "all",
+        "query": query,
+        "filter_label": active_facet.label if active_facet else requested_type if type_key else "",
+        "type_facets": type_facets,
+        "unknown_type": bool(type_key) and active_facet is None,
+        "request_form": AdoptionRequestForm(),
+    }
+    head, tail = (await _render_to_string("animals/list.html", context, request)).split(CATALOG_SLOT)
+
+    async def stream():
+        yield head
+        catalog = await _acatalog_fragment(type_key, {} if query else cursor, query)
+        # The grid is shared; the viewer's own request badges are overlaid client-side.
+        request_statuses = {}
+        if user.is_authenticated and catalog["ids"]:
+            request_statuses = {
+                animal_id: status
+                async for animal_id, status in AdoptionRequest.objects.filter(
+                    user=user, animal_id__in=catalog["ids"]
+                ).values_list("animal_id", "status")
+            }
+        yield catalog["html"] + json_script(request_statuses, "request-statuses")
+        yield tail
+
+    if not isinstance(request, ASGIRequest):
+        # WSGI servers can only drain an async iterator by buffering it anyway.
+        return HttpResponse("".join([chunk async for chunk in stream()]))
+    return StreamingHttpResponse(stream(), content_type="text/html; charset=utf-8")
+
+
+@query_budget(2)
+def animal_search(request: HttpRequest) -> JsonResponse:
+    """Top matches for ``?q=`` as JSON, for search-as-you-type."""
+    query = " ".join((request.GET.get("q") or "").split())[:100]
+    animals = search_animals(Animal.objects.only("pk", "name", "type", "status"), query, 10)
+    results = [
+        {
+            "id": animal.pk,
+            "name": animal.name,
+            "type": animal.type,
+            "status": animal.status,
+            "url": reverse("core:animal_detail", args=[animal.pk]),
+        }
+        for animal in animals
+    ]
+    return JsonResponse({"query": query, "results": results})
+
+
+@query_budget(8)
+@rate_limit("signup")
 def signup(request: HttpRequest) -> HttpResponse:
     if request.user.is_authenticated:
         return redirect("core:home")
@@ -75,6 +207,8 @@ def signup(request: HttpRequest) -> HttpResponse:
     return render(request, "registration/signup.html", {"form": form})
 
 
+@query_budget(10)
+@method_decorator(rate_limit("login", keys=("ip", "username")), name="dispatch")
 class CozyLoginView(LoginView):
     template_name = "registration/login.html"
 
@@ -83,43 +217,97 @@ class CozyLoginView(LoginView):
         return super().form_valid(form)
 
 
+@query_budget(5)
 def cozy_logout(request: HttpRequest) -> HttpResponse:
     logout(request)
     messages.success(request, "You are logged out. See you soon!")
     return render(request, "registration/logged_out.html") 
 
 
-def _can_manage_animal(animal: Animal, user) -> bool:
-    return user.is_authenticated and (user.is_staff or animal.created_by_id == user.id)
-
-
-def animal_detail(request: HttpRequest, pk: int) -> HttpResponse:
-    animal = get_object_or_404(Animal, pk=pk)
+@query_budget(6)
+async def animal_detail(request: HttpRequest, pk: int) -> HttpResponse:
+    animal = await Animal.objects.filter(pk=pk).afirst()
+    # Adoptions moved out by core.archive keep their page, read-only.
+    archived = animal is None
+    if archived:
+        animal = await aget_object_or_404(ArchivedAnimal, pk=pk)
     confirm_delete = request.GET.get("confirm") == "1"
+    user = await request.auser()
 
     existing_request = None
-    if request.user.is_authenticated:
-        existing_request = AdoptionRequest.objects.filter(user=request.user, animal=animal).first()
+    history = []
+    if user.is_staff:
+        history = [
+            transition
+            async for transition in RequestTransition.objects.filter(animal_id=animal.pk).select_related(
+                "actor", "request__user"
+            )[:HISTORY_LIMIT]
+        ]
+    elif user.is_authenticated:
+        requests = (
+            ArchivedAdoptionRequest.objects.filter(user=user, animal_id=animal.pk)
+            if archived
+            else AdoptionRequest.objects.filter(user=user, animal=animal)
+        )
+        existing_request = await requests.afirst()
+    similar = []
+    if not archived:
+        # Precomputed by core.similarity; an animal adopted since then is skipped here rather than waiting for a refresh.
+        similar = [
+            row.similar
+            async for row in SimilarAnimal.objects.filter(animal_id=animal.pk)
+            .exclude(similar__status=AnimalStatus.ADOPTED)
+            .select_related("similar")
+            .only(*(f"similar__{name}" for name in SIMILAR_CARD_FIELDS))[:SIMILAR_SHOWN]
+        ]
 
     context = {
         "animal": animal,
         "confirm_delete": confirm_delete,
         "existing_request": existing_request,
-        "can_manage": _can_manage_animal(animal, request.user),
+        "can_manage": not archived and can_manage_animal(animal, user),
+        "archived": archived,
+        "history": history,
+        "similar": similar,
     }
-    return render(request, "animals/detail.html", context)
+    return await _render(request, "animals/detail.html", context)
 
 
+@query_budget(6)
 @login_required
 def animal_manage_list(request: HttpRequest) -> HttpResponse:
     if not request.user.is_staff:
         messages.error(request, "Only staff members can manage animals.")
         return redirect("core:home")
 
-    animals = Animal.objects.select_related("created_by").order_by("-created_at")
-    return render(request, "animals/manage_list.html", {"animals": animals})
+    status_filter = request.GET.get("status") if request.GET.get("status") in AnimalStatus.values else ""
+    animals = Animal.objects.select_related("created_by")
+    if status_filter:
+        # status_rank mirrors status and leads the catalog index, which also serves this ordering.
+        animals = animals.filter(status_rank=Animal.STATUS_RANKS[status_filter])
+    paginator = KeysetPaginator(animals, ("-created_at", "-id"), per_page=DASHBOARD_PAGE_SIZE)
+    page = _keyset_page(paginator, request)
+
+    totals = facets.visible_facets().aggregate(
+        available=Coalesce(Sum("available_count"), 0),
+        pending=Coalesce(Sum("pending_count"), 0),
+        adopted=Coalesce(Sum("adopted_count"), 0),
+    )
+    status_counts = [(status, totals[status.lower()]) for status in AnimalStatus.values]
 
+    context = {
+        "animals": page,
+        "page": page,
+        "status_filter": status_filter,
+        "status_counts": status_counts,
+        "total_count": sum(totals.values()),
+        "pager_params": _pager_params(status=status_filter),
+    }
+    return render(request, "animals/manage_list.html", context)
 
+
+@primary_only
+@query_budget(8)
 @login_required
 def animal_create(request: HttpRequest) -> HttpResponse:
     if not request.user.is_staff:
@@ -132,6 +320,8 @@ def animal_create(request: HttpRequest) -> HttpResponse:
             animal = form.save(commit=False)
             animal.created_by = request.user
             animal.save()
+            if animal.image:
+                enqueue("images.refresh_variants", animal_id=animal.pk, source=animal.image.name)
             messages.success(request, f"{animal.name} added successfully.")
             return redirect("core:animal_detail", pk=animal.pk)
     else:
@@ -140,10 +330,64 @@ def animal_create(request: HttpRequest) -> HttpResponse:
     return render(request, "animals/form.html", {"form": form, "mode": "add"})
 
 
+@primary_only
+@login_required
+def animal_import(request: HttpRequest) -> HttpResponse:
+    if not request.user.is_staff:
+        messages.error(request, "Only staff members can import animals.")
+        return redirect("core:home")
+
+    result = None
+    if request.method == "POST":
+        form = AnimalImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            rows = form.cleaned_data["rows"]
+            images = transfer.ImageSource(form.cleaned_data["images"]) if form.cleaned_data["images"] else None
+            try:
+                result = transfer.import_animals(
+                    transfer.read_rows(rows, transfer.format_for(rows.name)),
+                    request.user,
+                    images,
+                    dry_run=form.cleaned_data["dry_run"],
+                )
+            finally:
+                if images is not None:
+                    images.close()
+            if result.created and not result.dry_run:
+                messages.success(request, f"Imported {result.created} animal(s).")
+    else:
+        form = AnimalImportForm()
+
+    return render(request, "animals/import.html", {"form": form, "result": result})
+
+
+@query_budget(3)
+@login_required
+async def export(request: HttpRequest, kind: str, fmt: str) -> HttpResponse:
+    """Stream every animal or adoption request as CSV or JSON Lines."""
+    user = await request.auser()
+    if not user.is_staff:
+        messages.error(request, "Only staff members can export data.")
+        return redirect("core:home")
+    if kind not in transfer.EXPORTS or fmt not in ("csv", "jsonl"):
+        raise Http404("Unknown export.")
+
+    if isinstance(request, ASGIRequest):
+        lines = transfer.aexport_lines(kind, fmt)
+    else:
+        # WSGI servers drain a sync iterator chunk by chunk as well.
+        lines = transfer.export_lines(kind, fmt)
+    content_type = "text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson"
+    response = StreamingHttpResponse(lines, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{kind}-{timezone.now():%Y%m%d}.{fmt}"'
+    return response
+
+
+@query_budget(10)
 @login_required
 def animal_update(request: HttpRequest, pk: int) -> HttpResponse:
     animal = get_object_or_404(Animal, pk=pk)
-    if not _can_manage_animal(animal, request.user):
+    if not can_manage_animal(animal, request.user):
         messages.error(request, "You do not have permission to edit this animal.")
         return redirect("core:animal_detail", pk=pk)
 
@@ -151,6 +395,8 @@ def animal_update(request: HttpRequest, pk: int) -> HttpResponse:
         form = AnimalForm(request.POST, request.FILES, instance=animal)
         if form.is_valid():
             form.save()
+            if "image" in form.changed_data:
+                enqueue("images.refresh_variants", animal_id=animal.pk, source=animal.image.name or "")
             messages.success(request, f"{animal.name} updated successfully.")
             return redirect("core:animal_detail", pk=pk)
     else:
@@ -159,10 +405,11 @@ def animal_update(request: HttpRequest, pk: int) -> HttpResponse:
     return render(request, "animals/form.html", {"form": form, "mode": "edit", "animal": animal})
 
 
+@query_budget(11)
 @login_required
 def animal_delete(request: HttpRequest, pk: int) -> HttpResponse:
     animal = get_object_or_404(Animal, pk=pk)
-    if not _can_manage_animal(animal, request.user):
+    if not can_manage_animal(animal, request.user):
         messages.error(request, "You do not have permission to delete this animal.")
         return redirect("core:animal_detail", pk=pk)
 
@@ -176,39 +423,30 @@ def animal_delete(request: HttpRequest, pk: int) -> HttpResponse:
     return redirect(url)
 
 
+@primary_only
+@query_budget(15)
 @login_required
+@rate_limit("request_create", keys=("ip", "user"))
 def request_create(request: HttpRequest, animal_id: int) -> HttpResponse:
     animal = get_object_or_404(Animal, pk=animal_id)
 
-    if request.user.is_staff:
-        messages.error(request, "Admins manage adoptions and cannot submit requests.")
-        return redirect("core:animal_detail", pk=animal.pk)
-
-    if animal.created_by_id == request.user.id:
-        messages.error(request, "You cannot request adoption for an animal you created.")
-        return redirect("core:animal_detail", pk=animal.pk)
-
-    if animal.status == AnimalStatus.ADOPTED:
-        messages.error(request, "This animal has already been adopted.")
-        return redirect("core:animal_detail", pk=animal.pk)
-
-    existing = AdoptionRequest.objects.filter(user=request.user, animal=animal).first()
-    if existing:
-        messages.info(request, "You already submitted a request for this animal.")
+    block_reason = request_block_reason(animal, request.user)
+    if block_reason:
+        messages.error(request, block_reason)
         return redirect("core:animal_detail", pk=animal.pk)
 
     if request.method == "POST":
         form = AdoptionRequestForm(request.POST)
         if form.is_valid():
-            adoption_request = form.save(commit=False)
-            adoption_request.user = request.user
-            adoption_request.animal = animal
-            adoption_request.save()
-            if animal.status == AnimalStatus.AVAILABLE:
-                animal.status = AnimalStatus.PENDING
-                animal.save(update_fields=["status"])
-            messages.success(request, "Adoption request submitted.")
-            return redirect("core:my_requests")
+            _, created = submit_request(form, request.user, animal)
+            if created:
+                messages.success(request, "Adoption request submitted.")
+                return redirect("core:my_requests")
+            messages.info(request, "You already submitted a request for this animal.")
+            return redirect("core:animal_detail", pk=animal.pk)
+    elif AdoptionRequest.objects.filter(user=request.user, animal=animal).exists():
+        messages.info(request, "You already submitted a request for this animal.")
+        return redirect("core:animal_detail", pk=animal.pk)
     else:
         form = AdoptionRequestForm()
 
@@ -219,75 +457,149 @@ def request_create(request: HttpRequest, animal_id: int) -> HttpResponse:
     )
 
 
+@query_budget(5)
 @login_required
-def my_requests(request: HttpRequest) -> HttpResponse:
-    if request.user.is_staff:
+async def my_requests(request: HttpRequest) -> HttpResponse:
+    user = await request.auser()
+    if user.is_staff:
         messages.info(request, "Use the request dashboard to manage adoptions.")
         return redirect("core:manage_requests")
 
-    pending_requests = (
-        AdoptionRequest.objects.filter(user=request.user)
-        .select_related("animal")
+    pending_requests = [
+        adoption_request
+        async for adoption_request in AdoptionRequest.objects.filter(user=user).select_related("animal")
+    ]
+    archived_requests = [
+        adoption_request async for adoption_request in ArchivedAdoptionRequest.objects.filter(user=user)[:HISTORY_LIMIT]
+    ]
+    return await _render(
+        request, "requests/list.html", {"requests": pending_requests, "archived_requests": archived_requests}
     )
-    return render(request, "requests/list.html", {"requests": pending_requests})
 
 
+@query_budget(30)
 @login_required
 def manage_requests(request: HttpRequest) -> HttpResponse:
     if not request.user.is_staff:
         messages.error(request, "Only admins can access the request manager.")
         return redirect("core:home")
 
-    requests_qs = (
-        AdoptionRequest.objects.select_related("animal", "user")
-        .order_by("-created_at")
-    )
-
     if request.method == "POST":
-        request_id = request.POST.get("request_id")
-        action = request.POST.get("action")
-        adoption_request = get_object_or_404(AdoptionRequest, pk=request_id)
-        animal = adoption_request.animal
-
-        if action == "approve":
-            adoption_request.status = RequestStatus.APPROVED
-            adoption_request.save(update_fields=["status"])
-            animal.status = AnimalStatus.ADOPTED
-            animal.save(update_fields=["status"])
-            AdoptionRequest.objects.filter(animal=animal).exclude(pk=adoption_request.pk).update(
-                status=RequestStatus.REJECTED
-            )
-            messages.success(request, f"{animal.name} marked as adopted.")
-        elif action == "reject":
-            adoption_request.status = RequestStatus.REJECTED
-            adoption_request.save(update_fields=["status"])
-            if not AdoptionRequest.objects.filter(animal=animal, status=RequestStatus.APPROVED).exclude(
-                pk=adoption_request.pk
-            ).exists():
-                if AdoptionRequest.objects.filter(animal=animal, status=RequestStatus.PENDING).exclude(
-                    pk=adoption_request.pk
-                ).exists():
-                    animal.status = AnimalStatus.PENDING
-                else:
-                    animal.status = AnimalStatus.AVAILABLE
-                animal.save(update_fields=["status"])
-            messages.info(request, f"Request from {adoption_request.user.username} rejected.")
-        elif action == "reset":
-            adoption_request.status = RequestStatus.PENDING
-            adoption_request.save(update_fields=["status"])
-            animal.status = AnimalStatus.PENDING
-            animal.save(update_fields=["status"])
-            AdoptionRequest.objects.filter(animal=animal).exclude(pk=adoption_request.pk).update(
-                status=RequestStatus.PENDING
-            )
-            messages.success(request, f"{animal.name} request reset to pending.")
+        if request.POST.get("request_id"):
+            actions = [(request.POST["request_id"], request.POST.get("action"))]
         else:
-            messages.error(request, "Unknown action.")
+            bulk_action = request.POST.get("bulk_action")
+            actions = [(pk, bulk_action) for pk in request.POST.getlist("request_ids")]
+        try:
+            result = apply_actions(actions, actor=request.user)
+        except ValueError:
+            raise Http404("Unknown adoption request.")
+
+        if len(result.outcomes) == 1:
+            outcome = result.outcomes[0]
+            if outcome.error == "unknown action":
+                messages.error(request, "Unknown action.")
+            elif not outcome.ok:
+                messages.error(request, f"Could not {outcome.action} request #{outcome.request_id}: {outcome.error}.")
+            elif outcome.action == "approve":
+                messages.success(request, f"{outcome.animal_name} marked as adopted.")
+            elif outcome.action == "reject":
+                messages.info(request, f"Request from {outcome.username} rejected.")
+            else:
+                messages.success(request, f"{outcome.animal_name} request reset to pending.")
+        elif not result.outcomes:
+            messages.info(request, "Select at least one request first.")
+        else:
+            if result.applied:
+                messages.success(request, f"Applied {len(result.applied)} of {len(result.outcomes)} request action(s).")
+            if result.skipped:
+                # One message for the lot: they all travel in the messages cookie, which has a size limit.
+                shown = "; ".join(f"#{outcome.request_id}: {outcome.error}" for outcome in result.skipped[:SKIPPED_SHOWN])
+                more = len(result.skipped) - SKIPPED_SHOWN
+                messages.error(
+                    request,
+                    f"Skipped {len(result.skipped)} request(s) ({shown}{f'; {more} more' if more > 0 else ''}).",
+                )
+
+        return redirect(request.get_full_path())
+
+    status_filter = request.GET.get("status") if request.GET.get("status") in RequestStatus.values else ""
+    animal_filter = request.GET.get("animal", "")
+    # ASCII digits only (isdigit() also passes "²", which int() rejects), and few enough to fit a bigint.
+    is_id = animal_filter.isascii() and animal_filter.isdecimal() and len(animal_filter) <= 18
+    animal_filter = animal_filter if is_id else ""
+    user_filter = (request.GET.get("user") or "").strip()
+
+    scope = AdoptionRequest.objects.all()
+    if animal_filter:
+        scope = scope.filter(animal_id=animal_filter)
+    if user_filter:
+        scope = scope.filter(user__username=user_filter)
+
+    counts_key = catalog_key("request-counts", animal_filter, user_filter)
+    counts = cache.get(counts_key)
+    if counts is None:
+        with primary():
+            if user_filter:
+                counts = scope.aggregate(
+                    **{status.lower(): Count("pk", filter=Q(status=status)) for status in RequestStatus.values},
+                )
+            else:
+                # Without a user filter the per-animal counters answer this without touching the requests.
+                animals = Animal.objects.filter(pk=animal_filter) if animal_filter else Animal.objects.all()
+                counts = animals.aggregate(
+                    **{status.lower(): Coalesce(Sum(field), 0) for status, field in COUNTER_FIELDS.items()}
+                )
+        counts["total"] = sum(counts[status.lower()] for status in RequestStatus.values)
+        cache.set(counts_key, counts, CATALOG_CACHE_TIMEOUT)
+    status_counts = [(status, counts[status.lower()]) for status in RequestStatus.values]
+
+    requests_qs = scope.filter(status=status_filter) if status_filter else scope
+    paginator = KeysetPaginator(
+        requests_qs.select_related("animal", "user"), ("-created_at", "-id"), per_page=DASHBOARD_PAGE_SIZE
+    )
+    page = _keyset_page(paginator, request)
 
-        return redirect("core:manage_requests")
+    context = {
+        "requests": page,
+        "page": page,
+        "status_filter": status_filter,
+        "animal_filter": animal_filter,
+        "user_filter": user_filter,
+        "status_counts": status_counts,
+        "total_count": counts["total"],
+        "filter_params": _pager_params(animal=animal_filter, user=user_filter),
+        "pager_params": _pager_params(status=status_filter, animal=animal_filter, user=user_filter),
+    }
+    return render(request, "requests/manage.html", context)
 
-    return render(
-        request,
-        "requests/manage.html",
-        {"requests": requests_qs},
-    )
+
+@query_budget(3)
+@login_required
+def view_stats(request: HttpRequest) -> HttpResponse:
+    """Recent per-view timings and query counts recorded by this worker process."""
+    if not request.user.is_staff:
+        messages.error(request, "Only admins can view request statistics.")
+        return redirect("core:home")
+
+    if request.method == "POST":
+        instrumentation.buffer.clear()
+        messages.info(request, "Request statistics cleared.")
+        return redirect("core:view_stats")
+
+    samples = instrumentation.buffer.snapshot()
+    if request.GET.get("format") == "json":
+        return JsonResponse(
+            {
+                "views": instrumentation.summary(samples),
+                "pools": instrumentation.pool_stats(),
+                "samples": instrumentation.as_dicts(samples),
+            }
+        )
+    context = {
+        "rows": instrumentation.summary(samples),
+        "pools": instrumentation.pool_stats(),
+        "recent": samples[-50:][::-1],
+        "sample_count": len(samples),
+    }
+    return render(request, "stats/views.html", context)
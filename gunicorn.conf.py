@@ -0,0 +1,44 @@
+# Gunicorn settings for serving pet_adoption.asgi with uvicorn workers:
+#
+#   gunicorn pet_adoption.asgi:application -c gunicorn.conf.py
+#
+# Each worker is one event loop, so slow clients and streamed responses wait on
+# the socket instead of holding a whole process. Sync views still run, in
+# Django's thread pool.
+#
+# The app (Django, the admin, compiled templates) is imported once in the master
+# and workers are forked from it, sharing those pages until they write to them.
+# `python manage.py measure_startup` reports boot time and memory per worker.
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+worker_class = "uvicorn_worker.UvicornWorker"
+workers = int(os.getenv("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2 + 1, 4)))
+
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+
+# Recycle workers now and then so slow leaks cannot build up.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = 200
+
+# GUNICORN_PRELOAD=False loads the app in each worker instead, e.g. to pick up code
+# changes on a HUP without restarting the master.
+preload_app = os.getenv("GUNICORN_PRELOAD", "True") == "True"
+
+accesslog = "-"
+# Only proxies listed here may rewrite the client address and scheme; trusting every peer
+# would let any client set REMOTE_ADDR with its own X-Forwarded-For. The platform proxy's
+# address is not fixed, so the rate limiter reads X-Forwarded-For itself, trusting the last
+# RATE_LIMIT_PROXY_COUNT hops.
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def when_ready(server):
+    # Runs after the preload, before the first fork: move everything imported so far out
+    # of the garbage collector's reach, so collections in workers do not touch (and so
+    # copy) the shared pages.
+    gc.freeze()
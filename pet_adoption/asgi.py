@@ -1,5 +1,12 @@
 import os
+from django.conf import settings
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pet_adoption.settings')
+# Long-lived responses such as the server-sent event streams in core.events need this app.
 application = get_asgi_application()
+
+if settings.TEMPLATES_WARM_AT_BOOT:
+    from core.warmup import warm_templates
+
+    warm_templates()
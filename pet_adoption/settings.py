@@ -2,6 +2,7 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 load_dotenv(BASE_DIR / ".env")
@@ -18,25 +19,34 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "core",
 ]
 
 MIDDLEWARE = [
+    "core.instrumentation.ViewStatsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # Fixed: Added WhiteNoise here
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.auth.AuthenticationMiddleware",
+    "core.routing.ReplicaRoutingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
 ROOT_URLCONF = "pet_adoption.urls"
 
+# Templates. With DEBUG off this is the production profile: compiled templates stay in
+# the cached loader for the life of the process, every template under core/templates
+# is compiled when pet_adoption.asgi is imported (TEMPLATES_WARM_AT_BOOT; in the
+# gunicorn master when preloading, so workers inherit them), and the debug context
+# processor, which only does anything under DEBUG, is dropped. The remaining
+# processors are lazy: nothing is looked up until a template uses it.
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "core.instrumentation.TimedDjangoTemplates",
         "DIRS": [BASE_DIR / "core" / "templates"],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -49,17 +59,75 @@ TEMPLATES = [
         },
     },
 ]
+if not DEBUG:
+    TEMPLATES[0]["APP_DIRS"] = False
+    TEMPLATES[0]["OPTIONS"]["loaders"] = [
+        (
+            "django.template.loaders.cached.Loader",
+            ["django.template.loaders.filesystem.Loader", "django.template.loaders.app_directories.Loader"],
+        )
+    ]
+    TEMPLATES[0]["OPTIONS"]["context_processors"].remove("django.template.context_processors.debug")
+TEMPLATES_WARM_AT_BOOT = os.getenv("TEMPLATES_WARM_AT_BOOT", str(not DEBUG)) == "True"
+
+# Per-view instrumentation (core.instrumentation): Server-Timing headers, the staff
+# stats page and @query_budget checks. Strict budgets raise instead of logging.
+SERVER_TIMING_HEADER = os.getenv("SERVER_TIMING_HEADER", str(DEBUG)) == "True"
+QUERY_BUDGETS_STRICT = os.getenv("QUERY_BUDGETS_STRICT", "False") == "True"
+VIEW_STATS_BUFFER_SIZE = int(os.getenv("VIEW_STATS_BUFFER_SIZE", "1000"))
+
+# Token-bucket limits per scope (core.ratelimit): "capacity/period", refilled evenly.
+# Set a scope to "" to disable it. Behind a proxy, RATE_LIMIT_PROXY_COUNT says how many
+# X-Forwarded-For hops to trust when working out the client IP.
+RATE_LIMITS = {
+    "signup": os.getenv("RATE_LIMIT_SIGNUP", "5/15m"),
+    "login": os.getenv("RATE_LIMIT_LOGIN", "10/5m"),
+    "request_create": os.getenv("RATE_LIMIT_REQUEST_CREATE", "20/m"),
+}
+RATE_LIMITER = "core.ratelimit.CacheTokenBucket"
+RATE_LIMIT_CACHE = "default"
+RATE_LIMIT_PROXY_COUNT = int(os.getenv("RATE_LIMIT_PROXY_COUNT", "0"))
 
 WSGI_APPLICATION = "pet_adoption.wsgi.application"
 
 # Database configuration - only define once!
+# Postgres connections come from a psycopg 3 pool per process (DB_POOL=False falls
+# back to persistent connections of DB_CONN_MAX_AGE seconds). CONN_HEALTH_CHECKS makes
+# Django ping each pooled connection as it is handed out, so a dropped one is replaced
+# rather than returned. Every connection gets a server-side statement_timeout;
+# DB_STATEMENT_TIMEOUT_MS=0 disables it.
+DB_POOL = os.getenv("DB_POOL", "True") == "True"
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))
+
+
+def _postgres_options() -> dict:
+    options = {}
+    if DB_STATEMENT_TIMEOUT_MS:
+        options["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+    if DB_POOL:
+        try:
+            import psycopg_pool  # noqa: F401
+        except ImportError:
+            raise ImproperlyConfigured("DB_POOL needs the psycopg-pool package; install it or set DB_POOL=False.")
+
+        options["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            # Seconds a request waits for a free connection before failing.
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            "max_idle": float(os.getenv("DB_POOL_MAX_IDLE", "300")),
+            "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "1800")),
+        }
+    return options
+
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL:
     # Production database (Render)
     DATABASES = {
         "default": dj_database_url.parse(
             DATABASE_URL,
-            conn_max_age=600,
+            conn_max_age=0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "600")),
             conn_health_checks=True,
         )
     }
@@ -73,8 +141,103 @@ else:
             "PASSWORD": os.getenv("DB_PASSWORD", ""),
             "HOST": os.getenv("DB_HOST", "127.0.0.1"),
             "PORT": os.getenv("DB_PORT", "5432"),
+            "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "0")),
+            "CONN_HEALTH_CHECKS": True,
+        }
+    }
+
+# Optional read replica (core.routing): safe requests read from it while its lag
+# stays under DATABASE_REPLICA_MAX_LAG seconds. Locally a copy of the primary
+# (another Postgres database or a SQLite file) can stand in for it.
+DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+DATABASE_REPLICA_MAX_LAG = float(os.getenv("DATABASE_REPLICA_MAX_LAG", "5"))
+DATABASE_REPLICA_CHECK_INTERVAL = float(os.getenv("DATABASE_REPLICA_CHECK_INTERVAL", "5"))
+if DATABASE_REPLICA_URL:
+    DATABASES["replica"] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=DATABASES["default"]["CONN_MAX_AGE"],
+        conn_health_checks=True,
+    )
+    DATABASES["replica"]["TEST"] = {"MIRROR": "default"}
+DATABASE_ROUTERS = ["core.routing.PrimaryReplicaRouter"]
+
+for database in DATABASES.values():
+    if database["ENGINE"] == "django.db.backends.postgresql":
+        database.setdefault("OPTIONS", {}).update(_postgres_options())
+
+# Live updates (core.events): server-sent event streams for the request dashboard and
+# catalog cards. On PostgreSQL events go through LISTEN/NOTIFY so every worker sees them;
+# otherwise they only reach streams in the process that made the change. Streams close
+# after EVENTS_MAX_AGE seconds and browsers reconnect after EVENTS_RETRY_MS.
+EVENTS_BROADCASTER = (
+    "core.events.PostgresBroadcaster"
+    if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql"
+    else "core.events.Broadcaster"
+)
+EVENTS_HEARTBEAT = float(os.getenv("EVENTS_HEARTBEAT", "15"))
+EVENTS_MAX_AGE = float(os.getenv("EVENTS_MAX_AGE", "600"))
+EVENTS_RETRY_MS = int(os.getenv("EVENTS_RETRY_MS", "3000"))
+EVENTS_QUEUE_SIZE = 100
+
+# Cache configuration: locmem by default, or CACHE_URL=file:///var/tmp/pet-cache
+# / redis://127.0.0.1:6379/0 (any Redis-compatible server; needs the redis package).
+# Catalog invalidation (core.caching) bumps a version key in this cache, so every process
+# that serves pages or runs jobs has to share it: with the per-process default, a change
+# made in one gunicorn worker or in runworker leaves the others serving stale pages.
+# Deployments (DEBUG off) therefore need a shared CACHE_URL, or an explicit
+# CACHE_URL=locmem:// to say a single process serves everything.
+CACHE_URL = os.getenv("CACHE_URL") or ("locmem://" if DEBUG else "")
+if not CACHE_URL:
+    raise ImproperlyConfigured(
+        "Set CACHE_URL to a cache all web and worker processes share (redis://... or file://...), "
+        "or to locmem:// when a single process serves everything."
+    )
+if CACHE_URL.startswith("file://"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": CACHE_URL.removeprefix("file://"),
         }
     }
+elif CACHE_URL.startswith(("redis://", "rediss://", "unix://")):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_URL,
+        }
+    }
+elif CACHE_URL.startswith("locmem://"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "pet-adoption",
+        }
+    }
+else:
+    raise ImproperlyConfigured(f"Unknown CACHE_URL scheme in {CACHE_URL!r}; use locmem://, file:// or redis://.")
+
+# Sessions (SESSION_MODE): "cached_db" reads them from the cache and writes through to the
+# database, "signed_cookies" keeps them in the browser, "db" is Django's default. Cached
+# sessions need a cache every worker shares (CACHE_URL=redis://... or file://...); with
+# the per-process default, a sign-out in one worker would not reach the others.
+SESSION_ENGINES = {
+    "db": "django.contrib.sessions.backends.db",
+    "cached_db": "django.contrib.sessions.backends.cached_db",
+    "signed_cookies": "django.contrib.sessions.backends.signed_cookies",
+}
+SESSION_MODE = os.getenv("SESSION_MODE", "db" if CACHES["default"]["BACKEND"].endswith("LocMemCache") else "cached_db")
+if SESSION_MODE not in SESSION_ENGINES:
+    raise ImproperlyConfigured(f"SESSION_MODE must be one of {', '.join(SESSION_ENGINES)}, not {SESSION_MODE!r}.")
+SESSION_ENGINE = SESSION_ENGINES[SESSION_MODE]
+# Flash messages ride in their own cookie, so showing one never writes the session.
+MESSAGE_STORAGE = "django.contrib.messages.storage.cookie.CookieStorage"
+
+# Signed-in users are cached for USER_CACHE_TIMEOUT seconds (0 disables; see core.auth).
+# Only on by default with a shared cache: the locmem copy in other processes would miss
+# the invalidation when a user is deactivated or loses staff rights.
+AUTHENTICATION_BACKENDS = ["core.auth.CachedModelBackend"]
+CACHE_SHARED = not CACHES["default"]["BACKEND"].endswith("LocMemCache")
+USER_CACHE_TIMEOUT = int(os.getenv("USER_CACHE_TIMEOUT", "60" if CACHE_SHARED else "0"))
 
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -93,12 +256,43 @@ STATIC_URL = "/static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"  # Added: Required for production
 STATICFILES_DIRS = [BASE_DIR / "core" / "static"]
 
-# WhiteNoise configuration
-STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
-
-# Media files configuration
-MEDIA_URL = "/media/"
+# Media files configuration. Uploads are stored under content hashes (core.storage), so
+# their URLs can be cached as immutable: by core.media.serve for the filesystem backend,
+# or by the bucket/CDN for MEDIA_STORAGE=s3 (AWS, or MinIO via MEDIA_S3_ENDPOINT_URL).
+# runworker renders image variants (core.images), so when it runs on another machine than
+# the web processes, as on Render, uploads must go to s3.
+MEDIA_URL = os.getenv("MEDIA_URL", "/media/")
 MEDIA_ROOT = BASE_DIR / "media"
+MEDIA_STORAGE = os.getenv("MEDIA_STORAGE", "filesystem")
+MEDIA_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+if MEDIA_STORAGE == "s3":
+    try:
+        import storages  # noqa: F401
+    except ImportError:
+        raise ImproperlyConfigured("MEDIA_STORAGE=s3 needs the django-storages[s3] package.")
+    MEDIA_BACKEND = {
+        "BACKEND": "core.storage_s3.HashedS3Storage",
+        "OPTIONS": {
+            "bucket_name": os.environ["MEDIA_S3_BUCKET"],
+            "endpoint_url": os.getenv("MEDIA_S3_ENDPOINT_URL") or None,
+            "region_name": os.getenv("MEDIA_S3_REGION") or None,
+            "custom_domain": os.getenv("MEDIA_S3_CUSTOM_DOMAIN") or None,
+            "url_protocol": os.getenv("MEDIA_S3_URL_PROTOCOL", "https:"),
+            "querystring_auth": False,
+            "object_parameters": {"CacheControl": MEDIA_CACHE_CONTROL},
+        },
+    }
+elif MEDIA_STORAGE == "filesystem":
+    MEDIA_BACKEND = {"BACKEND": "core.storage.HashedFileSystemStorage"}
+else:
+    raise ImproperlyConfigured(f"Unknown MEDIA_STORAGE {MEDIA_STORAGE!r}; use filesystem or s3.")
+
+STORAGES = {
+    "default": MEDIA_BACKEND,
+    # WhiteNoise configuration
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
 
 # CSRF configuration
 CSRF_TRUSTED_ORIGINS = ['https://*.onrender.com']
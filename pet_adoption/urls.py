@@ -1,7 +1,11 @@
+import re
+from urllib.parse import urlsplit
+
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.conf import settings
-from django.conf.urls.static import static
+
+from core import media
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -9,5 +13,9 @@ urlpatterns = [
     path("accounts/", include("django.contrib.auth.urls")),  
 ]
 
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+if settings.MEDIA_STORAGE == "filesystem":
+    # Served in production too; hashed files are cached as immutable by browsers and any CDN in front.
+    # MEDIA_URL may be a CDN's absolute URL; the origin serves the same path under this host.
+    media_prefix = urlsplit(settings.MEDIA_URL).path.strip("/")
+    media_route = rf"^{re.escape(media_prefix)}/(?P<path>.+)$" if media_prefix else r"^(?P<path>.+)$"
+    urlpatterns += [re_path(media_route, media.serve, name="media")]